@@ -0,0 +1,136 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from contuga.contrib.accounts.models import Account
+from contuga.contrib.accounts.utils import defer_balance_updates
+
+UserModel = get_user_model()
+
+
+def initialize_worker():
+    # Workers started with the spawn method need the apps to be loaded, while the
+    # forked ones must not reuse the database connections of the parent process.
+    django.setup()
+    connections.close_all()
+
+
+def reconcile_chunk(user_pks, fix):
+    accounts = Account.objects.with_calculated_balance(owner__in=user_pks).values(
+        "pk", "name", "owner__email", "balance", "calculated_balance"
+    )
+    drifts = [
+        account
+        for account in accounts
+        if account["balance"] != account["calculated_balance"]
+    ]
+
+    if fix and drifts:
+        # The data derived from the balances is brought up to date as well
+        with defer_balance_updates() as deferred_accounts:
+            deferred_accounts.update(account["pk"] for account in drifts)
+
+    return len(accounts), drifts
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the stored account balances with the ones calculated from the "
+        "transactions and optionally fixes the drifted ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "emails",
+            nargs="*",
+            help="Emails of the users whose accounts to check. Defaults to all users.",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Recalculate the balances and snapshots of the drifted accounts.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes. Defaults to 1 which avoids the pool.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of users processed by a worker at once.",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("The workers and the chunk size must be positive.")
+
+        users = UserModel.objects.order_by("pk")
+
+        if options["emails"]:
+            users = users.filter(email__in=options["emails"])
+
+        user_pks = list(users.values_list("pk", flat=True))
+        chunk_size = options["chunk_size"]
+        chunks = [
+            user_pks[index : index + chunk_size]
+            for index in range(0, len(user_pks), chunk_size)
+        ]
+        fix = options["fix"]
+
+        start = time.perf_counter()
+
+        if options["workers"] == 1:
+            results = (reconcile_chunk(chunk, fix) for chunk in chunks)
+            account_count, drift_count = self.report(results)
+        else:
+            # Close the connections of the main process before forking
+            connections.close_all()
+
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=initialize_worker
+            ) as executor:
+                results = executor.map(reconcile_chunk, chunks, [fix] * len(chunks))
+                account_count, drift_count = self.report(results)
+
+        duration = time.perf_counter() - start
+        throughput = account_count / duration if duration else account_count
+
+        self.stdout.write(
+            f"Checked {account_count} accounts of {len(user_pks)} users in "
+            f"{duration:.2f}s ({throughput:.0f} accounts/s)."
+        )
+
+        if not drift_count:
+            self.stdout.write(self.style.SUCCESS("No drifted balances found."))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {drift_count} balances."))
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Found {drift_count} drifted balances. Use --fix to fix them."
+                )
+            )
+
+    def report(self, results):
+        account_count = 0
+        drift_count = 0
+
+        for count, drifts in results:
+            account_count += count
+            drift_count += len(drifts)
+
+            for account in drifts:
+                self.stdout.write(
+                    f"{account['owner__email']} - {account['name']} "
+                    f"({account['pk']}): stored {account['balance']:.2f}, "
+                    f"calculated {account['calculated_balance']:.2f}"
+                )
+
+        return account_count, drift_count
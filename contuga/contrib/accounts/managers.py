@@ -1,4 +1,11 @@
+import operator
+from functools import reduce
+
 from django.db import models
+from django.db.models import Case, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from contuga.contrib.transactions.models import Transaction
 
 
 class AccountManager(models.Manager):
@@ -7,3 +14,155 @@ class AccountManager(models.Manager):
 
     def deactivated(self, **kwargs):
         return self.filter(is_active=False, **kwargs)
+
+    def apply_balance_changes(self, changes):
+        """
+        Add the amounts in `changes`, a mapping of account primary keys to signed
+        amounts, to the stored balances using a single UPDATE statement.
+        """
+        changes = {pk: amount for pk, amount in changes.items() if amount}
+
+        if not changes:
+            return 0
+
+        balance_field = self.model._meta.get_field("balance")
+        change = Case(
+            *(When(pk=pk, then=Value(amount)) for pk, amount in changes.items()),
+            default=Value(0),
+            output_field=balance_field,
+        )
+
+        return self.filter(pk__in=changes.keys()).update(balance=F("balance") + change)
+
+    def get_calculated_balance(self):
+        """
+        Return an expression calculating the balance of the account from its
+        whole transaction history.
+        """
+        transactions = (
+            Transaction.objects.filter(account__pk=OuterRef("pk"))
+            .order_by()
+            .values("account")
+        )
+        balance = transactions.annotate(
+            balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
+            - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
+        ).values("balance")
+
+        # If there are no transactions, the subquery will not return a balance and
+        # Coalesce prevents failing due to NOT NULL constraint.
+        return Coalesce(
+            Subquery(balance), 0, output_field=self.model._meta.get_field("balance")
+        )
+
+    def with_calculated_balance(self, **kwargs):
+        return self.filter(**kwargs).annotate(
+            calculated_balance=self.get_calculated_balance()
+        )
+
+    def recalculate_balances(self, **kwargs):
+        """
+        Recalculate the balances of the matching accounts from their whole
+        transaction history. Used for reconciliation of drifted balances.
+        """
+        return self.filter(**kwargs).update(balance=self.get_calculated_balance())
+
+
+class BalanceSnapshotManager(models.Manager):
+    def closing_balance(self, account, date, inclusive=True):
+        """
+        Return a queryset with the latest snapshot of the account until the given
+        date. The snapshot of the date itself is excluded if not inclusive.
+        """
+        lookup = "date__lte" if inclusive else "date__lt"
+
+        return self.filter(account=account, **{lookup: date}).order_by("-date")[:1]
+
+    def apply_balance_changes(self, changes, missing=None):
+        """
+        Add the amounts in `changes`, a mapping of (account primary key, date)
+        pairs to signed amounts, to the snapshot of the date and all later ones
+        using a single UPDATE statement. The snapshots of the `missing` keys, all
+        of them by default, are created first unless they exist. No snapshots are
+        created when the account itself may be being deleted.
+        """
+        changes = {key: amount for key, amount in changes.items() if amount}
+
+        if not changes:
+            return
+
+        missing = changes.keys() if missing is None else missing & changes.keys()
+
+        if missing:
+            # The missing snapshots are created with the closing balance of the
+            # previous day and the change is applied by the update below. A
+            # snapshot created concurrently is left as is instead of failing on
+            # the unique constraint.
+            self.bulk_create(
+                (
+                    self.model(
+                        account_id=account,
+                        date=date,
+                        balance=Coalesce(
+                            Subquery(
+                                self.closing_balance(
+                                    account=account, date=date, inclusive=False
+                                ).values("balance")
+                            ),
+                            0,
+                        ),
+                    )
+                    for account, date in missing
+                ),
+                ignore_conflicts=True,
+            )
+
+        balance_field = self.model._meta.get_field("balance")
+        conditions = {
+            (account, date): Q(account=account, date__gte=date)
+            for account, date in changes
+        }
+        # A snapshot gets the changes of all earlier or equal dates
+        balance = F("balance")
+
+        for key, amount in changes.items():
+            balance += Case(
+                When(conditions[key], then=Value(amount)),
+                default=Value(0),
+                output_field=balance_field,
+            )
+
+        self.filter(reduce(operator.or_, conditions.values())).update(balance=balance)
+
+    def rebuild(self, accounts):
+        """
+        Replace the snapshots of the given accounts with ones calculated from
+        their whole transaction history.
+        """
+        self.filter(account__in=accounts).delete()
+
+        daily_changes = (
+            Transaction.objects.filter(account__in=accounts)
+            .values("account", "created_on")
+            .annotate(
+                change=Coalesce(Sum("amount", filter=Q(type="income")), 0)
+                - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
+            )
+            .order_by("account", "created_on")
+        )
+
+        balances = {}
+        snapshots = []
+
+        for item in daily_changes:
+            account = item["account"]
+            balances[account] = balances.get(account, 0) + item["change"]
+            snapshots.append(
+                self.model(
+                    account_id=account,
+                    date=item["created_on"],
+                    balance=balances[account],
+                )
+            )
+
+        self.bulk_create(snapshots, batch_size=1000)
@@ -0,0 +1,91 @@
+# Generated by Django 3.1.14 on 2026-10-18 01:27
+
+import django.db.models.deletion
+import pytz
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce, TruncDay
+
+
+def create_balance_snapshots(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    BalanceSnapshot = apps.get_model("accounts", "BalanceSnapshot")
+
+    daily_changes = (
+        Transaction.objects.annotate(
+            created_on=TruncDay("created_at", tzinfo=pytz.timezone(settings.TIME_ZONE))
+        )
+        .values("account", "created_on")
+        .annotate(
+            change=Coalesce(Sum("amount", filter=Q(type="income")), 0)
+            - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
+        )
+        .order_by("account", "created_on")
+    )
+
+    balances = {}
+    snapshots = []
+
+    for item in daily_changes:
+        account = item["account"]
+        balances[account] = balances.get(account, 0) + item["change"]
+        snapshots.append(
+            BalanceSnapshot(
+                account_id=account,
+                date=item["created_on"].date(),
+                balance=balances[account],
+            )
+        )
+
+    BalanceSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_account_owner"),
+        ("transactions", "0004_transaction_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "balance",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=22,
+                        verbose_name="Closing balance",
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_snapshots",
+                        to="accounts.account",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Balance snapshot",
+                "verbose_name_plural": "Balance snapshots",
+                "ordering": ["account", "date"],
+                "unique_together": {("account", "date")},
+            },
+        ),
+        migrations.RunPython(create_balance_snapshots, migrations.RunPython.noop),
+    ]
@@ -1,13 +1,15 @@
 import uuid
+from datetime import datetime
 
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models import Q, Sum
+from django.db.models import Q, Subquery, Sum
 from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
 from contuga.models import TimestampModel
+from contuga.utils import get_local_date
 
 from . import managers
 
@@ -58,12 +60,51 @@ class Account(TimestampModel):
         return self.transactions.all()[:count]
 
     def calculate_balance(self, date=None):
-        if date:
-            queryset = self.transactions.filter(created_at__lte=date)
-        else:
-            queryset = self.transactions
+        if not date:
+            return self.transactions.aggregate(
+                balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
+                - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
+            )["balance"]
 
-        return queryset.aggregate(
-            balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
+        if not isinstance(date, datetime):
+            # The closing balance of the day is stored in the snapshot
+            snapshot = BalanceSnapshot.objects.closing_balance(account=self, date=date)
+            return snapshot.values_list("balance", flat=True).first() or 0
+
+        # The closing balance of the last day before the given date is combined
+        # with the transactions of the same day created until the given moment.
+        snapshot_date = get_local_date(date)
+        snapshot = BalanceSnapshot.objects.closing_balance(
+            account=self, date=snapshot_date, inclusive=False
+        )
+
+        return self.transactions.filter(
+            created_on=snapshot_date, created_at__lte=date
+        ).aggregate(
+            balance=Coalesce(Subquery(snapshot.values("balance")), 0)
+            + Coalesce(Sum("amount", filter=Q(type="income")), 0)
             - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
-        )["balance"]
+        )[
+            "balance"
+        ]
+
+
+class BalanceSnapshot(models.Model):
+    account = models.ForeignKey(
+        Account, related_name="balance_snapshots", on_delete=models.CASCADE
+    )
+    date = models.DateField(_("Date"))
+    balance = models.DecimalField(
+        _("Closing balance"), max_digits=22, decimal_places=2, default=0
+    )
+
+    objects = managers.BalanceSnapshotManager()
+
+    class Meta:
+        ordering = ["account", "date"]
+        verbose_name = _("Balance snapshot")
+        verbose_name_plural = _("Balance snapshots")
+        unique_together = (("account", "date"),)
+
+    def __str__(self):
+        return f"{self.account} - {self.date}"
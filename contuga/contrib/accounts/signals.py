@@ -1,30 +1,40 @@
-from django.db.models import OuterRef, Q, Subquery, Sum
-from django.db.models.functions import Coalesce
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from contuga.contrib.analytics.cache import invalidate_reports
 from contuga.contrib.transactions.models import Transaction
 
-from .models import Account
+from .utils import STATE_FIELDS, apply_transaction_changes, recalculate_accounts
 
 
 @receiver(post_save, sender=Transaction, dispatch_uid="update_account_balance_on_save")
 @receiver(
     post_delete, sender=Transaction, dispatch_uid="update_account_balance_on_delete"
 )
-def update_account_balance(sender, instance, **kwargs):
-    transactions = (
-        Transaction.objects.filter(account__pk=OuterRef("pk"))
-        .order_by()
-        .values("account")
-    )
-    balance = transactions.annotate(
-        balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
-        - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
-    ).values("balance")
+def update_account_balance(sender, instance, signal, created=False, **kwargs):
+    # The balances, the snapshots and the rollups are all derived from the same
+    # states of the transaction, so they are updated by a single receiver. The
+    # persisted values are updated by the model after the post_save signal.
+    previous_state = None if created else instance.get_persisted_values(STATE_FIELDS)
 
-    # If there are no transactions, the subquery will not return a balance and
-    # Coalesce prevents failing due to NOT NULL constraint.
-    Account.objects.filter(owner=instance.author).update(
-        balance=Coalesce(Subquery(balance), 0)
-    )
+    if signal is post_delete:
+        # The snapshot and the rollup of the day already exist, unless the account
+        # is being deleted along with its transactions, snapshots and rollups.
+        apply_transaction_changes(
+            previous_states=[previous_state or instance.get_saved_values(STATE_FIELDS)]
+        )
+    elif created:
+        apply_transaction_changes(
+            current_states=[instance.get_saved_values(STATE_FIELDS)]
+        )
+    elif previous_state is None:
+        # Some of the fields were not loaded, so the previous state of the
+        # transaction is unknown and all accounts of the author are recalculated.
+        recalculate_accounts(owner=instance.author_id)
+    else:
+        current_state = instance.get_saved_values(
+            STATE_FIELDS, kwargs.get("update_fields")
+        )
+        apply_transaction_changes([previous_state], [current_state])
+
+    invalidate_reports(instance.author_id)
@@ -0,0 +1,85 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from contuga.mixins import TestMixin
+
+from ..models import Account, BalanceSnapshot
+
+
+class ReconcileBalancesTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.create_income(amount=Decimal("100"))
+        self.create_expenditure(amount=Decimal("30"))
+
+        self.other_user = self.create_user(email="richard.roe@example.com")
+        self.other_account = self.create_account(
+            owner=self.other_user, currency=self.create_currency(author=self.other_user)
+        )
+        self.create_income(
+            author=self.other_user, account=self.other_account, amount=Decimal("5")
+        )
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command("reconcile_balances", *args, stdout=out, **kwargs)
+        return out.getvalue()
+
+    def test_without_drift(self):
+        output = self.call_command()
+
+        self.assertIn("Checked 2 accounts of 2 users", output)
+        self.assertIn("No drifted balances found.", output)
+
+    def test_drift_is_reported_without_writing(self):
+        Account.objects.filter(pk=self.account.pk).update(balance=Decimal("1"))
+
+        output = self.call_command(chunk_size=1)
+
+        self.assertIn(
+            f"{self.user.email} - {self.account.name} ({self.account.pk}): "
+            "stored 1.00, calculated 70.00",
+            output,
+        )
+        self.assertIn("Found 1 drifted balances. Use --fix to fix them.", output)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("1"))
+
+    def test_drift_is_fixed(self):
+        Account.objects.update(balance=Decimal("1"))
+        BalanceSnapshot.objects.all().delete()
+
+        output = self.call_command("--fix")
+
+        self.assertIn("Fixed 2 balances.", output)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("70"))
+
+        self.other_account.refresh_from_db()
+        self.assertEqual(self.other_account.balance, Decimal("5"))
+
+        self.assertEqual(BalanceSnapshot.objects.count(), 2)
+
+    def test_selected_users(self):
+        Account.objects.update(balance=Decimal("1"))
+
+        output = self.call_command(self.other_user.email, "--fix")
+
+        self.assertIn("Checked 1 accounts of 1 users", output)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("1"))
+
+        self.other_account.refresh_from_db()
+        self.assertEqual(self.other_account.balance, Decimal("5"))
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            self.call_command(workers=0)
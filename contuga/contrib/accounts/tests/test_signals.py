@@ -3,11 +3,14 @@ from decimal import Decimal
 from django.test import TestCase
 
 from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
 from contuga.mixins import TestMixin
 
 from ..models import Account
 
 
+# The data versions of the reports are bumped once the database transactions
+# commit, which is not counted by these tests
 class AccountSignalsTestCase(TestCase, TestMixin):
     def setUp(self):
         self.user = self.create_user()
@@ -28,14 +31,15 @@ class AccountSignalsTestCase(TestCase, TestMixin):
     def test_balance_update_after_transaction_create(self):
         self.assertEqual(self.account.balance, 0)
 
-        # The following transaction and the signal
-        with self.assertNumQueries(3):
+        # The counterpart lookup, the insert, the balance and the inserts and the
+        # updates of the daily snapshot and rollup
+        with self.assertNumQueries(7):
             self.create_transaction(
                 type=transaction_constants.INCOME, amount=Decimal("100.50")
             )
 
-        # The following transaction and the signal
-        with self.assertNumQueries(3):
+        # The same queries, while the existing snapshot and rollup are kept
+        with self.assertNumQueries(7):
             self.create_transaction(
                 type=transaction_constants.EXPENDITURE, amount=Decimal("50.25")
             )
@@ -49,7 +53,8 @@ class AccountSignalsTestCase(TestCase, TestMixin):
 
         # Test with update of income transaction
 
-        with self.assertNumQueries(2):
+        # The update, the balance and the existing snapshot and rollup
+        with self.assertNumQueries(4):
             income.amount = Decimal("50.50")
             income.save(update_fields=["amount"])
 
@@ -63,7 +68,7 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             type=transaction_constants.EXPENDITURE, amount=Decimal("50.25")
         )
 
-        with self.assertNumQueries(2):
+        with self.assertNumQueries(4):
             expenditure.amount = Decimal("50.50")
             expenditure.save(update_fields=["amount"])
 
@@ -77,7 +82,8 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             type=transaction_constants.EXPENDITURE, amount=Decimal("50.25")
         )
 
-        with self.assertNumQueries(2):
+        # The same queries and the deletion of the emptied rollups
+        with self.assertNumQueries(5):
             transaction.type = transaction_constants.INCOME
             transaction.save(update_fields=["type"])
 
@@ -91,7 +97,8 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             type=transaction_constants.INCOME, amount=Decimal("100.50")
         )
 
-        with self.assertNumQueries(2):
+        # The same queries and the deletion of the emptied rollups
+        with self.assertNumQueries(5):
             transaction.type = transaction_constants.EXPENDITURE
             transaction.save(update_fields=["type"])
 
@@ -107,7 +114,10 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             type=transaction_constants.EXPENDITURE, amount=Decimal("50.25")
         )
 
-        with self.assertNumQueries(4):
+        # The counterpart lookup, the deletion of the tags and the transaction,
+        # the balance, the snapshots and the update and the deletion of the
+        # emptied rollups
+        with self.assertNumQueries(7):
             income.delete()
 
         updated_account = Account.objects.get(pk=self.account.pk)
@@ -120,7 +130,7 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             type=transaction_constants.INCOME, amount=Decimal("100.50")
         )
 
-        with self.assertNumQueries(4):
+        with self.assertNumQueries(7):
             transaction.delete()
 
         updated_account = Account.objects.get(pk=self.account.pk)
@@ -137,7 +147,9 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             name="Second account name", description="Second account description"
         )
 
-        with self.assertNumQueries(2):
+        # The update, the balances, the insert and the update of the snapshots and
+        # the insert, the update and the deletion of the emptied rollups
+        with self.assertNumQueries(7):
             transaction.account = second_account
             transaction.save(update_fields=["account"])
 
@@ -171,7 +183,9 @@ class AccountSignalsTestCase(TestCase, TestMixin):
             name="Second account name", description="Second account description"
         )
 
-        with self.assertNumQueries(2):
+        # The update, the balances, the insert and the update of the snapshots and
+        # the insert, the update and the deletion of the emptied rollups
+        with self.assertNumQueries(7):
             transaction.account = second_account
             transaction.save(update_fields=["account"])
 
@@ -186,3 +200,111 @@ class AccountSignalsTestCase(TestCase, TestMixin):
         self.assertEqual(
             unrelated_account.updated_at, retrieved_unrelated_account.updated_at
         )
+
+    def test_other_accounts_of_the_owner_are_not_recalculated(self):
+        second_account = self.create_account(name="Second account name")
+        Account.objects.filter(pk=second_account.pk).update(balance=Decimal("42"))
+
+        with self.assertNumQueries(7):
+            self.create_transaction(
+                type=transaction_constants.INCOME, amount=Decimal("100.50")
+            )
+
+        second_account.refresh_from_db()
+        self.assertEqual(second_account.balance, Decimal("42"))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.50"))
+
+    def test_balance_is_not_updated_when_unrelated_fields_are_changed(self):
+        transaction = self.create_transaction(
+            type=transaction_constants.INCOME, amount=Decimal("100.50")
+        )
+
+        with self.assertNumQueries(1):
+            transaction.description = "Updated description"
+            transaction.save()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.50"))
+
+    def test_balance_update_with_partial_update_fields(self):
+        transaction = self.create_transaction(
+            type=transaction_constants.INCOME, amount=Decimal("100.50")
+        )
+
+        transaction.amount = Decimal("20")
+        transaction.type = transaction_constants.EXPENDITURE
+        transaction.save(update_fields=["amount"])
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("20"))
+
+        transaction.save(update_fields=["type"])
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("-20"))
+
+    def test_balance_update_after_multiple_saves_of_the_same_instance(self):
+        transaction = self.create_transaction(
+            type=transaction_constants.EXPENDITURE, amount=Decimal("10")
+        )
+
+        for amount in ("20", "30", "40"):
+            transaction.amount = Decimal(amount)
+            transaction.save()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("-40"))
+
+    def test_balance_update_of_transaction_with_deferred_fields(self):
+        self.create_transaction(
+            type=transaction_constants.INCOME, amount=Decimal("100.50")
+        )
+        transaction = Transaction.objects.only("pk", "description").get()
+
+        transaction.amount = Decimal("50")
+        transaction.save(update_fields=["amount"])
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("50"))
+
+    def test_recalculate_balances(self):
+        self.create_transaction(
+            type=transaction_constants.INCOME, amount=Decimal("100.50")
+        )
+        self.create_transaction(
+            type=transaction_constants.EXPENDITURE, amount=Decimal("50.25")
+        )
+        empty_account = self.create_account(name="Empty account name")
+        unrelated_account = self.create_user_and_account()
+
+        Account.objects.update(balance=Decimal("1000"))
+
+        with self.assertNumQueries(1):
+            Account.objects.recalculate_balances(owner=self.user)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("50.25"))
+
+        empty_account.refresh_from_db()
+        self.assertEqual(empty_account.balance, 0)
+
+        unrelated_account.refresh_from_db()
+        self.assertEqual(unrelated_account.balance, Decimal("1000"))
+
+    def test_balance_update_after_refresh_from_db(self):
+        transaction = self.create_transaction(
+            type=transaction_constants.INCOME, amount=Decimal("100")
+        )
+
+        other_instance = Transaction.objects.get(pk=transaction.pk)
+        other_instance.amount = Decimal("70")
+        other_instance.save()
+
+        transaction.refresh_from_db()
+        transaction.amount = Decimal("50")
+        transaction.save()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("50"))
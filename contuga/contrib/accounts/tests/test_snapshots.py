@@ -0,0 +1,158 @@
+from decimal import Decimal
+from unittest import mock
+
+from dateutil.relativedelta import relativedelta
+from django.test import TestCase
+from django.utils import timezone
+
+from contuga.mixins import TestMixin
+from contuga.utils import get_local_date
+
+from ..models import Account, BalanceSnapshot
+
+
+class BalanceSnapshotTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+
+    def create_transactions_in_the_past(self, days, **kwargs):
+        with mock.patch("django.utils.timezone.now") as mocked_now:
+            mocked_now.return_value = self.now - relativedelta(days=days)
+            return self.create_transaction(**kwargs)
+
+    def get_snapshots(self, account=None):
+        queryset = BalanceSnapshot.objects.filter(account=account or self.account)
+        return list(queryset.values_list("date", "balance"))
+
+    def get_date(self, days=0):
+        return get_local_date(self.now - relativedelta(days=days))
+
+    def test_snapshots_are_created_on_transaction_create(self):
+        self.create_income(amount=Decimal("100"))
+        self.create_expenditure(amount=Decimal("30"))
+
+        self.assertListEqual(self.get_snapshots(), [(self.get_date(), Decimal("70"))])
+
+    def test_later_snapshots_are_updated_on_transaction_in_the_past(self):
+        self.create_income(amount=Decimal("100"))
+        self.create_transactions_in_the_past(days=5, amount=Decimal("20"))
+        self.create_transactions_in_the_past(days=10, amount=Decimal("5"))
+
+        self.assertListEqual(
+            self.get_snapshots(),
+            [
+                (self.get_date(days=10), Decimal("-5")),
+                (self.get_date(days=5), Decimal("-25")),
+                (self.get_date(), Decimal("75")),
+            ],
+        )
+
+    def test_snapshots_are_updated_on_transaction_update_and_delete(self):
+        second_account = self.create_account(name="Second account name")
+        income = self.create_income(amount=Decimal("100"))
+        expenditure = self.create_transactions_in_the_past(days=3, amount=Decimal("40"))
+
+        expenditure.account = second_account
+        expenditure.save()
+
+        self.assertListEqual(
+            self.get_snapshots(),
+            [(self.get_date(days=3), Decimal("0")), (self.get_date(), Decimal("100"))],
+        )
+        self.assertListEqual(
+            self.get_snapshots(second_account),
+            [(self.get_date(days=3), Decimal("-40"))],
+        )
+
+        income.delete()
+
+        self.assertListEqual(
+            self.get_snapshots(),
+            [(self.get_date(days=3), Decimal("0")), (self.get_date(), Decimal("0"))],
+        )
+
+    def test_snapshots_are_updated_on_transaction_date_change(self):
+        self.create_transactions_in_the_past(days=3, amount=Decimal("40"))
+        income = self.create_income(amount=Decimal("100"))
+
+        # The update, the new snapshot, the changes of both dates applied by a
+        # single update and the rollups
+        with self.assertNumQueries(6):
+            income.created_at = self.now - relativedelta(days=5)
+            income.save()
+
+        self.assertListEqual(
+            self.get_snapshots(),
+            [
+                (self.get_date(days=5), Decimal("100")),
+                (self.get_date(days=3), Decimal("60")),
+                (self.get_date(), Decimal("60")),
+            ],
+        )
+
+    def test_snapshot_created_concurrently_is_updated(self):
+        self.create_transactions_in_the_past(days=3, amount=Decimal("40"))
+        # Created by a concurrent transaction after the last snapshot was read
+        BalanceSnapshot.objects.create(
+            account=self.account, date=self.get_date(), balance=Decimal("-40")
+        )
+
+        # The ignored insert and the update
+        with self.assertNumQueries(2):
+            BalanceSnapshot.objects.apply_balance_changes(
+                {(self.account.pk, self.get_date()): Decimal("100")}
+            )
+
+        self.assertListEqual(
+            self.get_snapshots(),
+            [(self.get_date(days=3), Decimal("-40")), (self.get_date(), Decimal("60"))],
+        )
+
+    def test_incremental_snapshots_match_rebuilt_ones(self):
+        for days in (30, 1, 15, 2, 30, 7):
+            self.create_transactions_in_the_past(days=days, amount=Decimal(days))
+            self.create_income(amount=Decimal("3.25"))
+
+        snapshots = self.get_snapshots()
+        BalanceSnapshot.objects.rebuild(Account.objects.all())
+
+        self.assertListEqual(snapshots, self.get_snapshots())
+
+    def test_account_delete(self):
+        self.create_income(amount=Decimal("100"))
+        self.create_transactions_in_the_past(days=3, amount=Decimal("40"))
+
+        self.account.delete()
+
+        self.assertFalse(BalanceSnapshot.objects.exists())
+
+    def test_calculate_balance_for_date(self):
+        self.create_transactions_in_the_past(days=10, amount=Decimal("5"))
+        self.create_transactions_in_the_past(days=5, amount=Decimal("20"))
+
+        with self.assertNumQueries(1):
+            balance = self.account.calculate_balance(self.get_date(days=7))
+
+        self.assertEqual(balance, Decimal("-5"))
+        self.assertEqual(self.account.calculate_balance(self.get_date(days=11)), 0)
+        self.assertEqual(
+            self.account.calculate_balance(self.get_date(days=1)), Decimal("-25")
+        )
+
+    def test_calculate_balance_for_datetime(self):
+        self.create_transactions_in_the_past(days=10, amount=Decimal("5"))
+        expenditure = self.create_expenditure(amount=Decimal("20"))
+        self.create_income(amount=Decimal("100"))
+
+        with self.assertNumQueries(1):
+            balance = self.account.calculate_balance(expenditure.created_at)
+
+        self.assertEqual(balance, Decimal("-25"))
+        self.assertEqual(self.account.calculate_balance(timezone.now()), Decimal("75"))
+        self.assertEqual(
+            self.account.calculate_balance(self.now - relativedelta(days=1)),
+            Decimal("-5"),
+        )
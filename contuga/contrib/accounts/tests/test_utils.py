@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
+from contuga.mixins import TestMixin
+
+from ..models import Account
+from ..utils import defer_balance_updates, get_deferred_accounts
+
+
+class DeferBalanceUpdatesTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.second_account = self.create_account(name="Second account name")
+
+    def test_balances_are_updated_once_on_exit(self):
+        # The savepoint, the counterpart lookup and the insert of each
+        # transaction, the refresh below, the balance recalculation, the three
+        # queries rebuilding the snapshots and the rollups each, the owners lookup
+        # and the savepoint release. The data version is bumped once the database
+        # transaction commits.
+        with self.assertNumQueries(1 + 10 * 2 + 1 + 1 + 3 + 3 + 1 + 1):
+            with defer_balance_updates():
+                for i in range(10):
+                    self.create_income(amount=Decimal("10.50"))
+
+                self.account.refresh_from_db()
+                self.assertEqual(self.account.balance, 0)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("105"))
+
+    def test_only_touched_accounts_are_recalculated(self):
+        Account.objects.filter(pk=self.second_account.pk).update(balance=Decimal("42"))
+
+        with defer_balance_updates() as accounts:
+            self.create_expenditure(amount=Decimal("30"))
+
+        self.assertSetEqual(accounts, {self.account.pk})
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("-30"))
+
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.second_account.balance, Decimal("42"))
+
+    def test_update_and_delete_within_block(self):
+        income = self.create_income(amount=Decimal("100"))
+        expenditure = self.create_expenditure(amount=Decimal("40"))
+
+        with defer_balance_updates():
+            income.account = self.second_account
+            income.save()
+            expenditure.delete()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, 0)
+
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.second_account.balance, Decimal("100"))
+
+        # The state of the instance is kept up to date within the block
+        income.amount = Decimal("60")
+        income.save()
+
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.second_account.balance, Decimal("60"))
+
+    def test_accounts_can_be_added_manually(self):
+        with defer_balance_updates() as accounts:
+            Transaction.objects.bulk_create(
+                [
+                    Transaction(
+                        type=transaction_constants.INCOME,
+                        amount=Decimal("15"),
+                        author=self.user,
+                        account=self.second_account,
+                    )
+                    for i in range(3)
+                ]
+            )
+            accounts.add(self.second_account.pk)
+
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.second_account.balance, Decimal("45"))
+
+    def test_nested_blocks(self):
+        with defer_balance_updates() as outer_accounts:
+            with defer_balance_updates() as inner_accounts:
+                self.create_income(amount=Decimal("10"))
+
+            self.assertIs(inner_accounts, outer_accounts)
+
+            self.account.refresh_from_db()
+            self.assertEqual(self.account.balance, 0)
+
+        self.assertIsNone(get_deferred_accounts())
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("10"))
+
+    def test_block_is_rolled_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with defer_balance_updates():
+                self.create_income(amount=Decimal("10"))
+                raise ValueError
+
+        self.assertIsNone(get_deferred_accounts())
+        self.assertFalse(Transaction.objects.exists())
+
+        self.create_income(amount=Decimal("20"))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("20"))
+
+    def test_usage_as_decorator(self):
+        @defer_balance_updates()
+        def create_transactions():
+            self.create_income(amount=Decimal("10"))
+            self.create_expenditure(amount=Decimal("4"), account=self.second_account)
+
+        create_transactions()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("10"))
+
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.second_account.balance, Decimal("-4"))
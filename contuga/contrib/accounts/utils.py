@@ -0,0 +1,158 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.dispatch import Signal
+
+from contuga.contrib.analytics.managers import ROLLUP_FIELDS
+from contuga.contrib.analytics.models import DailyRollup
+from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
+from contuga.utils import get_local_date
+
+from .models import Account, BalanceSnapshot
+
+_deferred = threading.local()
+
+# The values of a transaction which its balance, snapshot and rollup depend on
+STATE_FIELDS = (
+    "author_id",
+    "account_id",
+    "category_id",
+    "type",
+    "amount",
+    "created_at",
+)
+
+# Sent with the touched `accounts` once a `defer_balance_updates` block completes.
+# Receivers should bring any data derived from the transactions up to date.
+deferred_updates_completed = Signal()
+
+
+def get_deferred_accounts():
+    """
+    Return the set collecting the accounts touched within the current
+    `defer_balance_updates` block or None if balance updates are not deferred.
+    """
+    return getattr(_deferred, "accounts", None)
+
+
+@contextmanager
+def defer_balance_updates():
+    """
+    Suppress the per-transaction balance updates and recalculate the balances and
+    the balance snapshots of all touched accounts once the block completes. The block
+    is executed atomically, so the balances are never left out of sync.
+
+    The yielded set can be extended with the primary keys of accounts modified
+    without signals, e.g. by `Transaction.objects.bulk_create`.
+
+    Can be used both as a context manager and as a decorator. Nested blocks are
+    merged into the outermost one.
+    """
+    accounts = get_deferred_accounts()
+
+    if accounts is not None:
+        yield accounts
+        return
+
+    with transaction.atomic():
+        accounts = _deferred.accounts = set()
+
+        try:
+            yield accounts
+        finally:
+            del _deferred.accounts
+
+        if accounts:
+            Account.objects.recalculate_balances(pk__in=accounts)
+            BalanceSnapshot.objects.rebuild(accounts)
+            deferred_updates_completed.send(sender=Account, accounts=accounts)
+
+
+def get_snapshot_key(state):
+    return state["account_id"], get_local_date(state["created_at"])
+
+
+def get_rollup_key(state):
+    account, date = get_snapshot_key(state)
+    return state["author_id"], account, state["category_id"], date
+
+
+def get_transaction_changes(previous_states=(), current_states=()):
+    """
+    Return the changes of the balances, the balance snapshots and the daily
+    rollups caused by transactions leaving the `previous_states` and entering the
+    `current_states`, which are dicts of their `STATE_FIELDS` values.
+    """
+    amount_field = Transaction._meta.get_field("amount")
+    balance_changes = defaultdict(Decimal)
+    snapshot_changes = defaultdict(Decimal)
+    rollup_changes = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+
+    for states, sign in ((previous_states, -1), (current_states, 1)):
+        for state in states:
+            amount = sign * amount_field.to_python(state["amount"])
+            rollup_change = rollup_changes[get_rollup_key(state)]
+
+            if state["type"] == transaction_constants.INCOME:
+                rollup_change["income"] += amount
+                rollup_change["income_count"] += sign
+            else:
+                rollup_change["expenditures"] += amount
+                rollup_change["expenditures_count"] += sign
+                amount = -amount
+
+            balance_changes[state["account_id"]] += amount
+            snapshot_changes[get_snapshot_key(state)] += amount
+
+    return balance_changes, snapshot_changes, rollup_changes
+
+
+def apply_transaction_changes(previous_states=(), current_states=()):
+    """
+    Apply the changes of `get_transaction_changes` to the balances, the balance
+    snapshots and the daily rollups, or collect the touched accounts if the
+    updates are deferred. Only the snapshots and the rollups of the current
+    states may be missing, as the ones of the previous states are kept.
+    """
+    balance_changes, snapshot_changes, rollup_changes = get_transaction_changes(
+        previous_states, current_states
+    )
+    deferred_accounts = get_deferred_accounts()
+
+    if deferred_accounts is not None:
+        deferred_accounts.update(
+            account for (account, date), amount in snapshot_changes.items() if amount
+        )
+        deferred_accounts.update(
+            account
+            for (user, account, category, date), change in rollup_changes.items()
+            if any(change.values())
+        )
+        return
+
+    Account.objects.apply_balance_changes(balance_changes)
+    BalanceSnapshot.objects.apply_balance_changes(
+        snapshot_changes,
+        missing=snapshot_changes.keys()
+        - {get_snapshot_key(state) for state in previous_states},
+    )
+    DailyRollup.objects.apply_changes(
+        rollup_changes,
+        missing=rollup_changes.keys()
+        - {get_rollup_key(state) for state in previous_states},
+    )
+
+
+def recalculate_accounts(owner):
+    """
+    Recalculate the balances, the balance snapshots and the daily rollups of all
+    accounts of `owner` or collect them if the updates are deferred.
+    """
+    accounts = Account.objects.filter(owner=owner)
+
+    with defer_balance_updates() as deferred_accounts:
+        deferred_accounts.update(accounts.values_list("pk", flat=True))
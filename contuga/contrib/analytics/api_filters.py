@@ -11,4 +11,19 @@ class ReportsFilterBackend(BaseFilterBackend):
             coreapi.Field(
                 name="start_date", location="query", required=False, type="string"
             ),
+            coreapi.Field(
+                name="end_date", location="query", required=False, type="string"
+            ),
+            coreapi.Field(
+                name="grouping", location="query", required=False, type="string"
+            ),
+            coreapi.Field(
+                name="category", location="query", required=False, type="string"
+            ),
+            coreapi.Field(
+                name="currency", location="query", required=False, type="string"
+            ),
+            coreapi.Field(
+                name="async", location="query", required=False, type="boolean"
+            ),
         ]
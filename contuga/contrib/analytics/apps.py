@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AnalyticsConfig(AppConfig):
     name = "contuga.contrib.analytics"
+
+    def ready(self):
+        from . import signals  # NOQA
@@ -0,0 +1,193 @@
+import hashlib
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from . import constants
+from .models import DataVersion
+from .utils import generate_reports
+
+CACHE_ALIAS = "analytics"
+REPORTS_KEY = "analytics:reports:{user}:{version}:{parameters}"
+STATISTICS_KEY = "analytics:statistics:{lookups}"
+STATISTICS = ("hits", "misses")
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_statistics():
+    """
+    Return the number of cache hits and misses of the reports. The counters are
+    kept in the cache itself, so they include the lookups of all processes
+    sharing it.
+    """
+    counters = get_cache().get_many(
+        [STATISTICS_KEY.format(lookups=lookups) for lookups in STATISTICS]
+    )
+
+    return {
+        lookups: counters.get(STATISTICS_KEY.format(lookups=lookups), 0)
+        for lookups in STATISTICS
+    }
+
+
+def reset_statistics():
+    get_cache().delete_many(
+        [STATISTICS_KEY.format(lookups=lookups) for lookups in STATISTICS]
+    )
+
+
+def record_lookup(hit):
+    cache = get_cache()
+    key = STATISTICS_KEY.format(lookups="hits" if hit else "misses")
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter is missing, unless another process has just added it
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_data_version(user_pk):
+    # The version is stored in the database, so a change made by any process
+    # invalidates the reports cached by all of them.
+    token, changed_at = DataVersion.objects.get_version(user_pk)
+    return token.hex
+
+
+def bump_data_version(*user_pks):
+    DataVersion.objects.bump(*user_pks)
+
+
+class PendingInvalidation:
+    # Collects the users whose reports are invalidated once the database
+    # transaction commits
+    def __init__(self):
+        self.user_pks = set()
+
+    def __call__(self):
+        bump_data_version(*self.user_pks)
+
+
+def get_pending_invalidation(connection):
+    # Callbacks registered within a rolled back savepoint are discarded, so a
+    # pending invalidation found among them has not been rolled back
+    for savepoint_ids, callback in connection.run_on_commit:
+        if isinstance(callback, PendingInvalidation):
+            return callback
+
+    pending_invalidation = PendingInvalidation()
+    transaction.on_commit(pending_invalidation)
+    return pending_invalidation
+
+
+def invalidate_reports(*user_pks):
+    """
+    Invalidate the cached reports of the users by bumping their data versions
+    once the current database transaction commits, once per transaction however
+    many changes it makes. A rolled back change leaves the data versions as they
+    were.
+    """
+    connection = transaction.get_connection()
+
+    if connection.in_atomic_block:
+        get_pending_invalidation(connection).user_pks.update(user_pks)
+    else:
+        bump_data_version(*user_pks)
+
+
+def get_reports_key(user, version, **parameters):
+    if not parameters.get("start_date") or not parameters.get("end_date"):
+        # The default date limits depend on the current date
+        parameters["today"] = timezone.now().astimezone().date()
+
+    for name in ("category", "currency"):
+        instance = parameters.get(name)
+
+        if instance:
+            parameters[name] = instance.pk
+
+    serialized = repr(sorted(parameters.items())).encode()
+
+    return REPORTS_KEY.format(
+        # The uuid is used as the primary key may be reused by another user
+        user=user.uuid,
+        version=version,
+        parameters=hashlib.md5(serialized).hexdigest(),
+    )
+
+
+def get_reports(
+    user,
+    start_date=None,
+    end_date=None,
+    report_unit=constants.MONTHS,
+    grouping=constants.ACCOUNTS,
+    category=None,
+    currency=None,
+):
+    """
+    Return the reports of `generate_reports` from the cache or generate and
+    cache them. Cached reports are invalidated by bumping the data version of
+    the user whenever their transactions, accounts, categories, currencies, tags
+    or exchange rates change.
+    """
+    parameters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "report_unit": report_unit or constants.MONTHS,
+        "grouping": grouping,
+        "category": category,
+        "currency": currency,
+    }
+    cache = get_cache()
+    key = get_reports_key(user, get_data_version(user.pk), **parameters)
+    reports = cache.get(key)
+    record_lookup(hit=reports is not None)
+
+    if reports is None:
+        reports = generate_reports(user=user, **parameters)
+        cache.set(key, reports)
+
+    return reports
+
+
+def get_reports_validators(
+    user,
+    start_date=None,
+    end_date=None,
+    report_unit=constants.MONTHS,
+    grouping=constants.ACCOUNTS,
+    category=None,
+    currency=None,
+):
+    """
+    Return the ETag and the last modification timestamp of the reports of
+    `get_reports` without generating them. Both are derived from the data
+    version stored in the database, so they change along with the data, whichever
+    process changed it.
+    """
+    parameters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "report_unit": report_unit or constants.MONTHS,
+        "grouping": grouping,
+        "category": category,
+        "currency": currency,
+    }
+    token, changed_at = DataVersion.objects.get_version(user.pk)
+    key = get_reports_key(user, token.hex, **parameters)
+    last_modified = int(changed_at.timestamp())
+
+    if not start_date or not end_date:
+        # The default date limits move at midnight
+        midnight = timezone.localtime().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        last_modified = max(last_modified, int(midnight.timestamp()))
+
+    return f'"{hashlib.md5(key.encode()).hexdigest()}"', last_modified
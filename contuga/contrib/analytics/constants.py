@@ -1,11 +1,37 @@
 from django.utils.translation import ugettext_lazy as _
 
 DAYS = "days"
+WEEKS = "weeks"
 MONTHS = "months"
+QUARTERS = "quarters"
+YEARS = "years"
 
-REPORT_UNIT_CHOICES = ((DAYS, _("Days")), (MONTHS, _("Months")))
+REPORT_UNIT_CHOICES = (
+    (DAYS, _("Days")),
+    (WEEKS, _("Weeks")),
+    (MONTHS, _("Months")),
+    (QUARTERS, _("Quarters")),
+    (YEARS, _("Years")),
+)
 
 ACCOUNTS = "accounts"
 CATEGORIES = "categories"
+TAGS = "tags"
 
-GROUPING_CHOICES = ((ACCOUNTS, _("Accounts")), (CATEGORIES, _("Categories")))
+GROUPING_CHOICES = (
+    (ACCOUNTS, _("Accounts")),
+    (CATEGORIES, _("Categories")),
+    (TAGS, _("Tags")),
+)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+JOB_STATUS_CHOICES = (
+    (PENDING, _("Pending")),
+    (RUNNING, _("Running")),
+    (COMPLETED, _("Completed")),
+    (FAILED, _("Failed")),
+)
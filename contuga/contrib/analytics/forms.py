@@ -5,9 +5,17 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from contuga.contrib.accounts import models as account_models
 from contuga.contrib.categories import models as category_models
+from contuga.contrib.currencies import models as currency_models
 
-from .constants import MONTHS, REPORT_UNIT_CHOICES
+from .constants import (
+    ACCOUNTS,
+    CATEGORIES,
+    GROUPING_CHOICES,
+    MONTHS,
+    REPORT_UNIT_CHOICES,
+)
 
 
 class ReportsFilterForm(forms.Form):
@@ -19,16 +27,99 @@ class ReportsFilterForm(forms.Form):
     )
     start_date = forms.DateField(label=_("Start date"), required=False)
     end_date = forms.DateField(label=_("End date"), required=False)
+    grouping = forms.ChoiceField(
+        label=_("Grouping"), choices=GROUPING_CHOICES, initial=ACCOUNTS, required=False
+    )
     category = forms.ModelChoiceField(
         label=_("Category"), required=False, queryset=None
     )
+    currency = forms.ModelChoiceField(
+        label=_("Base currency"),
+        required=False,
+        queryset=None,
+        help_text=_("Convert all amounts to the selected currency."),
+    )
+
+    missing_exchange_rates_message = _(
+        "Some of the exchange rates to %(currency)s are missing."
+    )
 
     def __init__(self, user, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        self.user = user
         self.fields["category"].queryset = category_models.Category.objects.filter(
             author=user
         )
+        self.fields["currency"].queryset = currency_models.Currency.objects.filter(
+            author=user
+        )
+
+    def get_report_parameters(self):
+        """
+        Return the keyword arguments of `generate_reports` for the cleaned data.
+        """
+        category = self.cleaned_data.get("category")
+        grouping = self.cleaned_data.get("grouping")
+
+        # All categories are reported when grouping by categories without
+        # selecting a specific one.
+        if category:
+            grouping = CATEGORIES
+        elif not grouping:
+            grouping = ACCOUNTS
+
+        return {
+            "report_unit": self.cleaned_data.get("report_unit"),
+            "start_date": self.cleaned_data.get("start_date"),
+            "end_date": self.cleaned_data.get("end_date"),
+            "grouping": grouping,
+            "category": category,
+            "currency": self.cleaned_data.get("currency"),
+        }
+
+    def add_missing_exchange_rates_error(self, currency):
+        """
+        Add an error for a base currency whose exchange rates went missing after
+        the validation, e.g. deleted in the meantime.
+        """
+        self.add_error(
+            "currency",
+            ValidationError(
+                message=self.missing_exchange_rates_message % {"currency": currency},
+                code="invalid",
+            ),
+        )
+
+    def clean_currency(self):
+        currency = self.cleaned_data.get("currency")
+
+        if not currency:
+            return currency
+
+        # The currencies of the reported accounts without any rates to the base one
+        missing_currencies = (
+            currency_models.Currency.objects.filter(
+                accounts__in=account_models.Account.objects.active(owner=self.user)
+            )
+            .exclude(pk=currency.pk)
+            .exclude(exchange_rates__base_currency=currency)
+            .distinct()
+        )
+
+        if missing_currencies:
+            raise ValidationError(
+                message=_(
+                    "There are no exchange rates of %(currencies)s to %(currency)s."
+                )
+                % {
+                    "currencies": ", ".join(str(item) for item in missing_currencies),
+                    "currency": currency,
+                },
+                code="invalid",
+            )
+
+        return currency
 
     def clean_start_date(self):
         start_date = self.cleaned_data.get("start_date")
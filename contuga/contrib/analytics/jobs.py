@@ -0,0 +1,44 @@
+import logging
+
+from django.utils import timezone
+
+from . import constants
+from .forms import ReportsFilterForm
+from .serializers import ReportsSerializer
+from .utils import generate_reports
+
+logger = logging.getLogger(__name__)
+
+
+def get_report_parameters(user, data):
+    """
+    Return the keyword arguments of `generate_reports` for the query `data`.
+    Invalid data is ignored and the default reports are generated instead.
+    """
+    form = ReportsFilterForm(user, data or None)
+
+    if form.is_valid():
+        return form.get_report_parameters()
+
+    return {}
+
+
+def run_job(job):
+    """
+    Generate the reports of a claimed job and store them serialized, along with
+    the final status of the job.
+    """
+    try:
+        parameters = get_report_parameters(job.author, job.parameters)
+        # The reports are generated from the database, as the reports cached by
+        # the worker process are not shared with the web processes.
+        reports = generate_reports(user=job.author, **parameters)
+        job.result = ReportsSerializer(instance=reports, many=True).data
+        job.status = constants.COMPLETED
+    except Exception as error:
+        logger.exception("Report job %s failed", job.pk)
+        job.error = str(error)
+        job.status = constants.FAILED
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=("result", "error", "status", "finished_at", "updated_at"))
@@ -0,0 +1,256 @@
+import copy
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from contuga.contrib.accounts.models import Account
+from contuga.contrib.accounts.utils import defer_balance_updates
+from contuga.contrib.categories.models import Category
+from contuga.contrib.currencies.models import Currency
+from contuga.contrib.tags.models import Tag
+from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
+from contuga.utils import get_local_date
+
+from ... import constants
+from ...utils import generate_reports
+from ...utils.common_utils import (
+    create_report,
+    get_date_limits,
+    get_period_start,
+    process_reports,
+)
+
+UserModel = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the reports of a user with transactions spanning multiple years "
+        "and prints the timings, followed by the ones of the reports processing "
+        "alone. The generated data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--years", type=int, default=3, help="Number of years with transactions."
+        )
+        parser.add_argument(
+            "--accounts", type=int, default=3, help="Number of accounts."
+        )
+        parser.add_argument(
+            "--transactions-per-day",
+            type=int,
+            default=4,
+            help="Number of transactions per account and day.",
+        )
+        parser.add_argument("--tags", type=int, default=200, help="Number of tags.")
+        parser.add_argument(
+            "--tags-per-transaction",
+            type=int,
+            default=3,
+            help="Number of tags of each transaction.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times each report is generated.",
+        )
+
+    def handle(self, *args, **options):
+        if (
+            any(
+                options[option] < 1
+                for option in (
+                    "years",
+                    "accounts",
+                    "transactions_per_day",
+                    "tags",
+                    "repeat",
+                )
+            )
+            or not 0 <= options["tags_per_transaction"] <= options["tags"]
+        ):
+            raise CommandError(
+                "All options must be positive and the tags per transaction cannot "
+                "exceed the tags."
+            )
+
+        with transaction.atomic():
+            user, category, transaction_count = self.create_data(options)
+            self.stdout.write(
+                f"Created {transaction_count} transactions in "
+                f"{options['accounts']} accounts over {options['years']} years."
+            )
+
+            end_date = timezone.now().astimezone().date()
+            start_date = end_date - timedelta(days=365 * options["years"])
+
+            for report_unit, grouping, report_category in (
+                (constants.DAYS, constants.ACCOUNTS, None),
+                (constants.WEEKS, constants.ACCOUNTS, None),
+                (constants.MONTHS, constants.ACCOUNTS, None),
+                (constants.QUARTERS, constants.ACCOUNTS, None),
+                (constants.YEARS, constants.ACCOUNTS, None),
+                (constants.DAYS, constants.CATEGORIES, category),
+                (constants.MONTHS, constants.CATEGORIES, category),
+                (constants.DAYS, constants.TAGS, None),
+                (constants.MONTHS, constants.TAGS, None),
+            ):
+                self.benchmark(
+                    options["repeat"],
+                    user=user,
+                    start_date=start_date,
+                    end_date=end_date,
+                    report_unit=report_unit,
+                    grouping=grouping,
+                    category=report_category,
+                )
+
+            transaction.set_rollback(True)
+
+        for report_unit, _ in constants.REPORT_UNIT_CHOICES:
+            self.benchmark_processing(
+                options["repeat"],
+                report_unit=report_unit,
+                start_date=start_date,
+                end_date=end_date,
+                accounts=options["accounts"],
+            )
+
+    def create_data(self, options):
+        user = UserModel.objects.create_user(
+            email=f"benchmark-{uuid.uuid4()}@example.com", password=None
+        )
+        currency = Currency.objects.create(name="Benchmark", code="BMK", author=user)
+        accounts = [
+            Account.objects.create(
+                name=f"Account {index}", currency=currency, owner=user
+            )
+            for index in range(options["accounts"])
+        ]
+        categories = [
+            Category.objects.create(name=f"Category {index}", author=user)
+            for index in range(5)
+        ] + [None]
+
+        tags = Tag.objects.bulk_create(
+            Tag(name=f"Tag {index}", author=user) for index in range(options["tags"])
+        )
+
+        # The results are comparable between the runs
+        generator = random.Random(0)
+        now = timezone.now()
+        transactions = [
+            Transaction(
+                type=generator.choice(
+                    (transaction_constants.INCOME, transaction_constants.EXPENDITURE)
+                ),
+                amount=Decimal(generator.randint(1, 10000)) / 100,
+                author=user,
+                account=account,
+                category=generator.choice(categories),
+                created_at=now - timedelta(days=day, minutes=index),
+            )
+            for day in range(365 * options["years"])
+            for account in accounts
+            for index in range(options["transactions_per_day"])
+        ]
+        created_at = [instance.created_at for instance in transactions]
+
+        with defer_balance_updates() as deferred_accounts:
+            Transaction.objects.bulk_create(transactions, batch_size=1000)
+
+            # The creation time is overridden by bulk_create
+            for instance, value in zip(transactions, created_at):
+                instance.created_at = value
+                instance.created_on = get_local_date(value)
+
+            Transaction.objects.bulk_update(
+                transactions, ["created_at", "created_on"], batch_size=1000
+            )
+            deferred_accounts.update(account.pk for account in accounts)
+
+        TransactionTag = Transaction.tags.through
+        TransactionTag.objects.bulk_create(
+            (
+                TransactionTag(transaction_id=instance.pk, tag_id=tag.pk)
+                for instance in transactions
+                for tag in generator.sample(tags, options["tags_per_transaction"])
+            ),
+            batch_size=1000,
+        )
+
+        return user, categories[0], len(transactions)
+
+    def benchmark_processing(self, repeat, report_unit, start_date, end_date, accounts):
+        """
+        Time the filling of the gaps in sparse reports, which doesn't depend on
+        the database.
+        """
+        start_date, end_date = get_date_limits(start_date, end_date, report_unit, {})
+        generator = random.Random(0)
+        reports = []
+
+        for index in range(accounts):
+            account_reports = {}
+            day = start_date.date()
+
+            while day <= end_date.date():
+                period_start = get_period_start(report_unit, day)
+                account_reports[period_start] = create_report(
+                    report_unit,
+                    period_start,
+                    income=Decimal(generator.randint(1, 10000)) / 100,
+                    expenditures=Decimal(generator.randint(1, 10000)) / 100,
+                )
+                day += timedelta(days=generator.randint(1, 7))
+
+            reports.append(
+                {"pk": index, "balance": Decimal("1000.00"), "reports": account_reports}
+            )
+
+        durations = []
+
+        for _ in range(repeat):
+            copied_reports = copy.deepcopy(reports)
+            start = time.perf_counter()
+            process_reports(copied_reports, report_unit, start_date, end_date)
+            durations.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            f"{report_unit} reports processing of {accounts} accounts: "
+            f"best {min(durations) * 1000:.1f}ms, "
+            f"mean {sum(durations) / len(durations) * 1000:.1f}ms"
+        )
+
+    def benchmark(self, repeat, **kwargs):
+        durations = []
+        query_durations = []
+
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                generate_reports(**kwargs)
+                durations.append(time.perf_counter() - start)
+
+            query_durations.append(
+                sum(float(query["time"]) for query in context.captured_queries)
+            )
+
+        self.stdout.write(
+            f"{kwargs['report_unit']} reports grouped by {kwargs['grouping']}: "
+            f"best {min(durations) * 1000:.1f}ms, "
+            f"mean {sum(durations) / len(durations) * 1000:.1f}ms, "
+            f"mean in {len(context.captured_queries)} queries "
+            f"{sum(query_durations) / len(query_durations) * 1000:.1f}ms"
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from ... import cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the number of hits and misses of the cached reports, counted by all "
+        "processes sharing the analytics cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        statistics = cache.get_statistics()
+        lookups = statistics["hits"] + statistics["misses"]
+        ratio = statistics["hits"] / lookups if lookups else 0
+
+        self.stdout.write(
+            f"Hits: {statistics['hits']}, misses: {statistics['misses']}, "
+            f"hit ratio: {ratio:.1%}."
+        )
+
+        if options["reset"]:
+            cache.reset_statistics()
+            self.stdout.write("The counters have been reset.")
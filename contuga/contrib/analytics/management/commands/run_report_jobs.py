@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...jobs import run_job
+from ...models import ReportJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the pending report jobs enqueued by the asynchronous analytics API "
+        "requests, polling for new ones until stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once there are no more pending jobs.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Number of seconds to wait before polling for new jobs.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=60,
+            help="Number of minutes after which unfinished jobs are marked as failed.",
+        )
+        parser.add_argument(
+            "--retention",
+            type=int,
+            default=24,
+            help="Number of hours for which the finished jobs are kept.",
+        )
+
+    def handle(self, *args, **options):
+        if options["interval"] <= 0 or options["timeout"] < 1:
+            raise CommandError("The interval and the timeout must be positive.")
+
+        while True:
+            job = ReportJob.objects.claim_next()
+
+            if job is not None:
+                run_job(job)
+                self.stdout.write(f"Report job {job.pk} {job.status}.")
+                continue
+
+            # The housekeeping is done only while idle
+            now = timezone.now()
+            ReportJob.objects.fail_stale(
+                started_before=now - timedelta(minutes=options["timeout"])
+            )
+            ReportJob.objects.delete_finished(
+                finished_before=now - timedelta(hours=options["retention"])
+            )
+
+            if options["once"]:
+                break
+
+            time.sleep(options["interval"])
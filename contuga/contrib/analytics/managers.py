@@ -0,0 +1,219 @@
+import operator
+import uuid
+from functools import reduce
+
+from django.db import models
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
+
+from . import constants
+
+ROLLUP_FIELDS = ("income", "expenditures", "income_count", "expenditures_count")
+
+
+class DailyRollupManager(models.Manager):
+    def apply_changes(self, changes, missing=None):
+        """
+        Apply `changes`, a mapping of (user, account, category, date) keys to
+        dicts with the changes of the income, the expenditures and their counts,
+        using a single UPDATE statement. The rollups of the `missing` keys, all of
+        them by default, are created first unless they exist. No rollups are
+        created when the account itself may be being deleted.
+        """
+        changes = {
+            key: change for key, change in changes.items() if any(change.values())
+        }
+
+        if not changes:
+            return
+
+        missing = changes.keys() if missing is None else missing & changes.keys()
+
+        if missing:
+            # The missing rollups are created empty and the changes are applied
+            # by the update below. A rollup created concurrently is left as is
+            # instead of failing on the unique constraints.
+            self.bulk_create(
+                (
+                    self.model(
+                        user_id=user,
+                        account_id=account,
+                        category_id=category,
+                        date=date,
+                    )
+                    for user, account, category, date in missing
+                ),
+                ignore_conflicts=True,
+            )
+
+        conditions = {
+            (user, account, category, date): Q(
+                user=user, account=account, category=category, date=date
+            )
+            for user, account, category, date in changes
+        }
+        rollups = self.filter(reduce(operator.or_, conditions.values()))
+        rollups.update(
+            **{
+                field: F(field)
+                + Case(
+                    *(
+                        When(conditions[key], then=Value(change[field]))
+                        for key, change in changes.items()
+                    ),
+                    default=Value(0),
+                    output_field=self.model._meta.get_field(field),
+                )
+                for field in ROLLUP_FIELDS
+            }
+        )
+
+        if any(
+            change["income_count"] < 0 or change["expenditures_count"] < 0
+            for change in changes.values()
+        ):
+            rollups.filter(income_count=0, expenditures_count=0).delete()
+
+    def detach_category(self, category):
+        """
+        Move the rollups of `category`, which is being deleted, to the rollups
+        without category of the same days, like the transactions of the category.
+        """
+        rollups = self.filter(category=category)
+        changes = {
+            (rollup.user_id, rollup.account_id, None, rollup.date): {
+                field: getattr(rollup, field) for field in ROLLUP_FIELDS
+            }
+            for rollup in rollups
+        }
+        rollups.delete()
+        self.apply_changes(changes)
+
+    def rebuild(self, accounts):
+        """
+        Replace the rollups of the given accounts with ones calculated from
+        their whole transaction history.
+        """
+        self.filter(account__in=accounts).delete()
+
+        rollups = (
+            Transaction.objects.filter(account__in=accounts)
+            .values("author", "account", "category", "created_on")
+            .annotate(
+                income=Coalesce(
+                    Sum("amount", filter=Q(type=transaction_constants.INCOME)), 0
+                ),
+                expenditures=Coalesce(
+                    Sum("amount", filter=Q(type=transaction_constants.EXPENDITURE)), 0
+                ),
+                income_count=Count("pk", filter=Q(type=transaction_constants.INCOME)),
+                expenditures_count=Count(
+                    "pk", filter=Q(type=transaction_constants.EXPENDITURE)
+                ),
+            )
+            .order_by()
+        )
+
+        self.bulk_create(
+            (
+                self.model(
+                    user_id=item["author"],
+                    account_id=item["account"],
+                    category_id=item["category"],
+                    date=item["created_on"],
+                    **{field: item[field] for field in ROLLUP_FIELDS},
+                )
+                for item in rollups
+            ),
+            batch_size=1000,
+        )
+
+
+class DataVersionManager(models.Manager):
+    def get_version(self, user):
+        """
+        Return the token and the time of the last change of the data of the user.
+        """
+        version = self.filter(user=user).values_list("token", "changed_at").first()
+
+        if version is None:
+            # The versions are created along with the users, but users created
+            # without signals may be missing one.
+            self.bulk_create([self.model(user_id=user)], ignore_conflicts=True)
+            version = self.filter(user=user).values_list("token", "changed_at").get()
+
+        return version
+
+    def bump(self, *users):
+        """
+        Replace the tokens of the users with a new one. Called once the
+        transaction of the change commits, so a rolled back change leaves the
+        previous token in place.
+        """
+        return self.filter(user__in=set(users)).update(
+            token=uuid.uuid4(), changed_at=timezone.now()
+        )
+
+
+class ReportJobManager(models.Manager):
+    def pending(self, **kwargs):
+        return self.filter(status=constants.PENDING, **kwargs)
+
+    def enqueue(self, author, parameters):
+        """
+        Return a pending job generating the reports with the given `parameters`,
+        reusing an already pending one of the same author.
+        """
+        job = self.pending(author=author, parameters=parameters).first()
+
+        if job is None:
+            job = self.create(author=author, parameters=parameters)
+
+        return job
+
+    def claim_next(self):
+        """
+        Mark the oldest pending job as running and return it or None if there
+        are no pending jobs. Each job is claimed by a conditional UPDATE, so
+        concurrent workers never run the same job.
+        """
+        while True:
+            pk = (
+                self.pending()
+                .order_by("created_at")
+                .values_list("pk", flat=True)
+                .first()
+            )
+
+            if pk is None:
+                return None
+
+            claimed = self.pending(pk=pk).update(
+                status=constants.RUNNING, started_at=timezone.now()
+            )
+
+            if claimed:
+                return self.get(pk=pk)
+
+    def fail_stale(self, started_before):
+        """
+        Mark the jobs running since before `started_before` as failed, e.g. the
+        ones of a worker which has been stopped while running them.
+        """
+        return self.filter(
+            status=constants.RUNNING, started_at__lt=started_before
+        ).update(
+            status=constants.FAILED,
+            error="The job did not finish in time.",
+            finished_at=timezone.now(),
+        )
+
+    def delete_finished(self, finished_before):
+        return self.filter(
+            status__in=(constants.COMPLETED, constants.FAILED),
+            finished_at__lt=finished_before,
+        ).delete()
@@ -0,0 +1,144 @@
+# Generated by Django 3.1.14 on 2026-10-18 01:33
+
+import django.db.models.deletion
+import pytz
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDay
+
+
+def create_daily_rollups(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    DailyRollup = apps.get_model("analytics", "DailyRollup")
+
+    rollups = (
+        Transaction.objects.annotate(
+            created_on=TruncDay("created_at", tzinfo=pytz.timezone(settings.TIME_ZONE))
+        )
+        .values("author", "account", "category", "created_on")
+        .annotate(
+            income=Coalesce(Sum("amount", filter=Q(type="income")), 0),
+            expenditures=Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
+            income_count=Count("pk", filter=Q(type="income")),
+            expenditures_count=Count("pk", filter=Q(type="expenditure")),
+        )
+        .order_by()
+    )
+
+    DailyRollup.objects.bulk_create(
+        (
+            DailyRollup(
+                user_id=item["author"],
+                account_id=item["account"],
+                category_id=item["category"],
+                date=item["created_on"].date(),
+                income=item["income"],
+                expenditures=item["expenditures"],
+                income_count=item["income_count"],
+                expenditures_count=item["expenditures_count"],
+            )
+            for item in rollups
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("accounts", "0004_balancesnapshot"),
+        ("categories", "0002_category_author"),
+        ("transactions", "0004_transaction_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "income",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=22,
+                        verbose_name="Income",
+                    ),
+                ),
+                (
+                    "expenditures",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=22,
+                        verbose_name="Expenditures",
+                    ),
+                ),
+                (
+                    "income_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Income count"),
+                ),
+                (
+                    "expenditures_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Expenditures count"
+                    ),
+                ),
+                (
+                    "account",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="accounts.account",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="daily_rollups",
+                        to="categories.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily rollup",
+                "verbose_name_plural": "Daily rollups",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="dailyrollup",
+            index=models.Index(
+                fields=["user", "date"], name="analytics_d_user_id_0c9473_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="dailyrollup",
+            unique_together={("user", "account", "category", "date")},
+        ),
+        migrations.RunPython(create_daily_rollups, migrations.RunPython.noop),
+    ]
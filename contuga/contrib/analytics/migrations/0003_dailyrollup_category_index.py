@@ -0,0 +1,20 @@
+# Generated by Django 3.1.14 on 2026-10-18 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_reportjob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dailyrollup",
+            index=models.Index(
+                fields=["user", "category", "date"],
+                name="analytics_d_user_id_ab18f2_idx",
+            ),
+        ),
+    ]
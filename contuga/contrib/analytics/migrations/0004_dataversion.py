@@ -0,0 +1,56 @@
+# Generated by Django 3.1.14 on 2026-10-18 03:16
+
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_data_versions(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    DataVersion = apps.get_model("analytics", "DataVersion")
+
+    DataVersion.objects.bulk_create(
+        (DataVersion(user_id=pk) for pk in User.objects.values_list("pk", flat=True)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("analytics", "0003_dailyrollup_category_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="data_version",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("token", models.UUIDField(default=uuid.uuid4, verbose_name="Token")),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Changed at"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Data version",
+                "verbose_name_plural": "Data versions",
+            },
+        ),
+        migrations.RunPython(create_data_versions, migrations.RunPython.noop),
+    ]
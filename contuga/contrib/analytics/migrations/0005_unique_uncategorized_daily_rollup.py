@@ -0,0 +1,55 @@
+# Generated by Django 3.1.14 on 2026-10-18 04:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+ROLLUP_FIELDS = ("income", "expenditures", "income_count", "expenditures_count")
+
+
+def merge_uncategorized_rollups(apps, schema_editor):
+    DailyRollup = apps.get_model("analytics", "DailyRollup")
+    uncategorized = DailyRollup.objects.filter(category__isnull=True)
+    duplicates = (
+        uncategorized.values("user", "account", "date")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+
+    for item in duplicates:
+        rollups = list(
+            uncategorized.filter(
+                user=item["user"], account=item["account"], date=item["date"]
+            ).order_by("pk")
+        )
+        rollup = rollups[0]
+
+        for duplicate in rollups[1:]:
+            for field in ROLLUP_FIELDS:
+                setattr(
+                    rollup, field, getattr(rollup, field) + getattr(duplicate, field)
+                )
+
+        rollup.save(update_fields=ROLLUP_FIELDS)
+        DailyRollup.objects.filter(
+            pk__in=[duplicate.pk for duplicate in rollups[1:]]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_dataversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_uncategorized_rollups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="dailyrollup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(category__isnull=True),
+                fields=("user", "account", "date"),
+                name="unique_uncategorized_daily_rollup",
+            ),
+        ),
+    ]
@@ -1 +1,116 @@
-# Create your models here.
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from contuga.models import TimestampModel
+
+from . import constants, managers
+
+UserModel = get_user_model()
+
+
+class DailyRollup(models.Model):
+    user = models.ForeignKey(
+        UserModel, related_name="daily_rollups", on_delete=models.CASCADE
+    )
+    account = models.ForeignKey(
+        "accounts.Account", related_name="daily_rollups", on_delete=models.CASCADE
+    )
+    category = models.ForeignKey(
+        "categories.Category",
+        related_name="daily_rollups",
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+    )
+    date = models.DateField(_("Date"))
+    income = models.DecimalField(
+        _("Income"), max_digits=22, decimal_places=2, default=0
+    )
+    expenditures = models.DecimalField(
+        _("Expenditures"), max_digits=22, decimal_places=2, default=0
+    )
+    income_count = models.PositiveIntegerField(_("Income count"), default=0)
+    expenditures_count = models.PositiveIntegerField(_("Expenditures count"), default=0)
+
+    objects = managers.DailyRollupManager()
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name = _("Daily rollup")
+        verbose_name_plural = _("Daily rollups")
+        unique_together = (("user", "account", "category", "date"),)
+        constraints = [
+            # The unique together constraint does not apply to the rollups
+            # without category, as NULL values are distinct
+            models.UniqueConstraint(
+                fields=["user", "account", "date"],
+                condition=models.Q(category__isnull=True),
+                name="unique_uncategorized_daily_rollup",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["user", "date"]),
+            models.Index(fields=["user", "category", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.account} - {self.date}"
+
+
+class DataVersion(models.Model):
+    # Identifies the state of the data of the user in the cached reports
+    user = models.OneToOneField(
+        UserModel,
+        related_name="data_version",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    token = models.UUIDField(_("Token"), default=uuid.uuid4)
+    changed_at = models.DateTimeField(_("Changed at"), default=timezone.now)
+
+    objects = managers.DataVersionManager()
+
+    class Meta:
+        verbose_name = _("Data version")
+        verbose_name_plural = _("Data versions")
+
+    def __str__(self):
+        return f"{self.user} - {self.changed_at}"
+
+
+class ReportJob(TimestampModel):
+    uuid = models.UUIDField(default=uuid.uuid4, primary_key=True)
+    author = models.ForeignKey(
+        UserModel, related_name="report_jobs", on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=9,
+        choices=constants.JOB_STATUS_CHOICES,
+        default=constants.PENDING,
+    )
+    # The query parameters of the reports request, validated by the worker
+    parameters = models.JSONField(_("Parameters"), default=dict, blank=True)
+    result = models.JSONField(_("Result"), blank=True, null=True)
+    error = models.TextField(_("Error"), blank=True)
+    started_at = models.DateTimeField(_("Started at"), blank=True, null=True)
+    finished_at = models.DateTimeField(_("Finished at"), blank=True, null=True)
+
+    objects = managers.ReportJobManager()
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name = _("Report job")
+        verbose_name_plural = _("Report jobs")
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.author} - {self.created_at}"
+
+    def get_absolute_url(self):
+        return reverse("reportjob-detail", kwargs={"pk": self.pk})
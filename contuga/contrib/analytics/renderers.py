@@ -0,0 +1,11 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Renders the reports in the compact columnar format, requested with
+    `?format=columnar` or by its media type.
+    """
+
+    media_type = "application/vnd.contuga.columnar+json"
+    format = "columnar"
@@ -1,5 +1,10 @@
 from rest_framework import serializers
 
+from .models import ReportJob
+from .utils.common_utils import get_report_date
+
+AMOUNT_FIELDS = ("income", "expenditures", "balance")
+
 
 class CurrencySerializer(serializers.Serializer):
     name = serializers.CharField(max_length=254)
@@ -8,7 +13,8 @@ class CurrencySerializer(serializers.Serializer):
 
 class ReportItemSerializer(serializers.Serializer):
     day = serializers.IntegerField(required=False)
-    month = serializers.IntegerField()
+    month = serializers.IntegerField(required=False)
+    quarter = serializers.IntegerField(required=False)
     year = serializers.IntegerField()
     income = serializers.DecimalField(max_digits=14, decimal_places=2)
     expenditures = serializers.DecimalField(max_digits=14, decimal_places=2)
@@ -18,7 +24,58 @@ class ReportItemSerializer(serializers.Serializer):
 class ReportsSerializer(serializers.Serializer):
     report_unit = serializers.CharField(write_only=True)
     start_date = serializers.DateField(write_only=True)
-    pk = serializers.UUIDField()
-    name = serializers.CharField()
+    # Uncategorized transactions are reported without category
+    pk = serializers.UUIDField(allow_null=True)
+    name = serializers.CharField(allow_null=True)
     currency = CurrencySerializer()
     reports = ReportItemSerializer(many=True)
+
+
+class ReportJobSerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = ReportJob
+        fields = (
+            "url",
+            "status",
+            "parameters",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+
+def serialize_columnar_reports(reports):
+    """
+    Return the reports as a shared axis of the start dates of the periods and
+    parallel arrays with the amounts of each report. The reports of all groups
+    cover the same periods, so the dates are not repeated for each of them.
+
+    The reports are serialized directly, without ReportsSerializer, as the
+    amounts of each report are many for long periods of days. The amounts are
+    still represented by the fields of ReportItemSerializer, so they are the same
+    strings in both formats.
+    """
+    periods = reports[0]["reports"] if reports else []
+    amount_fields = ReportItemSerializer().fields
+    results = []
+
+    for item in reports:
+        result = {"pk": item["pk"], "name": item["name"], "currency": item["currency"]}
+
+        for field in AMOUNT_FIELDS:
+            if periods and field in item["reports"][0]:
+                to_representation = amount_fields[field].to_representation
+                result[field] = [
+                    to_representation(report[field]) for report in item["reports"]
+                ]
+
+        results.append(result)
+
+    return {
+        "count": len(results),
+        "dates": [get_report_date(report) for report in periods],
+        "results": results,
+    }
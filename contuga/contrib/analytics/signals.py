@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from contuga.contrib.accounts.models import Account
+from contuga.contrib.accounts.utils import deferred_updates_completed
+from contuga.contrib.categories.models import Category
+from contuga.contrib.currencies.models import Currency, ExchangeRate
+from contuga.contrib.tags.models import Tag
+from contuga.contrib.transactions.models import Transaction
+
+from .cache import invalidate_reports
+from .models import DailyRollup, DataVersion
+
+UserModel = get_user_model()
+
+
+@receiver(post_save, sender=UserModel, dispatch_uid="create_user_data_version")
+def create_user_data_version(sender, instance, created, **kwargs):
+    if created:
+        DataVersion.objects.create(user=instance)
+
+
+@receiver(pre_delete, sender=Category, dispatch_uid="detach_category_rollups")
+def detach_category_rollups(sender, instance, **kwargs):
+    # The transactions of the category are left without category, so its
+    # rollups are merged into the ones without category of the same days
+    DailyRollup.objects.detach_category(instance)
+
+
+@receiver(deferred_updates_completed, dispatch_uid="rebuild_daily_rollups")
+def rebuild_daily_rollups(sender, accounts, **kwargs):
+    DailyRollup.objects.rebuild(accounts)
+    invalidate_reports(
+        *Account.objects.filter(pk__in=accounts).values_list("owner", flat=True)
+    )
+
+
+@receiver(
+    post_save, sender=Category, dispatch_uid="invalidate_reports_on_category_save"
+)
+@receiver(
+    post_delete, sender=Category, dispatch_uid="invalidate_reports_on_category_delete"
+)
+@receiver(
+    post_save, sender=Currency, dispatch_uid="invalidate_reports_on_currency_save"
+)
+@receiver(
+    post_delete, sender=Currency, dispatch_uid="invalidate_reports_on_currency_delete"
+)
+@receiver(post_save, sender=Tag, dispatch_uid="invalidate_reports_on_tag_save")
+@receiver(post_delete, sender=Tag, dispatch_uid="invalidate_reports_on_tag_delete")
+def invalidate_author_reports(sender, instance, **kwargs):
+    invalidate_reports(instance.author_id)
+
+
+@receiver(
+    m2m_changed,
+    sender=Transaction.tags.through,
+    dispatch_uid="invalidate_reports_on_transaction_tags_change",
+)
+def invalidate_tag_reports(sender, instance, action, **kwargs):
+    # The instance is either the transaction or the tag, both of the same author
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_reports(instance.author_id)
+
+
+@receiver(post_save, sender=Account, dispatch_uid="invalidate_reports_on_account_save")
+@receiver(
+    post_delete, sender=Account, dispatch_uid="invalidate_reports_on_account_delete"
+)
+def invalidate_owner_reports(sender, instance, **kwargs):
+    invalidate_reports(instance.owner_id)
+
+
+@receiver(
+    post_save,
+    sender=ExchangeRate,
+    dispatch_uid="invalidate_reports_on_exchange_rate_save",
+)
+@receiver(
+    post_delete,
+    sender=ExchangeRate,
+    dispatch_uid="invalidate_reports_on_exchange_rate_delete",
+)
+def invalidate_exchange_rate_reports(sender, instance, **kwargs):
+    invalidate_reports(instance.currency.author_id)
@@ -0,0 +1,106 @@
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from contuga.mixins import TestMixin
+
+from .. import constants
+
+
+class AnalyticsColumnarAPITestCase(APITestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user(email="john.doe@example.com", password="password")
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.category = self.create_category()
+        self.create_account(name="Second account")
+        self.create_income(amount=Decimal("310.25"))
+        self.create_expenditure(amount=Decimal("100"))
+        self.url = reverse("analytics-list")
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_columns(self, results, field):
+        return [[report[field] for report in item["reports"]] for item in results]
+
+    def test_columnar_format(self):
+        parameters = {"report_unit": constants.DAYS}
+        results = self.client.get(self.url, parameters).json()["results"]
+
+        response = self.client.get(self.url, {"format": "columnar", **parameters})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.contuga.columnar+json"
+        )
+
+        data = response.json()
+        reports = results[0]["reports"]
+        self.assertEqual(data["count"], 1)
+        self.assertListEqual(
+            data["dates"],
+            [
+                date(report["year"], report["month"], report["day"]).isoformat()
+                for report in reports
+            ],
+        )
+
+        for field in ("income", "expenditures", "balance"):
+            self.assertListEqual(
+                [item[field] for item in data["results"]],
+                self.get_columns(results, field),
+            )
+
+        self.assertDictEqual(
+            {
+                key: value
+                for key, value in data["results"][0].items()
+                if key in ("pk", "name", "currency")
+            },
+            {key: value for key, value in results[0].items() if key != "reports"},
+        )
+
+    def test_amounts_are_represented_as_in_the_regular_format(self):
+        self.create_expenditure(amount=Decimal("0.1"))
+        parameters = {"report_unit": constants.MONTHS}
+        [result] = self.client.get(self.url, parameters).json()["results"]
+
+        response = self.client.get(self.url, {"format": "columnar", **parameters})
+
+        [columnar_result] = response.json()["results"]
+        self.assertEqual(columnar_result["balance"][-1], "210.15")
+        self.assertListEqual(
+            columnar_result["balance"],
+            [report["balance"] for report in result["reports"]],
+        )
+
+    def test_columnar_format_without_balances(self):
+        response = self.client.get(
+            self.url, {"format": "columnar", "category": self.category.pk}
+        )
+
+        [result] = response.json()["results"]
+        self.assertListEqual(
+            list(result), ["pk", "name", "currency", "income", "expenditures"]
+        )
+
+    def test_columnar_format_without_reports(self):
+        self.account.delete()
+
+        response = self.client.get(self.url, {"format": "columnar"})
+
+        self.assertDictEqual(response.json(), {"count": 0, "dates": [], "results": []})
+
+    def test_etags_depend_on_the_format(self):
+        response = self.client.get(self.url)
+        columnar_response = self.client.get(
+            self.url, {"format": "columnar"}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(columnar_response.status_code, 200)
+        self.assertNotEqual(columnar_response["ETag"], response["ETag"])
+        self.assertIn("Accept", columnar_response["Vary"])
@@ -0,0 +1,104 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITransactionTestCase
+
+from contuga.mixins import TestMixin
+
+from .. import cache, constants
+from ..models import DataVersion
+
+
+# The reports are invalidated once the database transactions commit
+class AnalyticsConditionalAPITestCase(APITransactionTestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user(email="john.doe@example.com", password="password")
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.create_income(amount=Decimal("310"))
+        self.url = reverse("analytics-list")
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def test_validators_are_returned(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_unchanged_reports_are_not_generated(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with mock.patch("contuga.contrib.analytics.cache.get_reports") as get_reports:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        get_reports.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_are_returned(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.create_expenditure(amount=Decimal("10"))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            response.json()["results"][0]["reports"][-1]["balance"], "300.00"
+        )
+
+    def test_etags_depend_on_the_parameters(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(
+            self.url, {"report_unit": constants.DAYS}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etags_depend_on_the_user(self):
+        etag = self.client.get(self.url)["ETag"]
+        user = self.create_user(email="richard.roe@example.com", password="password")
+        token, created = Token.objects.get_or_create(user=user)
+        client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(response.json()["results"], [])
+
+    def test_validators_follow_changes_made_by_other_processes(self):
+        response = self.client.get(self.url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        # The worker has its own local memory cache
+        with mock.patch.object(cache, "get_cache", return_value=LocMemCache("", {})):
+            self.create_expenditure(amount=Decimal("10"))
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            response["Last-Modified"],
+            http_date(DataVersion.objects.get(user=self.user).changed_at.timestamp()),
+        )
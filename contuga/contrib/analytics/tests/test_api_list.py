@@ -264,6 +264,65 @@ class AnalyticsAPITestCase(APITestCase, TestMixin):
         }
         self.assertDictEqual(response.json(), expected_response)
 
+    def test_get_monthly_reports_for_all_categories(self):
+        category = self.create_category()
+
+        self.create_income(amount=Decimal("310"), category=category)
+
+        self.create_expenditure(amount=Decimal("100"))
+
+        url = reverse("analytics-list")
+        response = self.client.get(
+            url, {"grouping": constants.CATEGORIES}, format="json"
+        )
+
+        # Assert status code is correct
+        self.assertEqual(response.status_code, 200)
+
+        # Assert correct data is returned
+        results = response.json()["results"]
+
+        self.assertEqual(
+            [(item["pk"], item["name"]) for item in results],
+            [(str(category.pk), category.name), (None, None)],
+        )
+        self.assertEqual(results[0]["reports"][-1]["income"], "310.00")
+        self.assertEqual(results[1]["reports"][-1]["expenditures"], "100.00")
+
+    def test_get_daily_reports_for_tags(self):
+        tag = self.create_tag()
+
+        self.create_income(amount=Decimal("310"), tags=[tag])
+
+        self.create_expenditure(amount=Decimal("100"))
+
+        url = reverse("analytics-list")
+        response = self.client.get(
+            url,
+            {"report_unit": constants.DAYS, "grouping": constants.TAGS},
+            format="json",
+        )
+
+        # Assert status code is correct
+        self.assertEqual(response.status_code, 200)
+
+        # Assert correct data is returned
+        results = response.json()["results"]
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["pk"], str(tag.pk))
+        self.assertEqual(results[0]["name"], tag.name)
+        self.assertEqual(
+            results[0]["reports"][-1],
+            {
+                "day": self.now.day,
+                "month": self.now.month,
+                "year": self.now.year,
+                "income": "310.00",
+                "expenditures": "0.00",
+            },
+        )
+
     def test_get_daily_reports(self):
         self.create_income(amount=Decimal("310"))
 
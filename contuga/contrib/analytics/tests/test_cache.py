@@ -0,0 +1,211 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DatabaseError, connection, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from contuga.contrib.accounts.utils import defer_balance_updates
+from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
+from contuga.mixins import TestMixin
+
+from .. import cache, constants
+from ..models import DataVersion
+
+
+# The reports are invalidated once the database transactions commit
+class ReportsCacheTestCase(TransactionTestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.category = self.create_category()
+        self.create_income(amount=Decimal("100"))
+        cache.reset_statistics()
+
+    def get_balance(self, reports):
+        return reports[0]["reports"][-1]["balance"]
+
+    def test_reports_are_cached(self):
+        # The data version and the reports
+        with self.assertNumQueries(3):
+            reports = cache.get_reports(user=self.user)
+
+        with self.assertNumQueries(1):
+            cached_reports = cache.get_reports(user=self.user)
+
+        self.assertEqual(reports, cached_reports)
+        self.assertDictEqual(cache.get_statistics(), {"hits": 1, "misses": 1})
+
+    def test_reports_are_cached_per_parameters(self):
+        today = timezone.now().date()
+        cache.get_reports(user=self.user)
+        cache.get_reports(user=self.user, report_unit=constants.DAYS)
+        cache.get_reports(user=self.user, start_date=today, end_date=today)
+        cache.get_reports(
+            user=self.user, grouping=constants.CATEGORIES, category=self.category
+        )
+        cache.get_reports(user=self.user, report_unit=constants.DAYS)
+
+        self.assertDictEqual(cache.get_statistics(), {"hits": 1, "misses": 4})
+
+    def test_reports_are_cached_per_user(self):
+        cache.get_reports(user=self.user)
+        other_user = self.create_user(email="jane.doe@example.com")
+
+        with self.assertNumQueries(2):
+            reports = cache.get_reports(user=other_user)
+
+        self.assertListEqual(reports, [])
+
+    def test_transaction_changes_invalidate_reports(self):
+        self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 100)
+
+        transaction = self.create_expenditure(amount=Decimal("30"))
+        self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 70)
+
+        transaction.amount = Decimal("50")
+        transaction.save()
+        self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 50)
+
+        transaction.delete()
+        self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 100)
+
+        self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 4})
+
+    def test_account_changes_invalidate_reports(self):
+        cache.get_reports(user=self.user)
+
+        self.account.name = "Renamed account"
+        self.account.save()
+        reports = cache.get_reports(user=self.user)
+
+        self.assertEqual(reports[0]["name"], "Renamed account")
+        self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 2})
+
+    def test_category_changes_invalidate_reports(self):
+        self.create_expenditure(amount=Decimal("30"), category=self.category)
+        parameters = {
+            "user": self.user,
+            "grouping": constants.CATEGORIES,
+            "category": self.category,
+        }
+        cache.get_reports(**parameters)
+
+        self.category.name = "Renamed category"
+        self.category.save()
+        reports = cache.get_reports(**parameters)
+
+        self.assertEqual(reports[0]["name"], "Renamed category")
+        self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 2})
+
+    def test_tag_changes_invalidate_reports(self):
+        tag = self.create_tag()
+        transaction = self.create_expenditure(amount=Decimal("30"))
+        parameters = {"user": self.user, "grouping": constants.TAGS}
+        self.assertListEqual(cache.get_reports(**parameters), [])
+
+        transaction.tags.add(tag)
+        reports = cache.get_reports(**parameters)
+        self.assertEqual(reports[0]["reports"][-1]["expenditures"], 30)
+
+        tag.name = "Renamed tag"
+        tag.save()
+        reports = cache.get_reports(**parameters)
+        self.assertEqual(reports[0]["name"], "Renamed tag")
+
+        tag.transactions.remove(transaction)
+        self.assertListEqual(cache.get_reports(**parameters), [])
+
+        self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 4})
+
+    def test_deferred_updates_invalidate_reports(self):
+        cache.get_reports(user=self.user)
+
+        with defer_balance_updates() as accounts:
+            Transaction.objects.bulk_create(
+                [
+                    Transaction(
+                        type=transaction_constants.EXPENDITURE,
+                        amount=Decimal("10"),
+                        author=self.user,
+                        account=self.account,
+                    )
+                ]
+            )
+            accounts.add(self.account.pk)
+
+        self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 90)
+
+    def test_changes_made_by_other_processes_invalidate_reports(self):
+        # Each process has its own local memory cache
+        web_cache = LocMemCache("web", {})
+        worker_cache = LocMemCache("worker", {})
+
+        with mock.patch.object(cache, "get_cache", return_value=web_cache):
+            self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 100)
+
+        with mock.patch.object(cache, "get_cache", return_value=worker_cache):
+            self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 100)
+            self.create_expenditure(amount=Decimal("30"))
+
+        with mock.patch.object(cache, "get_cache", return_value=web_cache):
+            self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 70)
+            self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 2})
+
+    def test_missing_data_version_is_created(self):
+        DataVersion.objects.filter(user=self.user).delete()
+
+        # The missing data version, its creation in a transaction and the reports
+        with self.assertNumQueries(6):
+            cache.get_reports(user=self.user)
+
+        self.assertTrue(DataVersion.objects.filter(user=self.user).exists())
+
+    def test_rolled_back_changes_keep_the_data_version(self):
+        version = cache.get_data_version(self.user.pk)
+
+        with self.assertRaises(DatabaseError):
+            with transaction.atomic():
+                self.create_expenditure(amount=Decimal("30"))
+                # The data version is bumped once the transaction commits
+                self.assertEqual(cache.get_data_version(self.user.pk), version)
+                raise DatabaseError
+
+        self.assertEqual(cache.get_data_version(self.user.pk), version)
+
+    def test_changes_after_a_rolled_back_savepoint_invalidate_reports(self):
+        version = cache.get_data_version(self.user.pk)
+
+        with transaction.atomic():
+            with self.assertRaises(DatabaseError):
+                with transaction.atomic():
+                    self.create_expenditure(amount=Decimal("30"))
+                    raise DatabaseError
+
+            self.create_expenditure(amount=Decimal("20"))
+
+        self.assertNotEqual(cache.get_data_version(self.user.pk), version)
+        self.assertEqual(self.get_balance(cache.get_reports(user=self.user)), 80)
+
+    def test_data_version_is_bumped_once_per_transaction(self):
+        version = cache.get_data_version(self.user.pk)
+
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                for amount in ("10", "20", "30"):
+                    self.create_expenditure(amount=Decimal(amount))
+
+                self.category.name = "Renamed category"
+                self.category.save()
+
+        bumps = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('UPDATE "analytics_dataversion"')
+        ]
+        self.assertEqual(len(bumps), 1)
+        self.assertNotEqual(cache.get_data_version(self.user.pk), version)
@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from contuga.contrib.transactions.models import Transaction
+
+from .. import cache
+
+UserModel = get_user_model()
+
+
+class BenchmarkReportsTestCase(TestCase):
+    def call_command(self, *args):
+        out = StringIO()
+        call_command("benchmark_reports", *args, stdout=out)
+        return out.getvalue().splitlines()
+
+    def test_reports_are_benchmarked(self):
+        lines = self.call_command(
+            "--years=1", "--accounts=2", "--transactions-per-day=1", "--repeat=1"
+        )
+
+        self.assertEqual(
+            lines[0], "Created 730 transactions in 2 accounts over 1 years."
+        )
+        self.assertEqual(len(lines), 15)
+        self.assertTrue(lines[1].startswith("days reports grouped by accounts: best "))
+        self.assertTrue(lines[5].startswith("years reports grouped by accounts: best "))
+        self.assertTrue(
+            lines[7].startswith("months reports grouped by categories: best ")
+        )
+        self.assertTrue(lines[9].startswith("months reports grouped by tags: best "))
+        self.assertTrue(
+            lines[10].startswith("days reports processing of 2 accounts: best ")
+        )
+        self.assertTrue(
+            lines[14].startswith("years reports processing of 2 accounts: best ")
+        )
+
+    def test_generated_data_is_rolled_back(self):
+        self.call_command("--years=1", "--accounts=1", "--repeat=1")
+
+        self.assertFalse(UserModel.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_options_must_be_positive(self):
+        with self.assertRaisesMessage(CommandError, "All options must be positive"):
+            self.call_command("--repeat=0")
+
+    def test_tags_per_transaction_cannot_exceed_tags(self):
+        with self.assertRaisesMessage(CommandError, "cannot exceed the tags"):
+            self.call_command("--tags=2", "--tags-per-transaction=3")
+
+
+class ReportsCacheStatisticsTestCase(TestCase):
+    def setUp(self):
+        cache.reset_statistics()
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command("reports_cache_statistics", *args, stdout=out)
+        return out.getvalue().splitlines()
+
+    def test_statistics_are_shown(self):
+        cache.record_lookup(hit=True)
+        cache.record_lookup(hit=False)
+        cache.record_lookup(hit=False)
+        cache.record_lookup(hit=False)
+
+        self.assertListEqual(
+            self.call_command(), ["Hits: 1, misses: 3, hit ratio: 25.0%."]
+        )
+        self.assertDictEqual(cache.get_statistics(), {"hits": 1, "misses": 3})
+
+    def test_statistics_are_reset(self):
+        cache.record_lookup(hit=True)
+
+        self.assertListEqual(
+            self.call_command("--reset"),
+            ["Hits: 1, misses: 0, hit ratio: 100.0%.", "The counters have been reset."],
+        )
+        self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 0})
@@ -0,0 +1,143 @@
+from datetime import datetime, time
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from contuga.utils import get_local_timezone
+
+from ..utils import common_utils
+
+
+class ProcessReportsTestCase(SimpleTestCase):
+    def get_date(self, *args, end=False):
+        return datetime.combine(
+            datetime(*args), time.max if end else time.min, get_local_timezone()
+        )
+
+    def get_reports(self, balance):
+        return [
+            {
+                "pk": 1,
+                "balance": balance,
+                "reports": {
+                    "20210301": {
+                        "month": 3,
+                        "year": 2021,
+                        "income": Decimal("10.50"),
+                        "expenditures": Decimal("0.00"),
+                        "day": 1,
+                    },
+                    "20210227": {
+                        "month": 2,
+                        "year": 2021,
+                        "income": Decimal("0.00"),
+                        "expenditures": Decimal("3.25"),
+                        "day": 27,
+                    },
+                },
+            }
+        ]
+
+    def process_daily_reports(self, balance):
+        return common_utils.process_daily_reports(
+            self.get_reports(balance),
+            start_date=self.get_date(2021, 2, 26),
+            end_date=self.get_date(2021, 3, 2, end=True),
+        )
+
+    def test_gaps_are_filled_and_balances_calculated(self):
+        reports = self.process_daily_reports(Decimal("100.00"))
+
+        self.assertListEqual(
+            reports,
+            [
+                {
+                    "pk": 1,
+                    "reports": [
+                        {
+                            "month": 2,
+                            "year": 2021,
+                            "day": 26,
+                            "income": 0,
+                            "expenditures": 0,
+                            "balance": Decimal("92.75"),
+                        },
+                        {
+                            "month": 2,
+                            "year": 2021,
+                            "income": Decimal("0.00"),
+                            "expenditures": Decimal("3.25"),
+                            "day": 27,
+                            "balance": Decimal("89.50"),
+                        },
+                        {
+                            "month": 2,
+                            "year": 2021,
+                            "day": 28,
+                            "income": 0,
+                            "expenditures": 0,
+                            "balance": Decimal("89.50"),
+                        },
+                        {
+                            "month": 3,
+                            "year": 2021,
+                            "income": Decimal("10.50"),
+                            "expenditures": Decimal("0.00"),
+                            "day": 1,
+                            "balance": Decimal("100.00"),
+                        },
+                        {
+                            "month": 3,
+                            "year": 2021,
+                            "day": 2,
+                            "income": 0,
+                            "expenditures": 0,
+                            "balance": Decimal("100.00"),
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def test_balances_are_calculated_without_numpy(self):
+        with mock.patch.object(common_utils, "numpy", None):
+            reports = self.process_daily_reports(Decimal("100.00"))
+
+        self.assertListEqual(
+            [report["balance"] for report in reports[0]["reports"]],
+            [
+                Decimal("92.75"),
+                Decimal("89.50"),
+                Decimal("89.50"),
+                Decimal("100.00"),
+                Decimal("100.00"),
+            ],
+        )
+
+    def test_balances_exceeding_64_bits_are_exact(self):
+        balance = Decimal("100000000000000000000.00")
+        reports = self.process_daily_reports(balance)
+
+        self.assertListEqual(
+            [report["balance"] for report in reports[0]["reports"]],
+            [
+                Decimal("99999999999999999992.75"),
+                Decimal("99999999999999999989.50"),
+                Decimal("99999999999999999989.50"),
+                balance,
+                balance,
+            ],
+        )
+
+    def test_monthly_gaps_are_filled_across_years(self):
+        reports = common_utils.process_monthly_reports(
+            [{"pk": 1, "reports": {}}],
+            start_date=self.get_date(2020, 11, 1),
+            end_date=self.get_date(2021, 2, 28, end=True),
+        )
+
+        self.assertListEqual(
+            [(report["year"], report["month"]) for report in reports[0]["reports"]],
+            [(2020, 11), (2020, 12), (2021, 1), (2021, 2)],
+        )
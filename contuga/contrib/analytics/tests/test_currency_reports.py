@@ -0,0 +1,210 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from contuga.contrib.transactions.constants import EXPENDITURE, INCOME
+from contuga.mixins import TestMixin
+
+from .. import cache, constants, utils
+from ..forms import ReportsFilterForm
+
+
+# The reports are invalidated once the database transactions commit
+class CurrencyReportsTestCase(TransactionTestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user(email="john.doe@example.com", password="password")
+        self.currency = self.create_currency()
+        self.euro = self.create_currency(name="Euro", code="EUR")
+        self.category = self.create_category()
+        self.tag = self.create_tag()
+        self.account = self.create_account(name="Leva")
+        self.euro_account = self.create_account(name="Euro", currency=self.euro)
+
+        self.create_exchange_rate(
+            Decimal("2"), self.euro, self.currency, date(2021, 1, 1)
+        )
+        self.create_exchange_rate(
+            Decimal("2.5"), self.euro, self.currency, date(2021, 2, 1)
+        )
+
+        self.create_transaction_on(2021, 1, 10, type=INCOME, amount=100)
+        self.create_transaction_on(
+            2021, 1, 20, type=INCOME, amount=10, account=self.euro_account
+        )
+        self.create_transaction_on(
+            2021, 2, 10, type=EXPENDITURE, amount=4, account=self.euro_account
+        )
+
+    def create_transaction_on(self, year, month, day, **kwargs):
+        with mock.patch("django.utils.timezone.now") as mocked_now:
+            mocked_now.return_value = timezone.make_aware(
+                datetime(year, month, day, 12)
+            )
+            return self.create_transaction(tags=[self.tag], **kwargs)
+
+    def generate_reports(self, grouping, currency=None):
+        return utils.generate_reports(
+            user=self.user,
+            start_date=date(2021, 1, 1),
+            end_date=date(2021, 2, 28),
+            report_unit=constants.MONTHS,
+            grouping=grouping,
+            currency=currency,
+        )
+
+    def get_currencies(self, reports):
+        return [item["currency"]["code"] for item in reports]
+
+    def test_reports_are_split_per_currency(self):
+        reports = self.generate_reports(constants.CATEGORIES)
+
+        self.assertListEqual(self.get_currencies(reports), ["BGN", "EUR"])
+
+    def test_consolidated_account_reports(self):
+        with self.assertNumQueries(3):
+            reports = self.generate_reports(constants.ACCOUNTS, currency=self.currency)
+
+        self.assertListEqual(self.get_currencies(reports), ["BGN", "BGN"])
+        self.assertEqual(reports[0]["name"], "Euro")
+
+        # The amounts are converted with the rates at the start of the periods
+        # and the balance with the rate at the end date.
+        self.assertListEqual(
+            reports[0]["reports"],
+            [
+                {
+                    "month": 1,
+                    "year": 2021,
+                    "income": Decimal("20.00"),
+                    "expenditures": 0,
+                    "balance": Decimal("25.00"),
+                },
+                {
+                    "month": 2,
+                    "year": 2021,
+                    "income": 0,
+                    "expenditures": Decimal("10.00"),
+                    "balance": Decimal("15.00"),
+                },
+            ],
+        )
+
+    def test_consolidated_category_reports(self):
+        reports = self.generate_reports(constants.CATEGORIES, currency=self.currency)
+
+        self.assertListEqual(self.get_currencies(reports), ["BGN"])
+        self.assertListEqual(
+            [
+                (report["income"], report["expenditures"])
+                for report in reports[0]["reports"]
+            ],
+            [(Decimal("120.00"), 0), (0, Decimal("10.00"))],
+        )
+
+    def test_consolidated_tag_reports(self):
+        reports = self.generate_reports(constants.TAGS, currency=self.currency)
+
+        self.assertListEqual(self.get_currencies(reports), ["BGN"])
+        self.assertListEqual(
+            [
+                (report["income"], report["expenditures"])
+                for report in reports[0]["reports"]
+            ],
+            [(Decimal("120.00"), 0), (0, Decimal("10.00"))],
+        )
+
+    def test_reports_consolidated_to_a_foreign_currency(self):
+        self.create_exchange_rate(
+            Decimal("0.5"), self.currency, self.euro, date(2021, 1, 1)
+        )
+        reports = self.generate_reports(constants.CATEGORIES, currency=self.euro)
+
+        self.assertListEqual(self.get_currencies(reports), ["EUR"])
+        self.assertListEqual(
+            [
+                (report["income"], report["expenditures"])
+                for report in reports[0]["reports"]
+            ],
+            [(Decimal("60.00"), 0), (0, Decimal("4"))],
+        )
+
+    def test_form_requires_exchange_rates(self):
+        form = ReportsFilterForm(self.user, {"currency": self.euro.pk})
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("currency", form.errors)
+
+        form = ReportsFilterForm(self.user, {"currency": self.currency.pk})
+
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["currency"], self.currency)
+
+    def test_form_ignores_deactivated_accounts(self):
+        dollar = self.create_currency(name="US dollar", code="USD")
+        self.create_account(currency=dollar, is_active=False)
+
+        form = ReportsFilterForm(self.user, {"currency": self.currency.pk})
+
+        self.assertTrue(form.is_valid())
+
+    def get_query_params(self):
+        return {
+            "start_date": "2021-01-01",
+            "end_date": "2021-02-28",
+            "currency": self.currency.pk,
+        }
+
+    def delete_exchange_rates_after_validation(self):
+        self.euro.exchange_rates.all().delete()
+
+        return mock.patch.object(
+            ReportsFilterForm,
+            "clean_currency",
+            lambda form: form.cleaned_data.get("currency"),
+        )
+
+    def test_view_reports_exchange_rates_deleted_after_validation(self):
+        self.client.force_login(self.user)
+
+        with self.delete_exchange_rates_after_validation():
+            response = self.client.get(
+                reverse("analytics:list"), self.get_query_params()
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("currency", response.context["form"].errors)
+        self.assertEqual(response.context["grouping"], constants.ACCOUNTS)
+
+    def test_api_reports_exchange_rates_deleted_after_validation(self):
+        self.client.force_login(self.user)
+
+        with self.delete_exchange_rates_after_validation():
+            response = self.client.get(
+                reverse("analytics-list"), self.get_query_params()
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("currency", response.json())
+
+    def test_exchange_rate_changes_invalidate_reports(self):
+        cache.reset_statistics()
+        parameters = {
+            "user": self.user,
+            "start_date": date(2021, 1, 1),
+            "end_date": date(2021, 2, 28),
+            "grouping": constants.CATEGORIES,
+            "currency": self.currency,
+        }
+        cache.get_reports(**parameters)
+
+        rate = self.euro.exchange_rates.get(date=date(2021, 1, 1))
+        rate.rate = Decimal("3")
+        rate.save()
+        reports = cache.get_reports(**parameters)
+
+        self.assertEqual(reports[0]["reports"][0]["income"], Decimal("130.00"))
+        self.assertDictEqual(cache.get_statistics(), {"hits": 0, "misses": 2})
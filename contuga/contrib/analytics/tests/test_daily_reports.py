@@ -3,7 +3,9 @@ from decimal import Decimal
 from unittest import mock
 
 from dateutil.relativedelta import relativedelta
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from contuga.mixins import TestMixin
@@ -25,7 +27,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
 
         expenditure = self.create_expenditure(amount=Decimal("100")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         reports = test_utils.create_empty_reports(last_date=self.now, report_unit=DAYS)
@@ -54,6 +56,33 @@ class DailyReportsTestCase(TestCase, TestMixin):
 
         self.assertListEqual(result, expected_result)
 
+    def test_balances_are_looked_up_once_per_account(self):
+        second_account = self.create_account(name="Second account name")
+
+        for days in range(10):
+            with mock.patch(
+                "django.utils.timezone.now",
+                return_value=self.now - timedelta(days=days),
+            ):
+                self.create_income(amount=Decimal("10"))
+                self.create_income(account=second_account, amount=Decimal("20"))
+
+        with CaptureQueriesContext(connection) as context:
+            result = utils.generate_reports(user=self.user, report_unit=DAYS)
+
+        rollups_query, balances_query = [
+            query["sql"] for query in context.captured_queries
+        ]
+        # The balances are not looked up for each day of the grouped rollups, but
+        # by a single query over the accounts in the result
+        self.assertNotIn("accounts_balancesnapshot", rollups_query)
+        self.assertIn("accounts_balancesnapshot", balances_query)
+        self.assertNotIn("analytics_dailyrollup", balances_query)
+        self.assertListEqual(
+            [item["reports"][-1]["balance"] for item in result],
+            [Decimal("100"), Decimal("200")],
+        )
+
     def test_report_with_multiple_accounts(self):
         first_account_income = self.create_income(amount=Decimal("310.40")).amount
 
@@ -71,7 +100,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
             account=second_account, amount=Decimal("833.25")
         ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         first_account_reports = test_utils.create_empty_reports(
@@ -127,7 +156,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
     def test_report_with_no_income(self):
         expenditure = self.create_expenditure(amount=Decimal("100.50")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         reports = test_utils.create_empty_reports(last_date=self.now, report_unit=DAYS)
@@ -159,7 +188,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
     def test_report_with_no_expenditures(self):
         income = self.create_income(amount=Decimal("310.40")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         reports = test_utils.create_empty_reports(last_date=self.now, report_unit=DAYS)
@@ -197,7 +226,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
 
         second_expenditure = self.create_expenditure(amount=Decimal("100.50")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         reports = test_utils.create_empty_reports(last_date=self.now, report_unit=DAYS)
@@ -235,7 +264,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
 
         expenditure = self.create_expenditure(amount=Decimal("100")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         reports = test_utils.create_empty_reports(last_date=self.now, report_unit=DAYS)
@@ -289,7 +318,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner, report_unit=DAYS)
 
         reports = []
@@ -377,7 +406,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(
                 user=self.account.owner, start_date=yesterday, report_unit=DAYS
             )
@@ -443,7 +472,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(
                 user=self.account.owner, end_date=yesterday, report_unit=DAYS
             )
@@ -524,7 +553,7 @@ class DailyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(
                 user=self.account.owner,
                 start_date=yesterday,
@@ -24,7 +24,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
 
         expenditure = self.create_expenditure(amount=Decimal("100")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         reports = test_utils.create_empty_reports(last_date=self.now)
@@ -69,7 +69,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
             account=second_account, amount=Decimal("833.25")
         ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         first_account_reports = test_utils.create_empty_reports(last_date=self.now)
@@ -122,7 +122,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
     def test_report_with_no_income(self):
         expenditure = self.create_expenditure(amount=Decimal("100.50")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         reports = test_utils.create_empty_reports(last_date=self.now)
@@ -153,7 +153,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
     def test_report_with_no_expenditures(self):
         income = self.create_income(amount=Decimal("310.40")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         reports = test_utils.create_empty_reports(last_date=self.now)
@@ -190,7 +190,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
 
         second_expenditure = self.create_expenditure(amount=Decimal("100.50")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         reports = test_utils.create_empty_reports(last_date=self.now)
@@ -227,7 +227,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
 
         expenditure = self.create_expenditure(amount=Decimal("100")).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         reports = test_utils.create_empty_reports(last_date=self.now)
@@ -297,7 +297,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(user=self.account.owner)
 
         reports = []
@@ -392,7 +392,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(
                 self.account.owner, first_day_of_the_last_month
             )
@@ -462,7 +462,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(
                 user=self.account.owner, end_date=one_month_ago
             )
@@ -541,7 +541,7 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
                 amount=Decimal("11.32")
             ).amount
 
-        with self.assertNumQueries(1):
+        with self.assertNumQueries(2):
             result = utils.generate_reports(
                 user=self.account.owner,
                 start_date=first_day_of_the_last_month,
@@ -941,3 +941,138 @@ class MonthlyReportsTestCase(TestCase, TestMixin):
         ]
 
         self.assertListEqual(result, expected_result)
+
+    def test_reports_for_all_categories(self):
+        first_category = self.create_category(name="Bills")
+        second_category = self.create_category(name="Food")
+
+        currency = self.create_currency(name="Euro", code="EUR")
+        second_account = self.create_account(name="EUR account", currency=currency)
+
+        self.create_income(amount=Decimal("310.40"), category=first_category)
+        self.create_expenditure(amount=Decimal("100.50"), category=first_category)
+        self.create_expenditure(
+            amount=Decimal("20.10"), category=first_category, account=second_account
+        )
+        self.create_expenditure(amount=Decimal("15.25"), category=second_category)
+        self.create_income(amount=Decimal("53.33"))
+
+        with self.assertNumQueries(1):
+            result = utils.generate_reports(
+                user=self.account.owner, grouping=constants.CATEGORIES
+            )
+
+        def get_reports(income, expenditures):
+            reports = test_utils.create_empty_reports(
+                last_date=self.now, hasBalance=False
+            )
+            reports.append(
+                {
+                    "month": self.now.month,
+                    "year": self.now.year,
+                    "income": income,
+                    "expenditures": expenditures,
+                }
+            )
+            return reports
+
+        bgn = {"name": self.currency.name, "code": self.currency.code}
+        eur = {"name": currency.name, "code": currency.code}
+        expected_result = [
+            {
+                "pk": first_category.pk,
+                "name": first_category.name,
+                "currency": bgn,
+                "reports": get_reports(Decimal("310.40"), Decimal("100.50")),
+            },
+            {
+                "pk": first_category.pk,
+                "name": first_category.name,
+                "currency": eur,
+                "reports": get_reports(0, Decimal("20.10")),
+            },
+            {
+                "pk": second_category.pk,
+                "name": second_category.name,
+                "currency": bgn,
+                "reports": get_reports(0, Decimal("15.25")),
+            },
+            {
+                "pk": None,
+                "name": None,
+                "currency": bgn,
+                "reports": get_reports(Decimal("53.33"), 0),
+            },
+        ]
+
+        self.assertListEqual(result, expected_result)
+
+    def test_reports_for_tags(self):
+        first_tag = self.create_tag(name="Holiday")
+        second_tag = self.create_tag(name="Work")
+
+        currency = self.create_currency(name="Euro", code="EUR")
+        second_account = self.create_account(name="EUR account", currency=currency)
+
+        self.create_income(amount=Decimal("310.40"), tags=[first_tag, second_tag])
+        self.create_expenditure(amount=Decimal("100.50"), tags=[first_tag])
+        self.create_expenditure(
+            amount=Decimal("20.10"), tags=[first_tag], account=second_account
+        )
+        self.create_expenditure(amount=Decimal("15.25"))
+
+        with self.assertNumQueries(1):
+            result = utils.generate_reports(
+                user=self.account.owner, grouping=constants.TAGS
+            )
+
+        def get_reports(income, expenditures):
+            reports = test_utils.create_empty_reports(
+                last_date=self.now, hasBalance=False
+            )
+            reports.append(
+                {
+                    "month": self.now.month,
+                    "year": self.now.year,
+                    "income": income,
+                    "expenditures": expenditures,
+                }
+            )
+            return reports
+
+        bgn = {"name": self.currency.name, "code": self.currency.code}
+        eur = {"name": currency.name, "code": currency.code}
+        expected_result = [
+            {
+                "pk": first_tag.pk,
+                "name": first_tag.name,
+                "currency": bgn,
+                "reports": get_reports(Decimal("310.40"), Decimal("100.50")),
+            },
+            {
+                "pk": first_tag.pk,
+                "name": first_tag.name,
+                "currency": eur,
+                "reports": get_reports(0, Decimal("20.10")),
+            },
+            {
+                "pk": second_tag.pk,
+                "name": second_tag.name,
+                "currency": bgn,
+                "reports": get_reports(Decimal("310.40"), 0),
+            },
+        ]
+
+        self.assertListEqual(result, expected_result)
+
+    def test_reports_for_tags_of_inactive_accounts_are_excluded(self):
+        tag = self.create_tag()
+        self.create_income(amount=Decimal("310.40"), tags=[tag])
+        self.account.is_active = False
+        self.account.save()
+
+        result = utils.generate_reports(
+            user=self.account.owner, grouping=constants.TAGS
+        )
+
+        self.assertListEqual(result, [])
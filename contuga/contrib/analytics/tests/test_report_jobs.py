@@ -0,0 +1,166 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from contuga.mixins import TestMixin
+
+from .. import constants
+from ..models import ReportJob
+
+
+class ReportJobsAPITestCase(APITestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user(email="john.doe@example.com", password="password")
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.create_income(amount=Decimal("310"))
+        self.create_expenditure(amount=Decimal("100"))
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def run_jobs(self):
+        out = StringIO()
+        call_command("run_report_jobs", "--once", stdout=out)
+        return out.getvalue().splitlines()
+
+    def test_reports_are_generated_asynchronously(self):
+        url = reverse("analytics-list")
+        parameters = {"report_unit": constants.DAYS}
+
+        response = self.client.get(url, {"async": "true", **parameters})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], constants.PENDING)
+        self.assertDictEqual(response.json()["parameters"], parameters)
+        self.assertEqual(response["Location"], response.json()["url"])
+
+        job = ReportJob.objects.get()
+        self.assertEqual(job.author, self.user)
+        self.assertListEqual(
+            self.run_jobs(), [f"Report job {job.pk} {constants.COMPLETED}."]
+        )
+
+        job_response = self.client.get(response["Location"])
+        expected_response = self.client.get(url, parameters)
+
+        self.assertEqual(job_response.status_code, 200)
+        self.assertEqual(job_response.json()["status"], constants.COMPLETED)
+        self.assertListEqual(
+            job_response.json()["result"], expected_response.json()["results"]
+        )
+
+    def test_invalid_parameters_are_not_enqueued(self):
+        response = self.client.get(
+            reverse("analytics-list"),
+            {"async": "true", "report_unit": "decades", "end_date": "yesterday"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertCountEqual(response.json(), ["report_unit", "end_date"])
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_jobs_do_not_use_the_reports_cache(self):
+        response = self.client.get(reverse("analytics-list"), {"async": "1"})
+
+        with mock.patch("contuga.contrib.analytics.cache.get_reports") as get_reports:
+            self.run_jobs()
+
+        get_reports.assert_not_called()
+        response = self.client.get(response["Location"])
+        self.assertEqual(response.json()["status"], constants.COMPLETED)
+
+    def test_pending_jobs_are_reused(self):
+        url = reverse("analytics-list")
+
+        first_response = self.client.get(url, {"async": "1"})
+        second_response = self.client.get(url, {"async": "1"})
+        self.client.get(url, {"async": "1", "report_unit": constants.DAYS})
+
+        self.assertEqual(first_response.json()["url"], second_response.json()["url"])
+        self.assertEqual(ReportJob.objects.count(), 2)
+
+        self.run_jobs()
+        self.client.get(url, {"async": "1"})
+
+        self.assertEqual(ReportJob.objects.count(), 3)
+
+    def test_failed_jobs(self):
+        response = self.client.get(reverse("analytics-list"), {"async": "1"})
+
+        with mock.patch(
+            "contuga.contrib.analytics.jobs.generate_reports",
+            side_effect=ValueError("Something went wrong"),
+        ):
+            self.run_jobs()
+
+        response = self.client.get(response["Location"])
+
+        self.assertEqual(response.json()["status"], constants.FAILED)
+        self.assertEqual(response.json()["error"], "Something went wrong")
+        self.assertIsNone(response.json()["result"])
+
+    def test_jobs_of_other_users_are_not_accessible(self):
+        user = self.create_user(email="richard.roe@example.com", password="password")
+        job = ReportJob.objects.enqueue(author=user, parameters={})
+
+        response = self.client.get(reverse("reportjob-detail", args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(reverse("reportjob-list"))
+        self.assertEqual(response.json()["count"], 0)
+
+
+class ReportJobManagerTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+
+    def test_jobs_are_claimed_in_order(self):
+        first_job = ReportJob.objects.enqueue(author=self.user, parameters={})
+        second_job = ReportJob.objects.enqueue(
+            author=self.user, parameters={"report_unit": constants.DAYS}
+        )
+
+        self.assertEqual(ReportJob.objects.claim_next(), first_job)
+        self.assertEqual(ReportJob.objects.claim_next(), second_job)
+        self.assertIsNone(ReportJob.objects.claim_next())
+
+        first_job.refresh_from_db()
+        self.assertEqual(first_job.status, constants.RUNNING)
+        self.assertIsNotNone(first_job.started_at)
+
+    def test_housekeeping(self):
+        now = timezone.now()
+        stale_job = ReportJob.objects.create(
+            author=self.user,
+            status=constants.RUNNING,
+            started_at=now - timedelta(hours=2),
+        )
+        running_job = ReportJob.objects.create(
+            author=self.user, status=constants.RUNNING, started_at=now
+        )
+        old_job = ReportJob.objects.create(
+            author=self.user,
+            status=constants.COMPLETED,
+            finished_at=now - timedelta(days=2),
+        )
+        recent_job = ReportJob.objects.create(
+            author=self.user, status=constants.FAILED, finished_at=now
+        )
+
+        call_command("run_report_jobs", "--once", stdout=StringIO())
+
+        stale_job.refresh_from_db()
+        running_job.refresh_from_db()
+        self.assertEqual(stale_job.status, constants.FAILED)
+        self.assertEqual(running_job.status, constants.RUNNING)
+        self.assertFalse(ReportJob.objects.filter(pk=old_job.pk).exists())
+        self.assertTrue(ReportJob.objects.filter(pk=recent_job.pk).exists())
@@ -0,0 +1,154 @@
+from datetime import date, datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from contuga.contrib.transactions.constants import EXPENDITURE, INCOME
+from contuga.mixins import TestMixin
+
+from .. import constants, utils
+from ..utils.common_utils import get_date_limits
+from ..utils.reports import REPORTS
+
+
+class ReportUnitsTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user(email="john.doe@example.com", password="password")
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.category = self.create_category()
+
+        self.create_transaction_on(2021, 2, 10, type=INCOME, amount=100)
+        self.create_transaction_on(2021, 5, 20, type=EXPENDITURE, amount=30)
+        self.create_transaction_on(2022, 1, 3, type=INCOME, amount=50)
+
+    def create_transaction_on(self, year, month, day, **kwargs):
+        with mock.patch("django.utils.timezone.now") as mocked_now:
+            mocked_now.return_value = timezone.make_aware(
+                datetime(year, month, day, 12)
+            )
+            return self.create_transaction(**kwargs)
+
+    def generate_reports(self, report_unit, grouping=constants.ACCOUNTS):
+        return utils.generate_reports(
+            user=self.user,
+            start_date=date(2020, 12, 30),
+            end_date=date(2022, 1, 5),
+            report_unit=report_unit,
+            grouping=grouping,
+            category=self.category if grouping == constants.CATEGORIES else None,
+        )
+
+    def test_yearly_reports(self):
+        with self.assertNumQueries(2):
+            result = self.generate_reports(constants.YEARS)
+
+        self.assertListEqual(
+            result[0]["reports"],
+            [
+                {"year": 2020, "income": 0, "expenditures": 0, "balance": 0},
+                {"year": 2021, "income": 100, "expenditures": 30, "balance": 70},
+                {"year": 2022, "income": 50, "expenditures": 0, "balance": 120},
+            ],
+        )
+
+    def test_quarterly_reports(self):
+        with self.assertNumQueries(2):
+            result = self.generate_reports(constants.QUARTERS)
+
+        self.assertListEqual(
+            [
+                (
+                    report["year"],
+                    report["quarter"],
+                    report["month"],
+                    report["income"],
+                    report["expenditures"],
+                    report["balance"],
+                )
+                for report in result[0]["reports"]
+            ],
+            [
+                (2020, 4, 10, 0, 0, 0),
+                (2021, 1, 1, 100, 0, 100),
+                (2021, 2, 4, 0, 30, 70),
+                (2021, 3, 7, 0, 0, 70),
+                (2021, 4, 10, 0, 0, 70),
+                (2022, 1, 1, 50, 0, 120),
+            ],
+        )
+
+    def test_weekly_reports(self):
+        with self.assertNumQueries(2):
+            result = self.generate_reports(constants.WEEKS)
+
+        reports = result[0]["reports"]
+
+        # The weeks start on Monday, 28 December 2020 and end on 3 January 2022
+        self.assertEqual(len(reports), 54)
+        self.assertDictEqual(
+            reports[0],
+            {
+                "day": 28,
+                "month": 12,
+                "year": 2020,
+                "income": 0,
+                "expenditures": 0,
+                "balance": 0,
+            },
+        )
+        self.assertDictEqual(
+            reports[6],
+            {
+                "day": 8,
+                "month": 2,
+                "year": 2021,
+                "income": 100,
+                "expenditures": 0,
+                "balance": 100,
+            },
+        )
+        self.assertDictEqual(
+            reports[-1],
+            {
+                "day": 3,
+                "month": 1,
+                "year": 2022,
+                "income": 50,
+                "expenditures": 0,
+                "balance": 120,
+            },
+        )
+
+    def test_yearly_category_reports(self):
+        with self.assertNumQueries(1):
+            result = self.generate_reports(
+                constants.YEARS, grouping=constants.CATEGORIES
+            )
+
+        self.assertListEqual(
+            result[0]["reports"],
+            [
+                {"year": 2020, "income": 0, "expenditures": 0},
+                {"year": 2021, "income": 100, "expenditures": 30},
+                {"year": 2022, "income": 50, "expenditures": 0},
+            ],
+        )
+
+    def test_default_periods_start_at_the_beginning_of_the_period(self):
+        with mock.patch("django.utils.timezone.now") as mocked_now:
+            mocked_now.return_value = timezone.make_aware(datetime(2022, 1, 5, 12))
+
+            for report_unit, expected_start_date in (
+                (constants.WEEKS, date(2021, 10, 18)),
+                (constants.QUARTERS, date(2020, 10, 1)),
+                (constants.YEARS, date(2018, 1, 1)),
+            ):
+                with self.subTest(report_unit=report_unit):
+                    start_date, end_date = get_date_limits(
+                        None, None, report_unit, REPORTS[report_unit]
+                    )
+
+                    self.assertEqual(start_date.date(), expected_start_date)
+                    self.assertEqual(end_date.date(), date(2022, 1, 5))
@@ -0,0 +1,197 @@
+from decimal import Decimal
+from unittest import mock
+
+from dateutil.relativedelta import relativedelta
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+
+from contuga.contrib.accounts.models import Account
+from contuga.contrib.accounts.utils import defer_balance_updates
+from contuga.mixins import TestMixin
+from contuga.utils import get_local_date
+
+from ..models import DailyRollup
+
+
+class DailyRollupTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.category = self.create_category()
+
+    def get_rollups(self):
+        return list(
+            DailyRollup.objects.order_by("date", "account__name", "category").values(
+                "account",
+                "category",
+                "date",
+                "income",
+                "expenditures",
+                "income_count",
+                "expenditures_count",
+            )
+        )
+
+    def create_transaction_in_the_past(self, days, **kwargs):
+        with mock.patch("django.utils.timezone.now") as mocked_now:
+            mocked_now.return_value = self.now - relativedelta(days=days)
+            return self.create_transaction(**kwargs)
+
+    def test_rollups_are_created_and_updated_on_transaction_create(self):
+        self.create_income(amount=Decimal("100"))
+        self.create_expenditure(amount=Decimal("30"))
+        self.create_expenditure(amount=Decimal("20"))
+
+        self.assertListEqual(
+            self.get_rollups(),
+            [
+                {
+                    "account": self.account.pk,
+                    "category": self.category.pk,
+                    "date": get_local_date(self.now),
+                    "income": Decimal("100"),
+                    "expenditures": Decimal("50"),
+                    "income_count": 1,
+                    "expenditures_count": 2,
+                }
+            ],
+        )
+
+    def test_rollups_are_moved_on_transaction_update(self):
+        second_account = self.create_account(name="Second account name")
+        expenditure = self.create_expenditure(amount=Decimal("30"))
+
+        expenditure.account = second_account
+        expenditure.category = None
+        expenditure.save()
+
+        self.assertListEqual(
+            self.get_rollups(),
+            [
+                {
+                    "account": second_account.pk,
+                    "category": None,
+                    "date": get_local_date(self.now),
+                    "income": Decimal("0"),
+                    "expenditures": Decimal("30"),
+                    "income_count": 0,
+                    "expenditures_count": 1,
+                }
+            ],
+        )
+
+    def test_empty_rollups_are_deleted(self):
+        income = self.create_income(amount=Decimal("100"))
+        expenditure = self.create_expenditure(amount=Decimal("30"))
+
+        income.delete()
+        self.assertEqual(len(self.get_rollups()), 1)
+
+        expenditure.delete()
+        self.assertListEqual(self.get_rollups(), [])
+
+    def test_rollup_created_concurrently_is_updated(self):
+        date = get_local_date(self.now)
+        # Created by a concurrent transaction after the rollup was looked up
+        DailyRollup.objects.create(
+            user=self.user,
+            account=self.account,
+            date=date,
+            income=Decimal("50"),
+            income_count=1,
+        )
+        change = {
+            "income": Decimal("100"),
+            "expenditures": 0,
+            "income_count": 1,
+            "expenditures_count": 0,
+        }
+
+        # The ignored insert and the update
+        with self.assertNumQueries(2):
+            DailyRollup.objects.apply_changes(
+                {(self.user.pk, self.account.pk, None, date): change}
+            )
+
+        rollup = DailyRollup.objects.get()
+        self.assertEqual(rollup.income, Decimal("150"))
+        self.assertEqual(rollup.income_count, 2)
+
+    def test_rollups_without_category_are_unique(self):
+        date = get_local_date(self.now)
+        DailyRollup.objects.create(user=self.user, account=self.account, date=date)
+
+        with self.assertRaises(IntegrityError):
+            DailyRollup.objects.create(user=self.user, account=self.account, date=date)
+
+    def test_incremental_rollups_match_rebuilt_ones(self):
+        second_account = self.create_account(name="Second account name")
+        second_category = self.create_category(name="Second category name")
+
+        for days in (30, 1, 15, 2, 30, 7):
+            self.create_transaction_in_the_past(days=days, amount=Decimal(days))
+            self.create_transaction_in_the_past(
+                days=days, account=second_account, category=second_category
+            )
+            income = self.create_income(amount=Decimal("3.25"))
+
+        income.category = second_category
+        income.save()
+
+        rollups = self.get_rollups()
+        DailyRollup.objects.rebuild(Account.objects.all())
+
+        self.assertListEqual(rollups, self.get_rollups())
+
+    def test_rollups_are_rebuilt_after_deferred_updates(self):
+        self.create_income(amount=Decimal("100"))
+
+        with defer_balance_updates():
+            self.create_income(amount=Decimal("50"))
+            self.create_transaction_in_the_past(days=3, amount=Decimal("20"))
+
+            self.assertEqual(self.get_rollups()[0]["income"], Decimal("100"))
+
+        rollups = self.get_rollups()
+        self.assertEqual(len(rollups), 2)
+        self.assertEqual(rollups[0]["expenditures"], Decimal("20"))
+        self.assertEqual(rollups[1]["income"], Decimal("150"))
+
+    def test_category_and_account_delete(self):
+        income = self.create_income(amount=Decimal("100"))
+        uncategorized = self.create_income(amount=Decimal("50"))
+        uncategorized.category = None
+        uncategorized.save()
+
+        self.category.delete()
+
+        # The rollups are merged into the one without category
+        self.assertListEqual(
+            self.get_rollups(),
+            [
+                {
+                    "account": self.account.pk,
+                    "category": None,
+                    "date": get_local_date(self.now),
+                    "income": Decimal("150"),
+                    "expenditures": Decimal("0"),
+                    "income_count": 2,
+                    "expenditures_count": 0,
+                }
+            ],
+        )
+
+        income.refresh_from_db()
+        income.amount = Decimal("10")
+        income.save()
+
+        self.assertEqual(
+            sum(rollup["income"] for rollup in self.get_rollups()), Decimal("60")
+        )
+
+        self.account.delete()
+
+        self.assertListEqual(self.get_rollups(), [])
@@ -73,6 +73,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.MONTHS,
                 "start_date": None,
                 "end_date": None,
@@ -131,6 +133,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.MONTHS,
                 "start_date": today,
                 "end_date": None,
@@ -230,6 +234,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.MONTHS,
                 "start_date": None,
                 "end_date": one_month_ago.date(),
@@ -333,6 +339,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.MONTHS,
                 "start_date": one_month_ago.date(),
                 "end_date": one_month_ago.date(),
@@ -367,12 +375,37 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": category,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.MONTHS,
                 "start_date": None,
                 "end_date": None,
             },
         )
 
+    def test_get_monthly_reports_for_all_categories(self):
+        category = self.create_category()
+
+        self.create_income(amount=Decimal("310"), category=category)
+
+        self.create_expenditure(amount=Decimal("100"))
+
+        url = reverse("analytics:list")
+        response = self.client.get(url, {"grouping": constants.CATEGORIES}, follow=True)
+
+        # Assert status code is correct
+        self.assertEqual(response.status_code, 200)
+
+        # Assert reports are correct
+        expected_reports = utils.generate_reports(
+            user=self.account.owner, grouping=constants.CATEGORIES
+        )
+        expected_json = json.dumps(expected_reports, cls=DjangoJSONEncoder)
+
+        self.assertEqual(len(expected_reports), 2)
+        self.assertEqual(response.context["reports"], expected_json)
+        self.assertEqual(response.context["grouping"], constants.CATEGORIES)
+
     def test_get_daily_reports(self):
         self.create_income(amount=Decimal("310"))
 
@@ -399,6 +432,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.DAYS,
                 "start_date": None,
                 "end_date": None,
@@ -435,6 +470,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.DAYS,
                 "start_date": today,
                 "end_date": None,
@@ -479,6 +516,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.DAYS,
                 "start_date": None,
                 "end_date": yesterday.date(),
@@ -530,6 +569,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": None,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.DAYS,
                 "start_date": yesterday.date(),
                 "end_date": yesterday.date(),
@@ -569,6 +610,8 @@ class AnalyticsTestCase(TestCase, TestMixin):
             form.cleaned_data,
             {
                 "category": category,
+                "grouping": "",
+                "currency": None,
                 "report_unit": constants.DAYS,
                 "start_date": None,
                 "end_date": None,
@@ -1,58 +1,61 @@
-import pytz
-from django.db.models import DecimalField, OuterRef, Q, Subquery, Sum
+from django.db.models import OuterRef, Subquery, Sum
 from django.db.models.functions import Coalesce
 
-from .. import constants
-from .common_utils import construct_date_string
-
-
-def get_accounts_data(transactions, start_date, end_date, truncClass):
-    if end_date:
-        # Calculte the account balance until the selected end_date
-        account__balance = (
-            transactions.filter(
-                account__pk=OuterRef("account__pk"),
-                created_at__lte=end_date.astimezone(pytz.UTC),
-            )
-            .annotate(created_on=truncClass("created_at", tzinfo=start_date.tzinfo))
-            .values("account__pk")
-            .annotate(
-                balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
-                - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0)
-            )
-            .values("balance")
-            .order_by()
-        )
+from contuga.contrib.accounts.models import Account, BalanceSnapshot
+
+from .common_utils import create_report
+
+
+def get_account_balances(accounts, end_date):
+    # The end_date is always the end of a day, so the account balance until then
+    # is the closing balance stored in the latest snapshot until that day.
+    closing_balance = BalanceSnapshot.objects.closing_balance(
+        account=OuterRef("pk"), date=end_date.date()
+    ).values("balance")
 
-    queryset = transactions.filter(
-        created_at__gte=start_date.astimezone(pytz.UTC),
-        created_at__lte=end_date.astimezone(pytz.UTC),
-    ).annotate(created_on=truncClass("created_at", tzinfo=start_date.tzinfo))
-
-    values = [
-        "account__name",
-        "account__pk",
-        "account__currency__code",
-        "account__currency__name",
-        "created_on",
-    ]
-
-    queryset = queryset.annotate(
-        account__balance=Subquery(account__balance, output_field=DecimalField())
+    return dict(
+        Account.objects.filter(pk__in=accounts)
+        .annotate(closing_balance=Subquery(closing_balance))
+        .values_list("pk", "closing_balance")
     )
 
-    values.append("account__balance")
 
-    return (
-        queryset.values(*values).annotate(
-            income=Coalesce(Sum("amount", filter=Q(type="income")), 0),
-            expenditures=Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
+def get_accounts_data(rollups, start_date, end_date, truncClass):
+    queryset = rollups.filter(
+        date__gte=start_date.date(), date__lte=end_date.date()
+    ).annotate(created_on=truncClass("date"))
+
+    aggregated_data = list(
+        queryset.values(
+            "account__name",
+            "account__pk",
+            "account__currency__pk",
+            "account__currency__code",
+            "account__currency__name",
+            "created_on",
+        ).annotate(
+            income=Coalesce(Sum("income"), 0),
+            expenditures=Coalesce(Sum("expenditures"), 0),
         )
         # order_by() is used to remove the default ordering from Group By
         # https://docs.djangoproject.com/en/2.2/topics/db/aggregation/#interaction-with-default-ordering-or-order-by
         .order_by("account__name")
     )
 
+    if not aggregated_data:
+        return aggregated_data
+
+    # The balances are looked up in a separate query over the accounts in the
+    # result, so the closing balance subquery is not part of the grouping above.
+    balances = get_account_balances(
+        {item["account__pk"] for item in aggregated_data}, end_date
+    )
+
+    for item in aggregated_data:
+        item["account__balance"] = balances[item["account__pk"]]
+
+    return aggregated_data
+
 
 def group_account_reports(aggregated_data, report_unit):
     grouped_reports = {}
@@ -73,23 +76,11 @@ def group_account_reports(aggregated_data, report_unit):
 
         account = grouped_reports.setdefault(item["account__pk"], default)
 
-        year = item["created_on"].year
-        month = item["created_on"].month
-
-        report = {
-            "month": month,
-            "year": year,
-            "income": item["income"],
-            "expenditures": item["expenditures"],
-        }
-
-        if report_unit == constants.DAYS:
-            day = item["created_on"].day
-            key = construct_date_string(year, month, day)
-            report["day"] = day
-        else:
-            key = construct_date_string(year, month)
-
-        account["reports"][key] = report
+        account["reports"][item["created_on"]] = create_report(
+            report_unit,
+            item["created_on"],
+            income=item["income"],
+            expenditures=item["expenditures"],
+        )
 
     return list(grouped_reports.values())
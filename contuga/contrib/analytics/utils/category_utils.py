@@ -1,37 +1,40 @@
-import pytz
-from django.db.models import Q, Sum
+from django.db.models import F, Sum
 from django.db.models.functions import Coalesce
 
-from .. import constants
-from .common_utils import construct_date_string
+from .common_utils import create_report
 
 
-def get_categories_data(transactions, start_date, end_date, category, truncClass):
-    transactions = transactions.filter(category=category).annotate(
-        created_on=truncClass("created_at", tzinfo=start_date.tzinfo)
-    )
+def get_categories_data(rollups, start_date, end_date, category, truncClass):
+    # All categories, including the uncategorized transactions, are aggregated
+    # at once unless a specific category is requested.
+    if category:
+        rollups = rollups.filter(category=category)
+
+    rollups = rollups.annotate(created_on=truncClass("date"))
 
     values = [
         "category__name",
         "category__pk",
+        "account__currency__pk",
         "account__currency__code",
         "account__currency__name",
         "created_on",
     ]
 
     return (
-        transactions.values(*values)
-        .filter(
-            created_at__gte=start_date.astimezone(pytz.UTC),
-            created_at__lte=end_date.astimezone(pytz.UTC),
-        )
+        rollups.values(*values)
+        .filter(date__gte=start_date.date(), date__lte=end_date.date())
         .annotate(
-            income=Coalesce(Sum("amount", filter=Q(type="income")), 0),
-            expenditures=Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
+            income=Coalesce(Sum("income"), 0),
+            expenditures=Coalesce(Sum("expenditures"), 0),
         )
         # order_by() is used to remove the default ordering from Group By
         # https://docs.djangoproject.com/en/2.2/topics/db/aggregation/#interaction-with-default-ordering-or-order-by
-        .order_by("category__name")
+        .order_by(
+            F("category__name").asc(nulls_last=True),
+            "category__pk",
+            "account__currency__code",
+        )
     )
 
 
@@ -48,31 +51,16 @@ def group_category_reports(aggregated_data, report_unit):
             },
             "reports": {},
         }
-        currency = item["account__currency__code"]
+        currency = item["account__currency__pk"]
         pk = item["category__pk"]
 
         account = grouped_reports.setdefault(f"{pk}-{currency}", default)
 
-        year = item["created_on"].year
-        month = item["created_on"].month
-
-        report = {
-            "month": month,
-            "year": year,
-            "income": item["income"],
-            "expenditures": item["expenditures"],
-        }
-
-        if report_unit == constants.DAYS:
-            day = item["created_on"].day
-            key = construct_date_string(year, month, day)
-            report["day"] = day
-        else:
-            key = construct_date_string(year, month)
-
-        # if not account["reports"].get(currency):
-        #     account["reports"][currency] = {}
-
-        account["reports"][key] = report
+        account["reports"][item["created_on"]] = create_report(
+            report_unit,
+            item["created_on"],
+            income=item["income"],
+            expenditures=item["expenditures"],
+        )
 
     return list(grouped_reports.values())
@@ -1,33 +1,79 @@
-from datetime import datetime, time
+from array import array
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 
-import pytz
 from dateutil.relativedelta import relativedelta
-from django.conf import settings
 from django.utils import timezone
 
-from .. import constants
+from contuga.utils import get_local_timezone
 
+from .. import constants
 
-def construct_date_string(year, month, day=None):
-    if day:
-        return f"{year}{str(month).zfill(2)}{str(day).zfill(2)}"
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAX_CENTS = 2**63 - 1
+
+
+def create_report(report_unit, period_start, income=0, expenditures=0):
+    """
+    Return the report of the period of `report_unit` starting on `period_start`.
+    Weekly reports are identified by their first day and quarterly ones by
+    their first month.
+    """
+    if report_unit == constants.YEARS:
+        report = {"year": period_start.year}
+    elif report_unit == constants.QUARTERS:
+        report = {
+            "month": period_start.month,
+            "year": period_start.year,
+            "quarter": (period_start.month - 1) // 3 + 1,
+        }
+    elif report_unit in (constants.DAYS, constants.WEEKS):
+        report = {
+            "month": period_start.month,
+            "year": period_start.year,
+            "day": period_start.day,
+        }
     else:
-        return f"{year}{str(month).zfill(2)}"
+        report = {"month": period_start.month, "year": period_start.year}
+
+    report["income"] = income
+    report["expenditures"] = expenditures
+
+    return report
+
+
+def get_report_date(report):
+    return date(report["year"], report.get("month", 1), report.get("day", 1))
+
+
+def get_period_start(report_unit, value):
+    if report_unit == constants.WEEKS:
+        return value - timedelta(days=value.weekday())
+    elif report_unit == constants.MONTHS:
+        return value.replace(day=1)
+    elif report_unit == constants.QUARTERS:
+        return value.replace(month=(value.month - 1) // 3 * 3 + 1, day=1)
+    elif report_unit == constants.YEARS:
+        return value.replace(month=1, day=1)
+
+    return value
 
 
 def get_date_limits(start_date, end_date, report_unit, conf):
     today = timezone.now().astimezone().date()
 
     if not start_date:
-        start_date = today - relativedelta(**conf["default_period"])
-
-        if report_unit == constants.MONTHS:
-            start_date = start_date.replace(day=1)
+        start_date = get_period_start(
+            report_unit, today - relativedelta(**conf["default_period"])
+        )
     if not end_date:
         end_date = today
 
-    # TODO: Let users specify their timezone and use it below
-    tzinfo = pytz.timezone(settings.TIME_ZONE)
+    tzinfo = get_local_timezone()
 
     start_date = datetime.combine(date=start_date, time=time.min, tzinfo=tzinfo)
     end_date = datetime.combine(date=end_date, time=time.max, tzinfo=tzinfo)
@@ -36,116 +82,174 @@ def get_date_limits(start_date, end_date, report_unit, conf):
 
 
 def process_reports(reports, report_unit, start_date, end_date):
-    if report_unit == constants.DAYS:
-        return process_daily_reports(
-            reports=reports, start_date=start_date, end_date=end_date
-        )
-    else:
-        return process_monthly_reports(
-            reports=reports, start_date=start_date, end_date=end_date
-        )
+    process = {
+        constants.DAYS: process_daily_reports,
+        constants.WEEKS: process_weekly_reports,
+        constants.MONTHS: process_monthly_reports,
+        constants.QUARTERS: process_quarterly_reports,
+        constants.YEARS: process_yearly_reports,
+    }[report_unit]
+
+    return process(reports=reports, start_date=start_date, end_date=end_date)
+
+
+def process_daily_reports(reports, start_date, end_date):
+    return fill_reports(
+        reports=reports,
+        start=start_date.toordinal(),
+        end=end_date.toordinal(),
+        get_index=lambda report: get_report_date(report).toordinal(),
+        create_report=lambda index: create_report(
+            constants.DAYS, date.fromordinal(index)
+        ),
+    )
+
+
+def process_weekly_reports(reports, start_date, end_date):
+    # The first day of the proleptic Gregorian calendar is a Monday
+    return fill_reports(
+        reports=reports,
+        start=(start_date.toordinal() - 1) // 7,
+        end=(end_date.toordinal() - 1) // 7,
+        get_index=lambda report: (get_report_date(report).toordinal() - 1) // 7,
+        create_report=lambda index: create_report(
+            constants.WEEKS, date.fromordinal(index * 7 + 1)
+        ),
+    )
 
 
 def process_monthly_reports(reports, start_date, end_date):
-    start_date_string = construct_date_string(start_date.year, start_date.month)
+    return fill_reports(
+        reports=reports,
+        start=start_date.year * 12 + start_date.month - 1,
+        end=end_date.year * 12 + end_date.month - 1,
+        get_index=lambda report: report["year"] * 12 + report["month"] - 1,
+        create_report=lambda index: create_report(
+            constants.MONTHS, date(index // 12, index % 12 + 1, 1)
+        ),
+    )
 
-    for account in reports:
-        year = end_date.year
-        month = end_date.month
 
-        date_string = construct_date_string(year, month)
-        next_date = date_string
+def process_quarterly_reports(reports, start_date, end_date):
+    return fill_reports(
+        reports=reports,
+        start=start_date.year * 4 + (start_date.month - 1) // 3,
+        end=end_date.year * 4 + (end_date.month - 1) // 3,
+        get_index=lambda report: report["year"] * 4 + report["quarter"] - 1,
+        create_report=lambda index: create_report(
+            constants.QUARTERS, date(index // 4, index % 4 * 3 + 1, 1)
+        ),
+    )
 
-        while date_string >= start_date_string:
-            report = account["reports"].setdefault(
-                date_string,
-                {"month": month, "year": year, "income": 0, "expenditures": 0},
-            )
 
-            if account.get("balance"):
-                report["balance"] = calculate_balance(
-                    report=report,
-                    next_report=account["reports"][next_date],
-                    account_balance=account["balance"],
-                    end_date=end_date,
-                )
+def process_yearly_reports(reports, start_date, end_date):
+    return fill_reports(
+        reports=reports,
+        start=start_date.year,
+        end=end_date.year,
+        get_index=lambda report: report["year"],
+        create_report=lambda index: create_report(constants.YEARS, date(index, 1, 1)),
+    )
 
-            next_date = date_string
 
-            month -= 1
+def fill_reports(reports, start, end, get_index, create_report):
+    """
+    Fill the gaps in the reports of each account with empty reports for all
+    periods from `start` to `end`, which are consecutive integers, e.g. ordinals
+    of days, and calculate the balance at the end of each period.
+    """
+    length = max(end - start + 1, 0)
 
-            if month <= 0:
-                year -= 1
-                month = 12
+    for account in reports:
+        filled_reports = [None] * length
+        remaining_reports = []
 
-            date_string = construct_date_string(year, month)
+        for report in account["reports"].values():
+            index = get_index(report) - start
 
-        if account.get("balance"):
-            del account["balance"]
+            if 0 <= index < length:
+                filled_reports[index] = report
+            else:
+                remaining_reports.append(report)
 
-        account["reports"] = sorted(
-            account["reports"].values(), key=lambda x: (x["year"], x["month"])
-        )
+        for index in range(length):
+            if filled_reports[index] is None:
+                filled_reports[index] = create_report(start + index)
 
-    return reports
+        balance = account.pop("balance", None)
 
+        if balance:
+            balances = calculate_balances(balance, filled_reports)
 
-def process_daily_reports(reports, start_date, end_date):
-    start_date_string = construct_date_string(
-        start_date.year, start_date.month, start_date.day
-    )
+            for report, report_balance in zip(filled_reports, balances):
+                report["balance"] = report_balance
 
-    for account in reports:
-        date = end_date.date()
-        date_string = construct_date_string(date.year, date.month, date.day)
-        next_date = date_string
-
-        while date_string >= start_date_string:
-            report = account["reports"].setdefault(
-                date_string,
-                {
-                    "month": date.month,
-                    "year": date.year,
-                    "day": date.day,
-                    "income": 0,
-                    "expenditures": 0,
-                },
-            )
-
-            if account.get("balance"):
-                report["balance"] = calculate_balance(
-                    report=report,
-                    next_report=account["reports"][next_date],
-                    account_balance=account["balance"],
-                    end_date=end_date,
-                )
-
-            next_date = date_string
-
-            date = date - relativedelta(days=1)
-
-            date_string = construct_date_string(date.year, date.month, date.day)
-
-        if account.get("balance"):
-            del account["balance"]
-
-        account["reports"] = sorted(
-            account["reports"].values(), key=lambda x: (x["year"], x["month"], x["day"])
-        )
+        if remaining_reports:
+            filled_reports = sorted(filled_reports + remaining_reports, key=get_index)
+
+        account["reports"] = filled_reports
 
     return reports
 
 
-def calculate_balance(report, next_report, account_balance, end_date):
-    if (
-        report["year"] == end_date.year
-        and report["month"] == end_date.month
-        and report.get("day", end_date.day) == end_date.day
-    ):
-        return account_balance
+def calculate_balances(balance, reports):
+    """
+    Return the balance at the end of each of the consecutive `reports`, given
+    the `balance` at the end of the last one.
+
+    The amounts, which have two decimal places, are summed as integer cents in
+    preallocated arrays, unless they could overflow 64 bits.
+    """
+    length = len(reports)
+
+    if not length:
+        return []
+
+    cents = to_cents(balance)
+    changes = []
+    magnitude = abs(cents)
+
+    for index, report in enumerate(reports):
+        if report["income"] or report["expenditures"]:
+            change = to_cents(report["income"]) - to_cents(report["expenditures"])
+            changes.append((index, change))
+            magnitude += abs(change)
+
+    if magnitude > MAX_CENTS:
+        later_changes = [0] * length
+        calculate_later_changes(changes, later_changes)
+    elif numpy:
+        net_changes = numpy.zeros(length, dtype=numpy.int64)
+
+        for index, change in changes:
+            net_changes[index] = change
+
+        # The sum of the changes after each report
+        later_changes = numpy.zeros(length, dtype=numpy.int64)
+        later_changes[:-1] = numpy.cumsum(net_changes[:0:-1])[::-1]
+        later_changes = later_changes.tolist()
     else:
-        return (
-            next_report.get("balance", 0)
-            - next_report.get("income", 0)
-            + next_report.get("expenditures", 0)
-        )
+        later_changes = array("q", bytes(8 * length))
+        calculate_later_changes(changes, later_changes)
+
+    balances = [from_cents(cents - change) for change in later_changes]
+    balances[-1] = balance
+
+    return balances
+
+
+def calculate_later_changes(changes, later_changes):
+    total = 0
+    changes = dict(changes)
+
+    for index in range(len(later_changes) - 1, -1, -1):
+        later_changes[index] = total
+        total += changes.get(index, 0)
+
+
+def to_cents(amount):
+    return int(amount * 100)
+
+
+def from_cents(cents):
+    return Decimal(cents).scaleb(-2)
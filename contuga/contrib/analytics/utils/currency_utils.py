@@ -0,0 +1,49 @@
+from contuga.contrib.currencies.utils import ExchangeRates
+
+AMOUNT_FIELDS = ("income", "expenditures")
+
+
+def consolidate_currencies(aggregated_data, prefix, base_currency, end_date):
+    """
+    Convert the amounts of the aggregated rows to `base_currency` in a single pass
+    and merge the rows which differ only by their currency. The currency of each
+    row is looked up by its `prefix`, e.g. `account__currency`.
+
+    The amounts of a period are converted with the rate at its start and the
+    account balances with the rate at the `end_date`.
+    """
+    fields = {f"{prefix}__{name}": name for name in ("pk", "code", "name")}
+    rates = ExchangeRates(
+        base_currency, {item[f"{prefix}__pk"] for item in aggregated_data}
+    )
+    balance_date = end_date.date()
+    consolidated = {}
+
+    for item in aggregated_data:
+        currency = item[f"{prefix}__pk"]
+        date = item["created_on"]
+        converted = dict(item)
+
+        for field, name in fields.items():
+            converted[field] = getattr(base_currency, name)
+
+        if item.get("account__balance") is not None:
+            converted["account__balance"] = rates.convert(
+                item["account__balance"], currency, balance_date
+            )
+
+        key = tuple(
+            value for field, value in converted.items() if field not in AMOUNT_FIELDS
+        )
+        existing = consolidated.get(key)
+
+        if existing is None:
+            existing = consolidated[key] = converted
+
+            for field in AMOUNT_FIELDS:
+                existing[field] = 0
+
+        for field in AMOUNT_FIELDS:
+            existing[field] += rates.convert(item[field], currency, date)
+
+    return list(consolidated.values())
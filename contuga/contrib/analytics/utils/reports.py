@@ -1,14 +1,26 @@
-from django.db.models.functions import TruncDay, TruncMonth
-
-from contuga.contrib.transactions.models import Transaction
+from django.db.models.functions import (
+    TruncDay,
+    TruncMonth,
+    TruncQuarter,
+    TruncWeek,
+    TruncYear,
+)
 
 from .. import constants
+from ..models import DailyRollup
 from .account_utils import get_accounts_data, group_account_reports
 from .category_utils import get_categories_data, group_category_reports
 from .common_utils import get_date_limits, process_reports
+from .currency_utils import consolidate_currencies
+from .tag_utils import get_tags_data, group_tag_reports
 
+# The periods of all report units are rolled up from the daily rollups, except for
+# the tags which are aggregated from the transactions.
 REPORTS = {
+    constants.YEARS: {"default_period": {"years": 4}, "truncClass": TruncYear},
+    constants.QUARTERS: {"default_period": {"months": 15}, "truncClass": TruncQuarter},
     constants.MONTHS: {"default_period": {"months": 5}, "truncClass": TruncMonth},
+    constants.WEEKS: {"default_period": {"weeks": 11}, "truncClass": TruncWeek},
     constants.DAYS: {"default_period": {"months": 1}, "truncClass": TruncDay},
 }
 
@@ -20,8 +32,9 @@ def generate_reports(
     report_unit=constants.MONTHS,
     grouping=constants.ACCOUNTS,
     category=None,
+    currency=None,
 ):
-    transactions = Transaction.objects.filter(account__is_active=True, author=user)
+    rollups = DailyRollup.objects.filter(account__is_active=True, user=user)
 
     # If empty_string is passed as report_unit
     if not report_unit:
@@ -33,27 +46,45 @@ def generate_reports(
 
     if grouping == constants.ACCOUNTS:
         aggregated_data = get_accounts_data(
-            transactions=transactions,
+            rollups=rollups,
             start_date=start_date,
             end_date=end_date,
             truncClass=conf["truncClass"],
         )
-        grouped_reports = group_account_reports(
-            aggregated_data, report_unit=report_unit
+        group_reports = group_account_reports
+        currency_prefix = "account__currency"
+    elif grouping == constants.TAGS:
+        aggregated_data = get_tags_data(
+            user=user,
+            start_date=start_date,
+            end_date=end_date,
+            truncClass=conf["truncClass"],
         )
+        group_reports = group_tag_reports
+        currency_prefix = "transaction__account__currency"
     else:
         aggregated_data = get_categories_data(
-            transactions=transactions,
+            rollups=rollups,
             start_date=start_date,
             end_date=end_date,
             category=category,
             truncClass=conf["truncClass"],
         )
+        group_reports = group_category_reports
+        currency_prefix = "account__currency"
 
-        grouped_reports = group_category_reports(
-            aggregated_data, report_unit=report_unit
+    if currency:
+        # The amounts are converted to the base currency before the grouping, so
+        # the reports of each category or tag are consolidated into a single one.
+        aggregated_data = consolidate_currencies(
+            aggregated_data,
+            prefix=currency_prefix,
+            base_currency=currency,
+            end_date=end_date,
         )
 
+    grouped_reports = group_reports(aggregated_data, report_unit=report_unit)
+
     processed_reports = process_reports(
         reports=grouped_reports,
         start_date=start_date,
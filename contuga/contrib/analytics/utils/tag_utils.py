@@ -0,0 +1,79 @@
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+
+from contuga.contrib.transactions import constants as transaction_constants
+from contuga.contrib.transactions.models import Transaction
+
+from .common_utils import create_report
+
+
+def get_tags_data(user, start_date, end_date, truncClass):
+    # The through table is aggregated directly, so each tag of a transaction
+    # adds its amount to the tag without loading the tags of every transaction.
+    transaction_tags = Transaction.tags.through.objects.filter(
+        transaction__author=user,
+        transaction__account__is_active=True,
+        transaction__created_on__gte=start_date.date(),
+        transaction__created_on__lte=end_date.date(),
+    ).annotate(created_on=truncClass("transaction__created_on"))
+
+    values = [
+        "tag__name",
+        "tag__pk",
+        "transaction__account__currency__pk",
+        "transaction__account__currency__code",
+        "transaction__account__currency__name",
+        "created_on",
+    ]
+
+    return (
+        transaction_tags.values(*values).annotate(
+            income=Coalesce(
+                Sum(
+                    "transaction__amount",
+                    filter=Q(transaction__type=transaction_constants.INCOME),
+                ),
+                0,
+            ),
+            expenditures=Coalesce(
+                Sum(
+                    "transaction__amount",
+                    filter=Q(transaction__type=transaction_constants.EXPENDITURE),
+                ),
+                0,
+            ),
+        )
+        # order_by() is used to remove the default ordering from Group By
+        # https://docs.djangoproject.com/en/2.2/topics/db/aggregation/#interaction-with-default-ordering-or-order-by
+        .order_by("tag__name", "tag__pk", "transaction__account__currency__code")
+    )
+
+
+def group_tag_reports(aggregated_data, report_unit):
+    grouped_reports = {}
+
+    for item in aggregated_data:
+        currency = item["transaction__account__currency__pk"]
+        pk = item["tag__pk"]
+
+        tag = grouped_reports.setdefault(
+            f"{pk}-{currency}",
+            {
+                "pk": pk,
+                "name": item["tag__name"],
+                "currency": {
+                    "name": item["transaction__account__currency__name"],
+                    "code": item["transaction__account__currency__code"],
+                },
+                "reports": {},
+            },
+        )
+
+        tag["reports"][item["created_on"]] = create_report(
+            report_unit,
+            item["created_on"],
+            income=item["income"],
+            expenditures=item["expenditures"],
+        )
+
+    return list(grouped_reports.values())
@@ -2,17 +2,32 @@ import json
 
 from django.contrib.auth import mixins
 from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
 from django.views.generic.base import TemplateView
-from rest_framework import permissions, viewsets
+from rest_framework import exceptions, permissions, status, viewsets
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from contuga.contrib.currencies.utils import MissingExchangeRateError
 from contuga.contrib.pages import constants as page_constants
 from contuga.contrib.pages.models import Page
 
-from . import constants, utils
+from . import cache, constants
 from .api_filters import ReportsFilterBackend
 from .forms import ReportsFilterForm
-from .serializers import ReportsSerializer
+from .jobs import get_report_parameters
+from .models import ReportJob
+from .renderers import ColumnarJSONRenderer
+from .serializers import (
+    ReportJobSerializer,
+    ReportsSerializer,
+    serialize_columnar_reports,
+)
 
 
 class AnalyticsView(mixins.LoginRequiredMixin, TemplateView):
@@ -23,6 +38,7 @@ class AnalyticsView(mixins.LoginRequiredMixin, TemplateView):
 
         user = self.request.user
         reports = None
+        grouping = constants.ACCOUNTS
 
         if len(self.request.GET):
             form_data = self.request.GET.copy()
@@ -33,31 +49,23 @@ class AnalyticsView(mixins.LoginRequiredMixin, TemplateView):
             form = ReportsFilterForm(user)
 
         if form.is_valid():
-            report_unit = form.cleaned_data.get("report_unit")
-            start_date = form.cleaned_data.get("start_date")
-            end_date = form.cleaned_data.get("end_date")
-            category = form.cleaned_data.get("category")
-
-            if category:
-                grouping = constants.CATEGORIES
-            else:
-                grouping = constants.ACCOUNTS
-
-            reports = utils.generate_reports(
-                user=user,
-                report_unit=report_unit,
-                start_date=start_date,
-                end_date=end_date,
-                grouping=grouping,
-                category=category,
-            )
-        else:
-            reports = utils.generate_reports(user=user)
+            parameters = form.get_report_parameters()
+
+            try:
+                reports = cache.get_reports(user=user, **parameters)
+                grouping = parameters["grouping"]
+            except MissingExchangeRateError:
+                # The exchange rates may have been deleted after the validation
+                form.add_missing_exchange_rates_error(parameters["currency"])
+
+        if not form.is_valid():
+            reports = cache.get_reports(user=user)
 
         if reports:
             context["reports"] = json.dumps(reports, cls=DjangoJSONEncoder)
 
         context["form"] = form
+        context["grouping"] = grouping
         context["page"] = Page.objects.filter(
             type=page_constants.ANALYTICS_TYPE
         ).first()
@@ -68,6 +76,7 @@ class AnalyticsView(mixins.LoginRequiredMixin, TemplateView):
 class AnalyticsViewSet(viewsets.ViewSet):
     serlizer_class = ReportsSerializer
     filter_backends = (ReportsFilterBackend,)
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer)
 
     def get_permissions(self):
         permission_classes = super().get_permissions()
@@ -76,43 +85,80 @@ class AnalyticsViewSet(viewsets.ViewSet):
 
     def list(self, request):
         user = self.request.user
+        query_params = self.request.query_params.dict()
 
-        if len(self.request.query_params):
-            form = ReportsFilterForm(user, self.request.GET)
-        else:
-            form = ReportsFilterForm(user)
+        # Expensive reports can be generated by the report jobs worker instead,
+        # so they don't tie up the web workers.
+        if query_params.pop("async", "").lower() in ("1", "true"):
+            # The parameters are validated before enqueueing the job, as the
+            # worker has no way to report the errors
+            form = ReportsFilterForm(user, query_params)
 
-        if form.is_valid():
-            report_unit = form.cleaned_data.get("report_unit")
-            start_date = form.cleaned_data.get("start_date")
-            end_date = form.cleaned_data.get("end_date")
-            category = form.cleaned_data.get("category")
-
-            if category:
-                grouping = constants.CATEGORIES
-            else:
-                grouping = constants.ACCOUNTS
-
-            reports = utils.generate_reports(
-                user=self.request.user,
-                report_unit=report_unit,
-                start_date=start_date,
-                end_date=end_date,
-                grouping=grouping,
-                category=category,
+            if not form.is_valid():
+                raise exceptions.ValidationError(form.errors)
+
+            job = ReportJob.objects.enqueue(author=user, parameters=query_params)
+            serializer = ReportJobSerializer(instance=job, context={"request": request})
+
+            return Response(
+                serializer.data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={"Location": serializer.data["url"]},
             )
-        else:
-            reports = utils.generate_reports(user=self.request.user)
 
-        serializer = ReportsSerializer(
-            instance=reports, many=True, context={"request": request}
+        parameters = get_report_parameters(user, query_params)
+
+        # Polling clients get a Not Modified response without generating the
+        # reports as long as the data of the user doesn't change.
+        etag, last_modified = cache.get_reports_validators(user=user, **parameters)
+        # The representations of the formats differ
+        etag = f'{etag[:-1]}-{request.accepted_renderer.format}"'
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
         )
 
-        return Response(
-            {
-                "count": len(reports),
-                "next": None,
-                "previous": None,
-                "results": serializer.data,
-            }
+        if response is None:
+            try:
+                reports = cache.get_reports(user=user, **parameters)
+            except MissingExchangeRateError:
+                # The exchange rates may have been deleted after the validation
+                message = ReportsFilterForm.missing_exchange_rates_message % {
+                    "currency": parameters["currency"]
+                }
+                raise exceptions.ValidationError({"currency": [message]})
+
+            response = Response(self.get_response_data(reports))
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Accept",))
+
+        return response
+
+    def get_response_data(self, reports):
+        if self.request.accepted_renderer.format == ColumnarJSONRenderer.format:
+            return serialize_columnar_reports(reports)
+
+        serializer = ReportsSerializer(
+            instance=reports, many=True, context={"request": self.request}
         )
+
+        return {
+            "count": len(reports),
+            "next": None,
+            "previous": None,
+            "results": serializer.data,
+        }
+
+
+class ReportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = ReportJobSerializer
+
+    def get_permissions(self):
+        permission_classes = super().get_permissions()
+        permission_classes.append(permissions.IsAuthenticated())
+        return permission_classes
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(author=self.request.user)
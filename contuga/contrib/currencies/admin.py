@@ -9,3 +9,11 @@ class CurrencyAdmin(admin.ModelAdmin):
     list_display = ("name", "nominal", "author", "created_at", "updated_at")
     list_per_page = 15
     search_fields = ("name", "author")
+
+
+@admin.register(models.ExchangeRate)
+class ExchangeRateAdmin(admin.ModelAdmin):
+    list_filter = ("date", "created_at", "updated_at")
+    list_display = ("currency", "base_currency", "date", "rate", "updated_at")
+    list_per_page = 15
+    search_fields = ("currency__name", "base_currency__name")
@@ -0,0 +1,69 @@
+# Generated by Django 3.1.14 on 2026-10-18 02:03
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("currencies", "0002_currency_author"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+                (
+                    "uuid",
+                    models.UUIDField(
+                        default=uuid.uuid4, primary_key=True, serialize=False
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "rate",
+                    models.DecimalField(
+                        decimal_places=10,
+                        help_text="The price of the nominal of the currency in the base currency.",
+                        max_digits=22,
+                        verbose_name="Rate",
+                    ),
+                ),
+                (
+                    "base_currency",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="base_exchange_rates",
+                        to="currencies.currency",
+                        verbose_name="Base currency",
+                    ),
+                ),
+                (
+                    "currency",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exchange_rates",
+                        to="currencies.currency",
+                        verbose_name="Currency",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Exchange rate",
+                "verbose_name_plural": "Exchange rates",
+                "ordering": ["currency", "base_currency", "-date"],
+                "unique_together": {("currency", "base_currency", "date")},
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
@@ -36,3 +37,50 @@ class Currency(TimestampModel):
 
     def latest_transactions(self, count=20):
         return self.transactions.all()[:count]
+
+
+class ExchangeRate(TimestampModel):
+    uuid = models.UUIDField(default=uuid.uuid4, primary_key=True)
+    currency = models.ForeignKey(
+        Currency,
+        related_name="exchange_rates",
+        on_delete=models.CASCADE,
+        verbose_name=_("Currency"),
+    )
+    base_currency = models.ForeignKey(
+        Currency,
+        related_name="base_exchange_rates",
+        on_delete=models.CASCADE,
+        verbose_name=_("Base currency"),
+    )
+    date = models.DateField(_("Date"))
+    rate = models.DecimalField(
+        _("Rate"),
+        max_digits=22,
+        decimal_places=10,
+        help_text=_("The price of the nominal of the currency in the base currency."),
+    )
+
+    class Meta:
+        ordering = ["currency", "base_currency", "-date"]
+        unique_together = ("currency", "base_currency", "date")
+        verbose_name = _("Exchange rate")
+        verbose_name_plural = _("Exchange rates")
+
+    def __str__(self):
+        return f"{self.currency} / {self.base_currency} ({self.date})"
+
+    def clean(self):
+        if self.currency_id and self.currency_id == self.base_currency_id:
+            raise ValidationError(
+                _("The currency and the base currency must be different.")
+            )
+
+        if (
+            self.currency_id
+            and self.base_currency_id
+            and self.currency.author_id != self.base_currency.author_id
+        ):
+            raise ValidationError(
+                _("The currency and the base currency must be of the same user.")
+            )
@@ -1,6 +1,7 @@
+from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
-from .models import Currency
+from .models import Currency, ExchangeRate
 
 
 class CurrencySerializer(serializers.HyperlinkedModelSerializer):
@@ -8,3 +9,32 @@ class CurrencySerializer(serializers.HyperlinkedModelSerializer):
         model = Currency
         fields = "__all__"
         extra_kwargs = {"author": {"read_only": True}}
+
+
+class ExchangeRateSerializer(serializers.HyperlinkedModelSerializer):
+    class Meta:
+        model = ExchangeRate
+        fields = "__all__"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+
+        if request:
+            currencies = Currency.objects.filter(author=request.user)
+            self.fields["currency"].queryset = currencies
+            self.fields["base_currency"].queryset = currencies
+
+    def validate(self, attrs):
+        currency = attrs.get("currency", getattr(self.instance, "currency", None))
+        base_currency = attrs.get(
+            "base_currency", getattr(self.instance, "base_currency", None)
+        )
+
+        if currency == base_currency:
+            raise serializers.ValidationError(
+                _("The currency and the base currency must be different.")
+            )
+
+        return attrs
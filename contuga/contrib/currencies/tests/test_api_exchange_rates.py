@@ -0,0 +1,117 @@
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from contuga.mixins import TestMixin
+
+from ..models import ExchangeRate
+
+
+class ExchangeRateListTestCase(APITestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.base_currency = self.create_currency()
+        self.currency = self.create_currency(name="Euro", code="EUR")
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_currency_url(self, currency):
+        return reverse("currency-detail", args=[currency.pk])
+
+    def test_get(self):
+        url = reverse("exchangerate-list")
+        rate = self.create_exchange_rate(
+            Decimal("1.95583"), self.currency, self.base_currency, date(2021, 1, 1)
+        )
+
+        # Creating another user and exchange rate to make sure the currently
+        # logged in user cannot see the exchange rates of other users
+        user = self.create_user(email="richard.roe@example.com", password="password")
+        self.create_exchange_rate(
+            Decimal("2"),
+            self.create_currency(author=user),
+            self.create_currency(author=user, name="Euro", code="EUR"),
+            date(2021, 1, 1),
+        )
+
+        response = self.client.get(url, format="json")
+
+        self.assertEqual(response.status_code, 200)
+
+        build_absolute_uri = response.wsgi_request.build_absolute_uri
+        expected_response = {
+            "count": 1,
+            "next": None,
+            "previous": None,
+            "results": [
+                {
+                    "url": build_absolute_uri(
+                        reverse("exchangerate-detail", args=[rate.pk])
+                    ),
+                    "currency": build_absolute_uri(
+                        self.get_currency_url(self.currency)
+                    ),
+                    "base_currency": build_absolute_uri(
+                        self.get_currency_url(self.base_currency)
+                    ),
+                    "date": "2021-01-01",
+                    "rate": "1.9558300000",
+                    "updated_at": rate.updated_at.astimezone().isoformat(),
+                    "created_at": rate.created_at.astimezone().isoformat(),
+                }
+            ],
+        }
+
+        self.assertDictEqual(response.json(), expected_response)
+
+    def test_post(self):
+        url = reverse("exchangerate-list")
+        data = {
+            "currency": self.get_currency_url(self.currency),
+            "base_currency": self.get_currency_url(self.base_currency),
+            "date": "2021-01-01",
+            "rate": "1.95583",
+        }
+
+        response = self.client.post(url, data=data, format="json")
+
+        self.assertEqual(response.status_code, 201)
+
+        rate = ExchangeRate.objects.get()
+        self.assertEqual(rate.currency, self.currency)
+        self.assertEqual(rate.base_currency, self.base_currency)
+        self.assertEqual(rate.rate, Decimal("1.95583"))
+
+    def test_post_with_the_same_currencies(self):
+        url = reverse("exchangerate-list")
+        data = {
+            "currency": self.get_currency_url(self.currency),
+            "base_currency": self.get_currency_url(self.currency),
+            "date": "2021-01-01",
+            "rate": "1",
+        }
+
+        response = self.client.post(url, data=data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ExchangeRate.objects.exists())
+
+    def test_post_with_currency_of_another_user(self):
+        url = reverse("exchangerate-list")
+        user = self.create_user(email="richard.roe@example.com", password="password")
+        data = {
+            "currency": self.get_currency_url(self.create_currency(author=user)),
+            "base_currency": self.get_currency_url(self.base_currency),
+            "date": "2021-01-01",
+            "rate": "1",
+        }
+
+        response = self.client.post(url, data=data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("currency", response.json())
+        self.assertFalse(ExchangeRate.objects.exists())
@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from contuga.mixins import TestMixin
+
+from ..utils import ExchangeRates, MissingExchangeRateError
+
+
+class ExchangeRatesTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.base_currency = self.create_currency()
+        self.euro = self.create_currency(name="Euro", code="EUR")
+        self.yen = self.create_currency(name="Japanese yen", code="JPY", nominal=100)
+
+        self.create_exchange_rate(
+            Decimal("1.9"), self.euro, self.base_currency, date(2021, 1, 1)
+        )
+        self.create_exchange_rate(
+            Decimal("2"), self.euro, self.base_currency, date(2021, 2, 1)
+        )
+        self.create_exchange_rate(
+            Decimal("1.5"), self.yen, self.base_currency, date(2021, 1, 15)
+        )
+
+    def test_rates_are_resolved_to_the_nearest_date(self):
+        rates = ExchangeRates(self.base_currency, {self.euro.pk, self.yen.pk})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                rates.get_rate(self.euro.pk, date(2020, 12, 1)), Decimal("1.9")
+            )
+            self.assertEqual(
+                rates.get_rate(self.euro.pk, date(2021, 1, 1)), Decimal("1.9")
+            )
+            self.assertEqual(
+                rates.get_rate(self.euro.pk, date(2021, 1, 31)), Decimal("1.9")
+            )
+            self.assertEqual(rates.get_rate(self.euro.pk, date(2021, 2, 1)), 2)
+            self.assertEqual(rates.get_rate(self.euro.pk, date(2022, 1, 1)), 2)
+            self.assertEqual(rates.get_rate(self.base_currency.pk, date(2022, 1, 1)), 1)
+
+    def test_rates_are_per_unit_of_the_currency(self):
+        rates = ExchangeRates(self.base_currency, {self.yen.pk})
+
+        self.assertEqual(
+            rates.get_rate(self.yen.pk, date(2021, 1, 1)), Decimal("0.015")
+        )
+        self.assertEqual(
+            rates.convert(Decimal("1000"), self.yen.pk, date(2021, 1, 1)),
+            Decimal("15.00"),
+        )
+
+    def test_converted_amounts_are_rounded_to_cents(self):
+        rates = ExchangeRates(self.base_currency, {self.euro.pk})
+
+        self.assertEqual(
+            rates.convert(Decimal("0.33"), self.euro.pk, date(2021, 1, 1)),
+            Decimal("0.63"),
+        )
+        self.assertEqual(
+            rates.convert(Decimal("12.34"), self.base_currency.pk, date(2021, 1, 1)),
+            Decimal("12.34"),
+        )
+
+    def test_missing_rates(self):
+        dollar = self.create_currency(name="US dollar", code="USD")
+        rates = ExchangeRates(self.base_currency, {dollar.pk})
+
+        with self.assertRaises(MissingExchangeRateError):
+            rates.get_rate(dollar.pk, date(2021, 1, 1))
+
+    def test_rate_validation(self):
+        rate = self.euro.exchange_rates.first()
+        rate.base_currency = self.euro
+
+        with self.assertRaises(ValidationError):
+            rate.clean()
+
+        user = self.create_user(email="richard.roe@example.com")
+        rate.base_currency = self.create_currency(author=user)
+
+        with self.assertRaises(ValidationError):
+            rate.clean()
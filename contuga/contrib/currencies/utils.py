@@ -0,0 +1,84 @@
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import Decimal
+
+from .models import ExchangeRate
+
+CENT = Decimal("0.01")
+
+
+class MissingExchangeRateError(Exception):
+    pass
+
+
+class ExchangeRates:
+    """
+    An in-memory table of the exchange rates of `currencies` to `base_currency`,
+    loaded with a single query on first use.
+
+    The rate of a currency on a date is the latest one until that date or the
+    earliest one after it if there are no earlier rates. The resolved rates are
+    memoized, so converting many amounts of the same periods costs a dictionary
+    lookup per amount.
+    """
+
+    def __init__(self, base_currency, currencies):
+        self.base_currency = base_currency
+        self.currencies = set(currencies)
+        self._dates = None
+        self._rates = None
+        self._resolved = {}
+
+    def load(self):
+        self._dates = defaultdict(list)
+        self._rates = defaultdict(list)
+
+        queryset = (
+            ExchangeRate.objects.filter(
+                base_currency=self.base_currency,
+                currency__in=self.currencies - {self.base_currency.pk},
+            )
+            .order_by("currency", "date")
+            .values_list("currency", "currency__nominal", "date", "rate")
+        )
+
+        for currency, nominal, date, rate in queryset:
+            # The rates are stored per nominal, e.g. per 100 units of a currency
+            self._dates[currency].append(date)
+            self._rates[currency].append(rate / nominal)
+
+    def get_rate(self, currency, date):
+        """
+        Return the price of one unit of `currency`, given by its primary key, in
+        the base currency on `date`.
+        """
+        if currency == self.base_currency.pk:
+            return Decimal(1)
+
+        key = (currency, date)
+
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        if self._rates is None:
+            self.load()
+
+        dates = self._dates.get(currency)
+
+        if not dates:
+            raise MissingExchangeRateError(
+                f"There are no exchange rates of {currency} to {self.base_currency.pk}."
+            )
+
+        index = max(bisect_right(dates, date) - 1, 0)
+        rate = self._resolved[key] = self._rates[currency][index]
+
+        return rate
+
+    def convert(self, amount, currency, date):
+        if currency == self.base_currency.pk:
+            return amount
+
+        return (amount * self.get_rate(currency, date)).quantize(CENT)
@@ -71,3 +71,18 @@ class CurrencyViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
+
+
+class ExchangeRateViewSet(viewsets.ModelViewSet):
+    serializer_class = serializers.ExchangeRateSerializer
+    http_method_names = ("get", "post", "put", "patch", "delete")
+
+    def get_permissions(self):
+        permission_classes = super().get_permissions()
+        permission_classes.append(permissions.IsAuthenticated())
+        return permission_classes
+
+    def get_queryset(self):
+        return models.ExchangeRate.objects.filter(
+            currency__author=self.request.user
+        ).select_related("currency", "base_currency")
@@ -0,0 +1,29 @@
+from django.db import models
+
+
+class TagManager(models.Manager):
+    def resolve(self, author, names):
+        """
+        Return the tags of `author` with the given names in the same order,
+        creating the missing ones. Takes at most three queries regardless of
+        the number of names.
+        """
+        names = list(dict.fromkeys(name for name in names if name))
+
+        if not names:
+            return []
+
+        tags = {tag.name: tag for tag in self.filter(author=author, name__in=names)}
+        missing = [name for name in names if name not in tags]
+
+        if missing:
+            self.bulk_create(
+                [self.model(author=author, name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+
+            # The tags created meanwhile conflict and keep their primary keys
+            for tag in self.filter(author=author, name__in=missing):
+                tags[tag.name] = tag
+
+        return [tags[name] for name in names]
@@ -7,6 +7,8 @@ from django.utils.translation import ugettext_lazy as _
 
 from contuga.models import TimestampModel
 
+from . import managers
+
 UserModel = get_user_model()
 
 
@@ -15,6 +17,8 @@ class Tag(TimestampModel):
     name = models.CharField(_("Name"), max_length=254)
     author = models.ForeignKey(UserModel, related_name="tags", on_delete=models.CASCADE)
 
+    objects = managers.TagManager()
+
     class Meta:
         ordering = ("name",)
         verbose_name = _("Tag")
@@ -0,0 +1,41 @@
+from django.test import TestCase
+
+from contuga.mixins import TestMixin
+
+from ..models import Tag
+
+
+class TagManagerTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.tag = self.create_tag(name="Existing tag")
+
+        self.other_user = self.create_user("richard.roe@example.com", "password")
+        self.other_tag = self.create_tag(name="New tag", author=self.other_user)
+
+    def test_resolve(self):
+        with self.assertNumQueries(3):
+            tags = Tag.objects.resolve(
+                self.user, ["New tag", "", "Existing tag", "New tag", "Another tag"]
+            )
+
+        # Assert the tags are unique and in the order of the names
+        self.assertListEqual(
+            [tag.name for tag in tags], ["New tag", "Existing tag", "Another tag"]
+        )
+        self.assertEqual(tags[1], self.tag)
+        self.assertTrue(all(tag.author == self.user for tag in tags))
+        self.assertEqual(Tag.objects.filter(author=self.user).count(), 3)
+
+        # Assert the primary keys of the returned tags are the saved ones
+        saved_tags = Tag.objects.filter(pk__in=[tag.pk for tag in tags])
+        self.assertCountEqual(saved_tags, tags)
+
+    def test_resolve_existing_tags(self):
+        with self.assertNumQueries(1):
+            tags = Tag.objects.resolve(self.user, ["Existing tag"])
+
+        self.assertListEqual(tags, [self.tag])
+
+        with self.assertNumQueries(0):
+            self.assertListEqual(Tag.objects.resolve(self.user, []), [])
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class TransactionsConfig(AppConfig):
     name = "contuga.contrib.transactions"
+
+    def ready(self):
+        from . import search, signals  # NOQA
+
+        search.register_lookups()
@@ -0,0 +1,72 @@
+import hashlib
+
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from contuga.contrib.analytics.cache import get_cache, get_data_version
+
+STATISTICS_KEY = "transactions:statistics:{user}:{version}:{parameters}"
+
+# The query parameters which do not change the filtered transactions
+IGNORED_PARAMETERS = ("page", "cursor", "ordering")
+
+
+def get_statistics_key(user, version, query):
+    parameters = sorted(
+        (name, sorted(value for value in values if value))
+        for name, values in query.lists()
+        if name not in IGNORED_PARAMETERS and any(values)
+    )
+    serialized = repr(parameters).encode()
+
+    return STATISTICS_KEY.format(
+        user=user.uuid,
+        version=version,
+        parameters=hashlib.md5(serialized).hexdigest(),
+    )
+
+
+def calculate_filter_statistics(queryset):
+    """
+    Return the number of transactions, the income, the expenditure and the
+    balance of `queryset` per currency, along with their total count, all
+    calculated by a single aggregation.
+    """
+    currency_statistics = list(
+        queryset.values("account__currency")
+        .annotate(
+            currency=F("account__currency__name"),
+            income=Coalesce(Sum("amount", filter=Q(type="income")), 0),
+            expenditure=Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
+            balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
+            - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
+            count=Count("pk"),
+        )
+        .values("currency", "income", "expenditure", "balance", "count")
+        .order_by("currency")
+    )
+
+    return {
+        "transaction_count": sum(row["count"] for row in currency_statistics),
+        "currency_count": len(currency_statistics),
+        "currency_statistics": currency_statistics,
+    }
+
+
+def get_filter_statistics(user, queryset, query):
+    """
+    Return the statistics of `calculate_filter_statistics` for the transactions
+    of `user` filtered by the `query` parameters from the cache or calculate and
+    cache them. They are keyed by the data version of the user stored in the
+    database, so a change made by any process invalidates them along with the
+    cached reports, while paging through the same results reuses them.
+    """
+    cache = get_cache()
+    key = get_statistics_key(user, get_data_version(user.pk), query)
+    statistics = cache.get(key)
+
+    if statistics is None:
+        statistics = calculate_filter_statistics(queryset)
+        cache.set(key, statistics)
+
+    return statistics
@@ -0,0 +1,131 @@
+import abc
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from import_export.formats import base_formats
+
+# Number of transactions fetched from the database and written at a time
+CHUNK_SIZE = 2000
+
+# The columns of the TransactionResource and the values they are read from
+EXPORT_COLUMNS = (
+    ("type", "type"),
+    ("amount", "amount"),
+    ("category", "category__name"),
+    ("account", "account__name"),
+    ("description", "description"),
+)
+
+
+class StreamingFormat(abc.ABC, base_formats.Format):
+    """
+    An export format written row by row as the transactions are read, instead
+    of building the whole dataset in memory.
+    """
+
+    title = None
+    extension = None
+    content_type = None
+
+    def get_title(self):
+        return self.title
+
+    def get_extension(self):
+        return self.extension
+
+    def get_content_type(self):
+        return self.content_type
+
+    def is_binary(self):
+        return False
+
+    def can_export(self):
+        return True
+
+    def write_header(self, headers):
+        return ""
+
+    @abc.abstractmethod
+    def write_rows(self, headers, rows):
+        """
+        Return the content of the given rows of values of the `headers` columns.
+        """
+
+
+class CSV(StreamingFormat):
+    title = "csv"
+    extension = "csv"
+    content_type = "text/csv"
+
+    def write(self, rows):
+        output = io.StringIO()
+        csv.writer(output).writerows(rows)
+        return output.getvalue()
+
+    def write_header(self, headers):
+        return self.write([headers])
+
+    def write_rows(self, headers, rows):
+        return self.write(rows)
+
+
+class JSONLines(StreamingFormat):
+    title = "jsonl"
+    extension = "jsonl"
+    content_type = "application/x-ndjson"
+
+    def write_rows(self, headers, rows):
+        return "".join(
+            json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + "\n"
+            for row in rows
+        )
+
+
+def iter_export_rows(queryset, chunk_size=CHUNK_SIZE):
+    """
+    Yield the values of the export columns of the transactions of `queryset`
+    read in chunks by a single query, without instantiating the models or
+    querying their categories and accounts one by one.
+    """
+    fields = [field for column, field in EXPORT_COLUMNS]
+    rows = (
+        queryset.prefetch_related(None)
+        .values_list(*fields)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    for transaction_type, amount, category, account, description in rows:
+        yield transaction_type, amount, category or "", account, description
+
+
+def iter_export_content(file_format, queryset, chunk_size=CHUNK_SIZE):
+    headers = [column for column, field in EXPORT_COLUMNS]
+    header = file_format.write_header(headers)
+
+    if header:
+        yield header
+
+    chunk = []
+
+    for row in iter_export_rows(queryset, chunk_size):
+        chunk.append(row)
+
+        if len(chunk) == chunk_size:
+            yield file_format.write_rows(headers, chunk)
+            chunk = []
+
+    if chunk:
+        yield file_format.write_rows(headers, chunk)
+
+
+def stream_export(file_format, queryset, filename, chunk_size=CHUNK_SIZE):
+    response = StreamingHttpResponse(
+        iter_export_content(file_format, queryset, chunk_size),
+        content_type=file_format.get_content_type(),
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    return response
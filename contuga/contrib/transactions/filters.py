@@ -1,13 +1,19 @@
 from datetime import datetime, time
 
+import coreapi
+import coreschema
 import pytz
 from django import forms
+from django.db.models import Exists, OuterRef
 from django.utils.translation import ugettext_lazy as _
 from django_filters import filters, filterset
+from rest_framework.filters import BaseFilterBackend
 
 from contuga.contrib.accounts import models as account_models
 from contuga.contrib.categories import models as category_models
+from contuga.contrib.tags import models as tag_models
 
+from . import search
 from .forms import TransactionFilterForm
 from .models import Transaction
 
@@ -56,7 +62,9 @@ class TransactionFilterSet(filterset.FilterSet):
     max_amount = filters.NumberFilter(
         field_name="amount", lookup_expr="lte", label=_("Maximum amount")
     )
-    description = filters.CharFilter(lookup_expr="icontains", label=_("Descripton"))
+    description = filters.CharFilter(
+        method="filter_by_description", label=_("Descripton")
+    )
 
     class Meta:
         model = Transaction
@@ -67,9 +75,22 @@ class TransactionFilterSet(filterset.FilterSet):
         if self.form.is_valid():
             tag_values = [tag["value"] for tag in tags]
 
-            queryset = queryset.filter(
-                **{"author": self.request.user, f"{field_name}__name__in": tag_values}
+            # EXISTS does not duplicate the transactions with several matching
+            # tags, unlike a join, so the results need no DISTINCT
+            matching_tags = tag_models.Tag.objects.filter(
+                transactions=OuterRef("pk"),
+                author=self.request.user,
+                name__in=tag_values,
             )
+            queryset = queryset.filter(Exists(matching_tags), author=self.request.user)
+
+        return queryset
+
+    def filter_by_description(self, queryset, name, value):
+        queryset = search.search_transactions(queryset, value)
+
+        if search.is_ranked(queryset) and not self.form.cleaned_data.get("ordering"):
+            queryset = queryset.order_by(f"-{search.RANK}", "-created_at", "-uuid")
 
         return queryset
 
@@ -77,19 +98,55 @@ class TransactionFilterSet(filterset.FilterSet):
         if self.form.is_valid():
             start_date, end_date = value.split(" - ")
             date_field = forms.DateField()
-            start_datetime = datetime.combine(
-                date=date_field.clean(start_date), time=time.min, tzinfo=pytz.UTC
-            )
-            end_datetime = datetime.combine(
-                date=date_field.clean(end_date), time=time.max, tzinfo=pytz.UTC
-            )
-
-            queryset = queryset.filter(
-                **{
-                    "author": self.request.user,
-                    f"{name}__gte": start_datetime,
-                    f"{name}__lte": end_datetime,
+            start_date = date_field.clean(start_date)
+            end_date = date_field.clean(end_date)
+
+            if name == "created_at":
+                # The creation dates are compared with the stored local dates
+                lookups = {"created_on__gte": start_date, "created_on__lte": end_date}
+            else:
+                lookups = {
+                    f"{name}__gte": datetime.combine(
+                        date=start_date, time=time.min, tzinfo=pytz.UTC
+                    ),
+                    f"{name}__lte": datetime.combine(
+                        date=end_date, time=time.max, tzinfo=pytz.UTC
+                    ),
                 }
-            )
+
+            queryset = queryset.filter(author=self.request.user, **lookups)
 
         return queryset
+
+
+class TransactionSearchFilter(BaseFilterBackend):
+    """
+    Filters the transactions by the terms of the `search` query parameter and
+    ranks them by relevance.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "")
+        return search.search_transactions(queryset, query)
+
+    def get_schema_fields(self, view):
+        return [
+            coreapi.Field(
+                name=self.search_param,
+                required=False,
+                location="query",
+                schema=coreschema.String(title="Search"),
+            )
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -71,19 +71,11 @@ class TransactionForm(forms.ModelForm):
     def save(self, commit=True):
         instance = super().save(commit=commit)
 
-        instance.tags.clear()
-
         tags = self.cleaned_data.get("tags")
+        names = [tag.get("value") for tag in tags]
 
-        for tag in tags:
-            value = tag.get("value")
-
-            if not value:
-                continue
-
-            tag, _ = Tag.objects.get_or_create(author=instance.author, name=value)
-
-            instance.tags.add(tag)
+        # The tags are resolved and the changes are saved in bulk
+        instance.tags.set(Tag.objects.resolve(instance.author, names))
 
         return instance
 
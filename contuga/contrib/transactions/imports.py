@@ -0,0 +1,531 @@
+import csv
+import hashlib
+import re
+from collections import Counter, defaultdict, namedtuple
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Case, DateField, DateTimeField, Value, When
+from django.utils.dateparse import parse_date, parse_datetime
+
+from contuga.contrib.accounts.models import Account
+from contuga.contrib.accounts.utils import defer_balance_updates
+from contuga.contrib.categories import constants as category_constants
+from contuga.contrib.categories.models import Category
+from contuga.contrib.tags.models import Tag
+from contuga.utils import get_local_date, get_local_timezone
+
+from . import constants
+from .models import Transaction
+
+# Number of statement lines written at a time
+CHUNK_SIZE = 1000
+
+CSV = "csv"
+OFX = "ofx"
+QIF = "qif"
+
+# The QIF dates are usually written in the US order
+QIF_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%d.%m.%Y")
+
+OFX_ELEMENT_RE = re.compile(r"<(/?)([^>]+)>([^<]*)")
+
+StatementLine = namedtuple(
+    "StatementLine",
+    (
+        "line",
+        "created_at",
+        "type",
+        "amount",
+        "description",
+        "category",
+        "account",
+        "tags",
+        "reference",
+    ),
+)
+SkippedLine = namedtuple("SkippedLine", ("line", "message"))
+ImportResult = namedtuple("ImportResult", ("created", "duplicates", "skipped"))
+
+
+class StatementError(ValueError):
+    """
+    An invalid statement line. The parsers yield the errors of the invalid
+    lines instead of raising them, so that the rest of the lines are imported.
+    """
+
+    def __init__(self, line, message):
+        super().__init__(message)
+        self.line = line
+        self.message = message
+
+
+def parse_amount(line, value, transaction_type=None):
+    """
+    Return the type and the absolute amount of a statement line. Without a
+    type, the negative amounts are expenditures and the rest are income.
+    """
+    text = value.strip().replace(" ", "")
+
+    if "," in text and "." in text:
+        # The separator which comes first groups the thousands
+        text = text.replace("," if text.index(",") < text.index(".") else ".", "")
+
+    try:
+        amount = Decimal(text.replace(",", "."))
+    except InvalidOperation:
+        amount = None
+
+    if amount is None or not amount.is_finite():
+        raise StatementError(line, f"Invalid amount: {value}")
+
+    if transaction_type is None:
+        transaction_type = constants.EXPENDITURE if amount < 0 else constants.INCOME
+    elif transaction_type not in (constants.INCOME, constants.EXPENDITURE):
+        raise StatementError(line, f"Invalid type: {transaction_type}")
+
+    return transaction_type, abs(amount)
+
+
+def get_local_datetime(value):
+    return get_local_timezone().localize(datetime.combine(value, time.min))
+
+
+def parse_csv_datetime(line, value):
+    try:
+        created_at = parse_datetime(value) or parse_date(value)
+    except ValueError:
+        created_at = None
+
+    if created_at is None:
+        raise StatementError(line, f"Invalid date: {value}")
+
+    if not isinstance(created_at, datetime):
+        return get_local_datetime(created_at)
+
+    if created_at.tzinfo is None:
+        return get_local_timezone().localize(created_at)
+
+    return created_at
+
+
+def get_csv_statement_line(line, row):
+    transaction_type, amount = parse_amount(
+        line, row["amount"] or "", row.get("type") or None
+    )
+    tags = (tag.strip() for tag in (row.get("tags") or "").split(","))
+
+    return StatementLine(
+        line=line,
+        created_at=parse_csv_datetime(line, (row["date"] or "").strip()),
+        type=transaction_type,
+        amount=amount,
+        description=(row.get("description") or "").strip(),
+        category=(row.get("category") or "").strip(),
+        account=(row.get("account") or "").strip(),
+        tags=list(dict.fromkeys(tag for tag in tags if tag)),
+        reference="",
+    )
+
+
+def parse_csv(lines):
+    """
+    Parse a CSV statement with a header of the columns `date`, `amount` and the
+    optional `type`, `category`, `account`, `description` and `tags`, the last
+    separated by commas. The dates are ISO 8601 dates or date-times.
+    """
+    reader = csv.DictReader(lines)
+
+    if not reader.fieldnames or not {"date", "amount"} <= set(reader.fieldnames):
+        raise StatementError(1, "The date and amount columns are required.")
+
+    for row in reader:
+        try:
+            yield get_csv_statement_line(reader.line_num, row)
+        except StatementError as error:
+            yield error
+
+
+def parse_ofx_date(line, value):
+    # The dates are formatted as YYYYMMDD, optionally followed by the time
+    try:
+        return get_local_datetime(datetime.strptime(value[:8], "%Y%m%d").date())
+    except ValueError:
+        raise StatementError(line, f"Invalid date: {value}")
+
+
+def get_ofx_statement_line(line, elements):
+    for name in ("DTPOSTED", "TRNAMT"):
+        if not elements.get(name):
+            raise StatementError(line, f"The {name} element is required.")
+
+    transaction_type, amount = parse_amount(line, elements["TRNAMT"])
+    description = (elements.get("NAME"), elements.get("MEMO"))
+
+    return StatementLine(
+        line=line,
+        created_at=parse_ofx_date(line, elements["DTPOSTED"]),
+        type=transaction_type,
+        amount=amount,
+        description=" ".join(dict.fromkeys(value for value in description if value)),
+        category="",
+        account="",
+        tags=[],
+        reference=elements.get("FITID", ""),
+    )
+
+
+def parse_ofx(lines):
+    """
+    Parse the `STMTTRN` elements of an OFX statement, either SGML, whose
+    elements are not closed, or XML.
+    """
+    elements = None
+    start_line = None
+
+    for line, text in enumerate(lines, start=1):
+        for match in OFX_ELEMENT_RE.finditer(text):
+            is_end, name, value = match.groups()
+            name = name.strip().upper()
+
+            if name == "STMTTRN" or (is_end and name == "BANKTRANLIST"):
+                if elements is not None:
+                    try:
+                        yield get_ofx_statement_line(start_line, elements)
+                    except StatementError as error:
+                        yield error
+
+                elements = None
+
+                if not is_end:
+                    elements = {}
+                    start_line = line
+            elif elements is not None and not is_end:
+                elements[name] = value.strip()
+
+
+def parse_qif_date(line, value):
+    # Quicken writes the years after 2000 as e.g. 1/31'21
+    normalized = value.replace("'", "/").replace(" ", "")
+
+    for date_format in QIF_DATE_FORMATS:
+        try:
+            return get_local_datetime(datetime.strptime(normalized, date_format).date())
+        except ValueError:
+            continue
+
+    raise StatementError(line, f"Invalid date: {value}")
+
+
+def get_qif_statement_line(line, fields):
+    for code in ("D", "T"):
+        if not fields.get(code):
+            raise StatementError(line, f"The {code} field is required.")
+
+    transaction_type, amount = parse_amount(line, fields["T"])
+    description = (fields.get("P"), fields.get("M"))
+    category = fields.get("L", "")
+
+    # The transfers between accounts are categorized by the account in brackets
+    if category.startswith("["):
+        category = ""
+
+    return StatementLine(
+        line=line,
+        created_at=parse_qif_date(line, fields["D"]),
+        type=transaction_type,
+        amount=amount,
+        description=" ".join(dict.fromkeys(value for value in description if value)),
+        category=category,
+        account="",
+        tags=[],
+        reference=fields.get("N", ""),
+    )
+
+
+def parse_qif(lines):
+    """
+    Parse the records of a QIF statement, made of lines starting with a field
+    code and ending with a `^` line.
+    """
+    fields = {}
+    start_line = None
+
+    for line, text in enumerate(lines, start=1):
+        text = text.strip()
+
+        if not text or text.startswith("!"):
+            continue
+
+        if text != "^":
+            if not fields:
+                start_line = line
+
+            # U is the amount field of the newer versions of Quicken
+            code = "T" if text[0] == "U" else text[0]
+            fields.setdefault(code, text[1:].strip())
+            continue
+
+        if fields:
+            try:
+                yield get_qif_statement_line(start_line, fields)
+            except StatementError as error:
+                yield error
+
+        fields = {}
+
+    if fields:
+        try:
+            yield get_qif_statement_line(start_line, fields)
+        except StatementError as error:
+            yield error
+
+
+PARSERS = {CSV: parse_csv, OFX: parse_ofx, QIF: parse_qif}
+
+
+def get_lookups(user):
+    """
+    Return the accounts, categories and tags of `user` by their names, so that
+    they are queried once per import instead of once per statement line. Of
+    the objects with the same name, the oldest is used.
+    """
+    accounts = {}
+    categories = defaultdict(dict)
+    tags = {}
+
+    for account in Account.objects.filter(owner=user).order_by("-created_at"):
+        accounts[account.name] = account
+
+    for category in Category.objects.filter(author=user).order_by("-created_at"):
+        categories[category.name][category.transaction_type] = category
+
+    for tag in Tag.objects.filter(author=user):
+        tags[tag.name] = tag
+
+    return {"accounts": accounts, "categories": categories, "tags": tags}
+
+
+def get_content_hash(statement_line, account, occurrence):
+    """
+    Return the hash of the contents of a statement line imported in `account`.
+    The identical lines without references, e.g. two equal payments on the same
+    day, are told apart by their occurrence in the statement.
+    """
+    values = (
+        str(account.pk),
+        statement_line.created_at.isoformat(),
+        statement_line.type,
+        str(statement_line.amount),
+        statement_line.description,
+        statement_line.reference or f"#{occurrence}",
+    )
+
+    return hashlib.sha256("\x1f".join(values).encode()).hexdigest()
+
+
+class StatementImport:
+    """
+    Imports the parsed lines of a statement as transactions of `user`, in
+    `account` unless the lines specify theirs.
+    """
+
+    def __init__(self, user, account=None, chunk_size=CHUNK_SIZE):
+        self.user = user
+        self.account = account
+        self.chunk_size = chunk_size
+        self.lookups = get_lookups(user)
+        self.occurrences = Counter()
+        self.description_length = Transaction._meta.get_field("description").max_length
+
+    def get_account(self, statement_line):
+        if not statement_line.account:
+            if self.account is None:
+                raise StatementError(statement_line.line, "The account is required.")
+
+            return self.account
+
+        try:
+            return self.lookups["accounts"][statement_line.account]
+        except KeyError:
+            message = f"Unknown account: {statement_line.account}"
+            raise StatementError(statement_line.line, message)
+
+    def get_category(self, statement_line):
+        if not statement_line.category:
+            return None
+
+        categories = self.lookups["categories"].get(statement_line.category, {})
+        category = categories.get(statement_line.type) or categories.get(
+            category_constants.ALL
+        )
+
+        if category is None:
+            message = f"Unknown category: {statement_line.category}"
+            raise StatementError(statement_line.line, message)
+
+        return category
+
+    def build_transaction(self, statement_line):
+        account = self.get_account(statement_line)
+        category = self.get_category(statement_line)
+        description = statement_line.description[: self.description_length]
+        statement_line = statement_line._replace(description=description)
+
+        key = (
+            account.pk,
+            statement_line.created_at,
+            statement_line.type,
+            statement_line.amount,
+            description,
+        )
+        self.occurrences[key] += 1
+
+        return Transaction(
+            type=statement_line.type,
+            amount=statement_line.amount,
+            author=self.user,
+            account=account,
+            category=category,
+            description=description,
+            created_at=statement_line.created_at,
+            content_hash=get_content_hash(
+                statement_line, account, self.occurrences[key]
+            ),
+        )
+
+    def resolve_tags(self, names):
+        """
+        Add the tags with the given names to the lookup, creating the missing
+        ones.
+        """
+        tags = self.lookups["tags"]
+        missing = [name for name in names if name not in tags]
+
+        for tag in Tag.objects.resolve(self.user, missing):
+            tags[tag.name] = tag
+
+    def write(self, chunk):
+        """
+        Create the transactions of `chunk`, a list of transactions along with
+        the names of their tags, except the ones imported before.
+        """
+        hashes = [transaction.content_hash for transaction, tag_names in chunk]
+        existing = set(
+            Transaction.objects.filter(
+                author=self.user, content_hash__in=hashes
+            ).values_list("content_hash", flat=True)
+        )
+        new_chunk = []
+
+        for transaction, tag_names in chunk:
+            # The lines with the same reference are duplicates as well
+            if transaction.content_hash not in existing:
+                existing.add(transaction.content_hash)
+                new_chunk.append((transaction, tag_names))
+
+        chunk = new_chunk
+
+        if not chunk:
+            return []
+
+        self.resolve_tags({name for _, tag_names in chunk for name in tag_names})
+
+        transactions = [transaction for transaction, tag_names in chunk]
+        dates = defaultdict(list)
+
+        for transaction in transactions:
+            dates[transaction.created_at].append(transaction)
+
+        Transaction.objects.bulk_create(transactions)
+
+        # The creation time is overridden by bulk_create. It is restored by a
+        # single query for the chunk, choosing the time and the local date of
+        # each transaction by the group of the statement date it belongs to.
+        created_at_cases = []
+        created_on_cases = []
+
+        for created_at, date_transactions in dates.items():
+            created_on = get_local_date(created_at)
+            pks = [transaction.pk for transaction in date_transactions]
+            created_at_cases.append(
+                When(pk__in=pks, then=Value(created_at, output_field=DateTimeField()))
+            )
+            created_on_cases.append(
+                When(pk__in=pks, then=Value(created_on, output_field=DateField()))
+            )
+
+            for transaction in date_transactions:
+                transaction.created_at = created_at
+                transaction.created_on = created_on
+
+        Transaction.objects.filter(
+            pk__in=[transaction.pk for transaction in transactions]
+        ).update(
+            created_at=Case(*created_at_cases, output_field=DateTimeField()),
+            created_on=Case(*created_on_cases, output_field=DateField()),
+        )
+
+        tags = self.lookups["tags"]
+        TransactionTag = Transaction.tags.through
+        TransactionTag.objects.bulk_create(
+            TransactionTag(transaction_id=transaction.pk, tag_id=tags[name].pk)
+            for transaction, tag_names in chunk
+            for name in tag_names
+        )
+
+        return transactions
+
+    def run(self, statement_lines):
+        """
+        Consume the `statement_lines` lazily and write them in chunks of a few
+        queries each. The lines imported before, found by their content hashes,
+        are skipped as duplicates and the invalid lines are skipped as well.
+
+        The balances, snapshots and rollups of the accounts are recalculated
+        once, at the end of the import, which is executed atomically.
+        """
+        created = duplicates = 0
+        skipped = []
+        chunk = []
+
+        with defer_balance_updates() as deferred_accounts:
+
+            def write_chunk():
+                nonlocal created, duplicates
+                transactions = self.write(chunk)
+                created += len(transactions)
+                duplicates += len(chunk) - len(transactions)
+                deferred_accounts.update(
+                    transaction.account_id for transaction in transactions
+                )
+                chunk.clear()
+
+            for statement_line in statement_lines:
+                try:
+                    if isinstance(statement_line, StatementError):
+                        raise statement_line
+
+                    transaction = self.build_transaction(statement_line)
+                except StatementError as error:
+                    skipped.append(SkippedLine(error.line, error.message))
+                    continue
+
+                chunk.append((transaction, statement_line.tags))
+
+                if len(chunk) == self.chunk_size:
+                    write_chunk()
+
+            if chunk:
+                write_chunk()
+
+        return ImportResult(created=created, duplicates=duplicates, skipped=skipped)
+
+
+def import_statement(user, lines, file_format, account=None, chunk_size=CHUNK_SIZE):
+    """
+    Parse the `lines` of a statement in `file_format` as a stream and import
+    them as transactions of `user`.
+    """
+    statement_import = StatementImport(user, account=account, chunk_size=chunk_size)
+    return statement_import.run(PARSERS[file_format](lines))
@@ -0,0 +1,95 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from contuga.contrib.accounts.models import Account
+
+from ... import imports
+
+UserModel = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports the transactions of a CSV, OFX or QIF bank statement. The lines "
+        "imported before are skipped, so overlapping statements can be imported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the statement file.")
+        parser.add_argument(
+            "email", help="Email of the user whose transactions to create."
+        )
+        parser.add_argument(
+            "--account",
+            help=(
+                "Name of the account of the transactions. Required unless all "
+                "lines of a CSV statement have an account."
+            ),
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(imports.PARSERS),
+            help="Format of the statement. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--encoding",
+            default="utf-8-sig",
+            help="Encoding of the statement file.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=imports.CHUNK_SIZE,
+            help="Number of statement lines written at a time.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        if chunk_size < 1:
+            raise CommandError("The chunk size must be positive.")
+
+        file_format = options["format"]
+
+        if file_format is None:
+            file_format = os.path.splitext(options["path"])[1][1:].lower()
+
+            if file_format not in imports.PARSERS:
+                raise CommandError("Unknown statement format. Use --format.")
+
+        try:
+            user = UserModel.objects.get(email=options["email"])
+        except UserModel.DoesNotExist:
+            raise CommandError(f"User {options['email']} does not exist.")
+
+        account = None
+
+        if options["account"]:
+            # Of the accounts with the same name, the oldest is used
+            account = (
+                Account.objects.filter(owner=user, name=options["account"])
+                .order_by("created_at")
+                .first()
+            )
+
+            if account is None:
+                raise CommandError(f"Account {options['account']} does not exist.")
+
+        # The file is read line by line, as the lines are imported
+        with open(options["path"], encoding=options["encoding"], newline="") as file:
+            try:
+                result = imports.import_statement(
+                    user, file, file_format, account=account, chunk_size=chunk_size
+                )
+            except imports.StatementError as error:
+                raise CommandError(f"Line {error.line}: {error.message}")
+
+        for line, message in result.skipped:
+            self.stderr.write(f"Skipped line {line}: {message}")
+
+        self.stdout.write(
+            f"Imported {result.created} transactions, skipped {result.duplicates} "
+            f"duplicates and {len(result.skipped)} invalid lines."
+        )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from contuga.contrib.accounts.utils import defer_balance_updates
+from contuga.utils import get_local_date
+
+from ...models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculates the local creation dates of all transactions in batches, "
+        "e.g. after changing the time zone, along with the balance snapshots and "
+        "the daily rollups of the affected accounts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of transactions updated per query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if batch_size < 1:
+            raise CommandError("The batch size must be positive.")
+
+        queryset = Transaction.objects.only("pk", "account", "created_at", "created_on")
+        updated = 0
+        changed_accounts = set()
+        last_pk = None
+
+        while True:
+            batch = queryset.order_by("pk")
+
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+
+            batch = list(batch[:batch_size])
+
+            if not batch:
+                break
+
+            last_pk = batch[-1].pk
+            changed = []
+
+            for instance in batch:
+                created_on = get_local_date(instance.created_at)
+
+                if instance.created_on != created_on:
+                    changed_accounts.add(instance.account_id)
+                    instance.created_on = created_on
+                    changed.append(instance)
+
+            Transaction.objects.bulk_update(changed, ["created_on"])
+            updated += len(changed)
+
+        if changed_accounts:
+            # The snapshots and the rollups are bucketed by the same local dates
+            with defer_balance_updates() as deferred_accounts:
+                deferred_accounts.update(changed_accounts)
+
+        self.stdout.write(f"Updated the dates of {updated} transactions.")
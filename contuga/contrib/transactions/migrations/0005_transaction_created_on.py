@@ -0,0 +1,28 @@
+# Generated by Django 3.1.14 on 2026-10-18 02:11
+
+from django.db import migrations, models
+
+import contuga.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0004_transaction_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="created_on",
+            field=contuga.fields.LocalDateField(
+                blank=True, null=True, source="created_at", verbose_name="Created on"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["author", "created_on"], name="transaction_author__68993c_idx"
+            ),
+        ),
+    ]
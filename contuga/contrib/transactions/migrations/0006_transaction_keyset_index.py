@@ -0,0 +1,20 @@
+# Generated by Django 3.1.14 on 2026-10-18 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0005_transaction_created_on"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["author", "created_at", "uuid"],
+                name="transaction_author__e639fb_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.1.14 on 2026-10-18 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0006_transaction_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["author", "type", "created_at"],
+                name="transaction_author__33ac73_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "created_at"], name="transaction_account_b00314_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["category", "created_at"], name="transaction_categor_e774f5_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["account", "created_on", "created_at"],
+                name="transaction_account_be4898_idx",
+            ),
+        ),
+    ]
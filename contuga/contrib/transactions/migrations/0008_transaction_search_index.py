@@ -0,0 +1,25 @@
+# Generated by Django 3.1.14 on 2026-10-18 03:10
+
+from django.db import migrations
+
+from contuga.contrib.transactions.search import (
+    install_search_index,
+    uninstall_search_index,
+)
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0007_transaction_composite_indexes"),
+    ]
+
+    operations = [migrations.RunPython(install, uninstall)]
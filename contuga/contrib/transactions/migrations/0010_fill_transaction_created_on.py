@@ -0,0 +1,38 @@
+# Generated by Django 3.1.14 on 2026-10-18 04:02
+
+import pytz
+from django.conf import settings
+from django.db import migrations
+
+
+def fill_created_on(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    timezone = pytz.timezone(settings.TIME_ZONE)
+    queryset = (
+        Transaction.objects.filter(created_on__isnull=True)
+        .only("pk", "created_at")
+        .order_by("pk")
+    )
+
+    # The filled transactions no longer match the queryset
+    while True:
+        batch = list(queryset[:1000])
+
+        if not batch:
+            break
+
+        for transaction in batch:
+            transaction.created_on = transaction.created_at.astimezone(timezone).date()
+
+        Transaction.objects.bulk_update(batch, ["created_on"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0009_transaction_content_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_created_on, migrations.RunPython.noop),
+    ]
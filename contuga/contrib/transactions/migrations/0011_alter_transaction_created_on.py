@@ -0,0 +1,22 @@
+# Generated by Django 3.1.14 on 2026-10-18 04:03
+
+from django.db import migrations
+
+import contuga.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("transactions", "0010_fill_transaction_created_on"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="created_on",
+            field=contuga.fields.LocalDateField(
+                blank=True, source="created_at", verbose_name="Created on"
+            ),
+        ),
+    ]
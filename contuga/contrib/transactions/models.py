@@ -8,6 +8,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from contuga.contrib.categories.models import Category
 from contuga.contrib.tags.models import Tag
+from contuga.fields import LocalDateField
 from contuga.models import TimestampModel
 
 from . import constants, managers
@@ -58,6 +59,14 @@ class Transaction(TimestampModel):
         null=True,
     )
     description = models.CharField(_("Description"), max_length=1000, blank=True)
+    # The local date of the creation time allows the transactions to be filtered
+    # and grouped by days without converting the timezone of each row.
+    created_on = LocalDateField(_("Created on"), source="created_at", blank=True)
+    # The hash of the statement line a transaction was imported from, which
+    # prevents importing it again
+    content_hash = models.CharField(
+        _("Content hash"), max_length=64, blank=True, null=True, editable=False
+    )
 
     objects = managers.TransactionManager()
 
@@ -65,6 +74,19 @@ class Transaction(TimestampModel):
         ordering = ["-created_at"]
         verbose_name = _("Transaction")
         verbose_name_plural = _("Transactions")
+        indexes = [
+            models.Index(fields=["author", "created_on"]),
+            # Used by the keyset pagination of the transaction list
+            models.Index(fields=["author", "created_at", "uuid"]),
+            models.Index(fields=["author", "type", "created_at"]),
+            # Used by the latest transactions of the detail pages
+            models.Index(fields=["account", "created_at"]),
+            models.Index(fields=["category", "created_at"]),
+            # Used by the balances, the snapshots and the rollups
+            models.Index(fields=["account", "created_on", "created_at"]),
+            # Used by the deduplication of the imported statements
+            models.Index(fields=["author", "content_hash"]),
+        ]
 
     def __str__(self):
         return f"{self.get_type_display()} - {self.amount}"
@@ -72,6 +94,62 @@ class Transaction(TimestampModel):
     def get_absolute_url(self):
         return reverse("transactions:detail", kwargs={"pk": self.pk})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+
+        # The persisted values are used by the receivers of the model signals to
+        # calculate the changes introduced by a save or a delete.
+        instance._loaded_values = dict(zip(field_names, values))
+
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.store_persisted_values(fields)
+
+    def store_persisted_values(self, fields=None):
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        for field in self._meta.concrete_fields:
+            # Deferred fields are not present in the instance dictionary
+            if field.attname not in self.__dict__:
+                continue
+
+            if fields is None or field.name in fields or field.attname in fields:
+                loaded_values[field.attname] = getattr(self, field.attname)
+
+        self._loaded_values = loaded_values
+
+    def get_persisted_values(self, fields):
+        """
+        Return the persisted values of the given attributes or None if the
+        instance is not saved or some of them were not loaded.
+        """
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        if all(field in loaded_values for field in fields):
+            return {field: loaded_values[field] for field in fields}
+
+    def get_saved_values(self, fields, update_fields=None):
+        """
+        Return the values of the given attributes after saving `update_fields`
+        or all fields if not specified.
+        """
+        values = self.get_persisted_values(fields) or {}
+
+        for attname in fields:
+            field = self._meta.get_field(attname)
+
+            if (
+                update_fields is None
+                or field.name in update_fields
+                or field.attname in update_fields
+            ):
+                values[attname] = getattr(self, attname)
+
+        return values
+
     def save(self, *args, **kwargs):
         expenditure_condition = (
             self.expenditure_counterpart and self.type == constants.EXPENDITURE
@@ -87,7 +165,13 @@ class Transaction(TimestampModel):
                 _("Cannot change the type of a transaction that is part of a transfer")
             )
 
-        return super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+
+        if update_fields is not None and "created_at" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "created_on"}
+
+        super().save(*args, **kwargs)
+        self.store_persisted_values(kwargs.get("update_fields"))
 
     @property
     def is_income(self):
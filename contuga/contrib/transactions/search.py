@@ -0,0 +1,242 @@
+import functools
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import CharField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+RANK = "search_rank"
+SEARCH_CONFIG = "simple"
+
+# The trigram tokenizer of SQLite cannot match shorter terms
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+FTS_TABLE = "transactions_transaction_fts"
+FTS_TRIGGERS = {
+    "transactions_transaction_fts_insert": (
+        "AFTER INSERT ON transactions_transaction BEGIN "
+        f"INSERT INTO {FTS_TABLE} (rowid, description) "
+        "VALUES (new.rowid, new.description); "
+        "END"
+    ),
+    "transactions_transaction_fts_delete": (
+        "AFTER DELETE ON transactions_transaction BEGIN "
+        f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, description) "
+        "VALUES ('delete', old.rowid, old.description); "
+        "END"
+    ),
+    "transactions_transaction_fts_update": (
+        "AFTER UPDATE OF description ON transactions_transaction BEGIN "
+        f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, description) "
+        "VALUES ('delete', old.rowid, old.description); "
+        f"INSERT INTO {FTS_TABLE} (rowid, description) "
+        "VALUES (new.rowid, new.description); "
+        "END"
+    ),
+}
+
+POSTGRESQL_INDEXES = {
+    "transaction_description_search_idx": (
+        f"to_tsvector('{SEARCH_CONFIG}'::regconfig, COALESCE(description, ''))"
+    ),
+    "transaction_description_trgm_idx": "description gin_trgm_ops",
+}
+
+
+def install_search_index(connection):
+    """
+    Create the search index of the database of `connection` if it is missing.
+    It is safe to call repeatedly, e.g. after each migration.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+            for name, expression in POSTGRESQL_INDEXES.items():
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} "
+                    f"ON transactions_transaction USING GIN ({expression})"
+                )
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'transactions_transaction'"
+            )
+            existing_triggers = {row[0] for row in cursor.fetchall()}
+
+            if existing_triggers.issuperset(FTS_TRIGGERS):
+                return
+
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                    "description, content='transactions_transaction', "
+                    "content_rowid='rowid', tokenize='trigram')"
+                )
+            except OperationalError:
+                # SQLite is built without FTS5 or older than 3.34, so the
+                # searches fall back to the unindexed matching
+                return
+
+            has_fts_table.cache_clear()
+
+            for name, definition in FTS_TRIGGERS.items():
+                cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {definition}")
+
+            # The triggers are dropped along with the table whenever a migration
+            # rebuilds it, which also changes the rowids, so the index is rebuilt
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def repair_search_index(connection):
+    """
+    Restore the triggers of an installed SQLite search index, which are dropped
+    along with the transactions table whenever a migration rebuilds it.
+    """
+    if connection.vendor == "sqlite" and has_fts_table(connection.alias):
+        install_search_index(connection)
+
+
+def uninstall_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for name in POSTGRESQL_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        elif connection.vendor == "sqlite":
+            for name in FTS_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+            has_fts_table.cache_clear()
+
+
+def register_lookups():
+    """
+    Register the trigram lookup of django.contrib.postgres, which is not an
+    installed app as it requires psycopg2 even on SQLite.
+    """
+    if connections[DEFAULT_DB_ALIAS].vendor == "postgresql":
+        from django.contrib.postgres.lookups import TrigramSimilar
+
+        CharField.register_lookup(TrigramSimilar)
+
+
+def is_ranked(queryset):
+    return RANK in queryset.query.annotations
+
+
+def get_keyset_ordering(queryset, ordering):
+    """
+    Return the keyset `ordering` of `queryset`, preceded by the search rank if
+    it is the result of a search.
+    """
+    return (RANK, *ordering) if is_ranked(queryset) else tuple(ordering)
+
+
+def search_postgresql(queryset, terms):
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+        SearchVector,
+        TrigramSimilarity,
+    )
+
+    text = " ".join(terms)
+    # Each term matches the words starting with it
+    lexemes = (term.replace("\\", "\\\\").replace("'", "''") for term in terms)
+    search_query = SearchQuery(
+        " & ".join(f"'{lexeme}':*" for lexeme in lexemes),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+    search_vector = SearchVector("description", config=SEARCH_CONFIG)
+
+    return (
+        queryset.annotate(search_document=search_vector)
+        .filter(Q(search_document=search_query) | Q(description__trigram_similar=text))
+        .annotate(
+            **{
+                # The real ranks are cast to double precision to compare them
+                # exactly with the ranks in the cursors
+                RANK: Cast(
+                    SearchRank(search_vector, search_query)
+                    + TrigramSimilarity("description", Value(text)),
+                    FloatField(),
+                )
+            }
+        )
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def has_fts_table(alias):
+    """
+    Return whether the database of `alias` has the SQLite search index. The
+    index is only installed and uninstalled by migrations, which clear the
+    cached results, so the tables are not listed on every search.
+    """
+    return FTS_TABLE in connections[alias].introspection.table_names()
+
+
+def search_sqlite(queryset, terms):
+    # Each term is quoted as a string, matching the descriptions containing it
+    match = " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+    # The index is joined, so a single full-text query both filters the
+    # transactions and ranks them. bm25 is lower for the better matches, so it
+    # is negated.
+    rank = RawSQL(f"-bm25({FTS_TABLE})", (), output_field=FloatField())
+
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            # The unary plus keeps SQLite from looking the index rows up by rowid,
+            # which would run the full-text query once per transaction, e.g.
+            # when the transactions are filtered by an indexed author.
+            f"+{FTS_TABLE}.rowid = transactions_transaction.rowid",
+            f"{FTS_TABLE} MATCH %s",
+        ],
+        params=[match],
+    ).annotate(**{RANK: rank})
+
+
+def search_transactions(queryset, query):
+    """
+    Filter `queryset` to the transactions whose descriptions match all terms of
+    `query` and annotate them with their `search_rank`, the higher the better.
+
+    On PostgreSQL the terms are matched by prefix against a `tsvector` index and
+    by similarity against a trigram index. On SQLite they are matched against
+    an FTS5 table with the trigram tokenizer. Other databases, or SQLite with
+    terms too short for the trigram index, fall back to unindexed
+    case-insensitive matching without ranking.
+    """
+    terms = query.split()
+
+    if not terms:
+        return queryset
+
+    connection = connections[queryset.db]
+
+    if connection.vendor == "postgresql":
+        return search_postgresql(queryset, terms)
+
+    indexed_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_TERM_LENGTH]
+
+    if (
+        connection.vendor == "sqlite"
+        and indexed_terms
+        and has_fts_table(connection.alias)
+    ):
+        queryset = search_sqlite(queryset, indexed_terms)
+    else:
+        queryset = queryset.annotate(
+            **{RANK: Cast(Value(0), output_field=FloatField())}
+        )
+        indexed_terms = []
+
+    for term in terms:
+        if term not in indexed_terms:
+            queryset = queryset.filter(description__icontains=term)
+
+    return queryset
@@ -1,10 +1,81 @@
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import serializers
 
+from contuga.contrib.categories import constants as category_constants
+from contuga.contrib.tags.models import Tag
+
+from . import constants
 from .models import Transaction
 
 
+class PreloadedHyperlinkedRelatedField(serializers.HyperlinkedRelatedField):
+    """
+    Looks the related objects up in the `preloaded` dict of the serializer
+    context, mapping models to their objects by primary key, instead of
+    querying them one by one. Objects of other models are queried as usual.
+    """
+
+    def get_object(self, view_name, view_args, view_kwargs):
+        model = self.get_queryset().model
+        objects = self.context.get("preloaded", {}).get(model)
+
+        if objects is None:
+            return super().get_object(view_name, view_args, view_kwargs)
+
+        lookup_value = view_kwargs[self.lookup_url_kwarg]
+
+        try:
+            return objects[model._meta.pk.to_python(lookup_value)]
+        except KeyError:
+            raise ObjectDoesNotExist()
+
+
 class TransactionSerializer(serializers.HyperlinkedModelSerializer):
+    # The names of tags to add along with the `tags`, which are created if missing
+    tag_names = serializers.ListField(
+        child=serializers.CharField(max_length=254), write_only=True, required=False
+    )
+
     class Meta:
         model = Transaction
-        fields = "__all__"
+        exclude = ("created_on", "content_hash")
         extra_kwargs = {"author": {"read_only": True}, "tags": {"required": False}}
+
+    def create(self, validated_data):
+        tags = validated_data.pop("tags", None)
+        tag_names = validated_data.pop("tag_names", None)
+        instance = super().create(validated_data)
+        self.save_tags(instance, tags, tag_names)
+
+        return instance
+
+    def update(self, instance, validated_data):
+        tags = validated_data.pop("tags", None)
+        tag_names = validated_data.pop("tag_names", None)
+        instance = super().update(instance, validated_data)
+        self.save_tags(instance, tags, tag_names)
+
+        return instance
+
+    def save_tags(self, instance, tags, tag_names):
+        if tags is None and tag_names is None:
+            return
+
+        tags = [*(tags or []), *Tag.objects.resolve(instance.author, tag_names or [])]
+        instance.tags.set(tags)
+
+
+class TransactionBatchItemSerializer(TransactionSerializer):
+    serializer_related_field = PreloadedHyperlinkedRelatedField
+
+    def validate(self, data):
+        category = data.get("category")
+
+        if category and category.transaction_type not in (
+            category_constants.ALL,
+            data.get("type", constants.EXPENDITURE),
+        ):
+            message = self.fields["category"].error_messages["does_not_exist"]
+            raise serializers.ValidationError({"category": [message]})
+
+        return data
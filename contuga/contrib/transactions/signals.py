@@ -0,0 +1,11 @@
+from django.db import connections
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .search import repair_search_index
+
+
+@receiver(post_migrate, dispatch_uid="repair_transaction_search_index")
+def repair_transaction_search_index(sender, using, **kwargs):
+    if sender.name == "contuga.contrib.transactions":
+        repair_search_index(connections[using])
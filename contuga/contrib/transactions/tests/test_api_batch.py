@@ -0,0 +1,223 @@
+from contextlib import ExitStack
+from decimal import Decimal
+from unittest import mock
+
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from contuga.contrib.accounts.models import Account, BalanceSnapshot
+from contuga.contrib.analytics.models import DailyRollup
+from contuga.mixins import TestMixin
+
+from .. import views
+from ..constants import EXPENDITURE, INCOME
+from ..models import Transaction
+from ..views import TransactionViewSet
+
+
+class TransactionBatchTestCase(APITestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category(transaction_type=EXPENDITURE)
+        self.income_category = self.create_category(
+            name="Salary", transaction_type=INCOME
+        )
+        self.tags = [self.create_tag(), self.create_tag(name="Second tag")]
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.second_account = self.create_account(name="Second account name")
+        self.url = reverse("transaction-batch")
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_item(self, amount, account=None, type=EXPENDITURE, category=None, tags=()):
+        item = {
+            "type": type,
+            "amount": amount,
+            "category": reverse(
+                "category-detail", args=[(category or self.category).pk]
+            ),
+            "account": reverse("account-detail", args=[(account or self.account).pk]),
+            "description": f"Transaction {amount}",
+        }
+
+        if tags:
+            item["tags"] = [reverse("tag-detail", args=[tag.pk]) for tag in tags]
+
+        return item
+
+    def test_batch(self):
+        items = [
+            self.get_item("10.00", tags=self.tags),
+            self.get_item("20.00", account=self.second_account),
+            self.get_item(
+                "100.00", type=INCOME, category=self.income_category, tags=self.tags[:1]
+            ),
+        ]
+
+        response = self.client.post(self.url, data=items, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertListEqual(
+            [item["description"] for item in response.json()],
+            [item["description"] for item in items],
+        )
+        self.assertEqual(len(response.json()[0]["tags"]), 2)
+
+        transactions = Transaction.objects.filter(author=self.user)
+        self.assertEqual(transactions.count(), 3)
+        self.assertEqual(transactions.filter(tags=self.tags[0]).count(), 2)
+        self.assertFalse(transactions.filter(created_on__isnull=True).exists())
+
+        self.account.refresh_from_db()
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("90.00"))
+        self.assertEqual(self.second_account.balance, Decimal("-20.00"))
+        self.assertEqual(
+            self.account.calculate_balance(date=transactions.first().created_on),
+            Decimal("90.00"),
+        )
+        self.assertEqual(DailyRollup.objects.filter(user=self.user).count(), 3)
+
+    def test_batch_with_tag_names(self):
+        first_item = self.get_item("10.00", tags=self.tags[:1])
+        first_item["tag_names"] = [self.tags[0].name, "New tag"]
+        second_item = self.get_item("20.00")
+        second_item["tag_names"] = ["New tag", "Second new tag"]
+
+        response = self.client.post(
+            self.url, data=[first_item, second_item], format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+
+        first, second = [
+            Transaction.objects.get(description=item["description"])
+            for item in (first_item, second_item)
+        ]
+        self.assertCountEqual(
+            [tag.name for tag in first.tags.all()], [self.tags[0].name, "New tag"]
+        )
+        self.assertCountEqual(
+            [tag.name for tag in second.tags.all()], ["New tag", "Second new tag"]
+        )
+        self.assertEqual(self.user.tags.count(), 4)
+
+    def test_tags_are_not_created_for_failed_batches(self):
+        item = self.get_item("10.00")
+        item["tag_names"] = ["New tag"]
+
+        with mock.patch.object(
+            Transaction.objects, "bulk_create", side_effect=DatabaseError
+        ):
+            with self.assertRaises(DatabaseError):
+                self.client.post(self.url, data=[item], format="json")
+
+        self.assertFalse(self.user.tags.filter(name="New tag").exists())
+
+    def test_query_count_does_not_depend_on_the_batch_size(self):
+        query_counts = []
+
+        for size in (1, 10):
+            items = [self.get_item("1.00", tags=self.tags) for index in range(size)]
+
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.url, data=items, format="json")
+
+            self.assertEqual(response.status_code, 201)
+            query_counts.append(len(context.captured_queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_changes_are_applied_without_rebuilding(self):
+        self.create_transaction(amount=Decimal("5.00"))
+        items = [
+            self.get_item("10.00"),
+            self.get_item("20.00"),
+            self.get_item("30.00", account=self.second_account),
+            self.get_item("100.00", type=INCOME, category=self.income_category),
+        ]
+
+        with ExitStack() as stack:
+            rebuilds = [
+                stack.enter_context(mock.patch.object(manager, name))
+                for manager, name in (
+                    (Account.objects, "recalculate_balances"),
+                    (BalanceSnapshot.objects, "rebuild"),
+                    (DailyRollup.objects, "rebuild"),
+                )
+            ]
+            invalidate_reports = stack.enter_context(
+                mock.patch.object(views, "invalidate_reports")
+            )
+            response = self.client.post(self.url, data=items, format="json")
+
+        self.assertEqual(response.status_code, 201)
+
+        for rebuild in rebuilds:
+            rebuild.assert_not_called()
+
+        invalidate_reports.assert_called_once_with(self.user.pk)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("65.00"))
+
+        snapshots = list(BalanceSnapshot.objects.values_list("account", "balance"))
+        rollups = list(
+            DailyRollup.objects.values_list(
+                "account", "category", "income", "expenditures", "expenditures_count"
+            )
+        )
+        accounts = Account.objects.all()
+        BalanceSnapshot.objects.rebuild(accounts)
+        DailyRollup.objects.rebuild(accounts)
+
+        self.assertCountEqual(
+            snapshots, BalanceSnapshot.objects.values_list("account", "balance")
+        )
+        self.assertCountEqual(
+            rollups,
+            DailyRollup.objects.values_list(
+                "account", "category", "income", "expenditures", "expenditures_count"
+            ),
+        )
+
+    def test_errors_are_reported_per_item(self):
+        other_user = self.create_user("richard.roe@example.com", "password")
+        other_account = self.create_account(owner=other_user)
+        items = [
+            self.get_item("10.00"),
+            self.get_item("20.00", account=other_account),
+            self.get_item("30.00", type=INCOME),
+        ]
+
+        response = self.client.post(self.url, data=items, format="json")
+
+        self.assertEqual(response.status_code, 400)
+
+        does_not_exist = _("Invalid hyperlink - Object does not exist.")
+        self.assertDictEqual(
+            response.json(),
+            {
+                "errors": [
+                    {},
+                    {"account": [does_not_exist]},
+                    {"category": [does_not_exist]},
+                ]
+            },
+        )
+        self.assertFalse(Transaction.objects.exists())
+
+    @mock.patch.object(TransactionViewSet, "batch_max_size", 2)
+    def test_invalid_batch(self):
+        for data in ({}, [], [self.get_item("1.00")] * 3):
+            with self.subTest(data=data):
+                response = self.client.post(self.url, data=data, format="json")
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("non_field_errors", response.json())
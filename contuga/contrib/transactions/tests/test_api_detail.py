@@ -139,6 +139,32 @@ class TransactionDetailTestCase(APITestCase, TestMixin):
 
         self.assertDictEqual(response.json(), expected_response)
 
+    def test_patch_tags(self):
+        url = reverse("transaction-detail", args=[self.transaction.pk])
+
+        # Assert the tags are kept unless specified
+        response = self.client.patch(url, data={"amount": "1"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(self.transaction.tags.all(), self.tags)
+
+        data = {
+            "tags": [reverse("tag-detail", args=[self.tags[0].pk])],
+            "tag_names": ["New tag"],
+        }
+        response = self.client.patch(url, data=data, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            [tag.name for tag in self.transaction.tags.all()],
+            [self.tags[0].name, "New tag"],
+        )
+
+        response = self.client.patch(url, data={"tag_names": []}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.transaction.tags.exists())
+
     def test_cannot_patch_transactions_of_other_users(self):
         transaction = self.create_independent_transaction()
 
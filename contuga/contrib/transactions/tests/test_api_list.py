@@ -3,6 +3,7 @@ from django.utils.translation import ugettext_lazy as _
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient, APITestCase
 
+from contuga.contrib.tags.models import Tag
 from contuga.mixins import TestMixin
 
 from ..constants import EXPENDITURE, INCOME
@@ -49,7 +50,6 @@ class TransactionListTestCase(APITestCase, TestMixin):
 
         # Assert correct data is returned
         expected_response = {
-            "count": 1,
             "next": None,
             "previous": None,
             "results": [
@@ -190,6 +190,30 @@ class TransactionListTestCase(APITestCase, TestMixin):
 
         self.assertDictEqual(response.json(), expected_response)
 
+    def test_post_with_tag_names(self):
+        url = reverse("transaction-list")
+        tag = self.create_tag("Third tag")
+
+        data = {
+            "type": EXPENDITURE,
+            "amount": "300.30",
+            "category": reverse("category-detail", args=[self.category.pk]),
+            "tags": [reverse("tag-detail", args=[tag.pk])],
+            "tag_names": ["Second tag", "New tag", "Third tag"],
+            "account": reverse("account-detail", args=[self.account.pk]),
+        }
+
+        response = self.client.post(url, data=data, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("tag_names", response.json())
+
+        # Assert the existing tags are reused and the missing one is created
+        transaction = Transaction.objects.order_by("created_at").last()
+        new_tag = Tag.objects.get(author=self.user, name="New tag")
+        self.assertCountEqual(transaction.tags.all(), [tag, self.tags[0], new_tag])
+        self.assertEqual(len(response.json()["tags"]), 3)
+
     def test_author_field_is_ignored_on_post(self):
         url = reverse("transaction-list")
 
@@ -1,10 +1,15 @@
+import json
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
 from contuga.contrib.accounts.models import Account
 from contuga.contrib.categories.models import Category
 from contuga.contrib.settings.models import Settings
+from contuga.contrib.tags.models import Tag
 from contuga.contrib.transactions.constants import EXPENDITURE, INCOME
 from contuga.contrib.transactions.models import Transaction
 from contuga.mixins import TestMixin
@@ -147,6 +152,52 @@ class TransactionViewTests(TestCase, TestMixin):
             fetch_redirect_response=True,
         )
 
+    def test_create_with_tags(self):
+        tag = self.create_tag(name="Existing tag")
+        other_user = self.create_user("richard.roe@example.com", "password")
+        self.create_tag(name="New tag", author=other_user)
+
+        data = {
+            "type": EXPENDITURE,
+            "amount": "200",
+            "account": self.account.pk,
+            "tags": json.dumps(
+                [{"value": "Existing tag"}, {"value": "New tag"}, {"value": "New tag"}]
+            ),
+        }
+
+        url = reverse("transactions:create")
+        response = self.client.post(url, data=data)
+
+        self.assertEqual(response.status_code, 302)
+
+        # Assert the existing tag is reused and the missing one is created
+        transaction = Transaction.objects.get()
+        new_tag = Tag.objects.get(author=self.user, name="New tag")
+        self.assertCountEqual(transaction.tags.all(), [tag, new_tag])
+
+    def test_create_query_count_does_not_depend_on_tag_count(self):
+        # The daily rollup and the balance snapshot of the day already exist
+        self.create_transaction()
+        query_counts = []
+
+        for count in (1, 10):
+            tags = [{"value": f"Tag {count} {index}"} for index in range(count)]
+            data = {
+                "type": EXPENDITURE,
+                "amount": "200",
+                "account": self.account.pk,
+                "tags": json.dumps(tags),
+            }
+
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(reverse("transactions:create"), data=data)
+
+            self.assertEqual(response.status_code, 302)
+            query_counts.append(len(context.captured_queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_create_income_with_wrong_category(self):
         category = self.create_category(transaction_type=EXPENDITURE)
 
@@ -0,0 +1,111 @@
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from contuga.mixins import TestMixin
+
+from .. import exports
+from ..constants import INCOME
+
+
+class TransactionExportTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.second_account = self.create_account(name="Second account name")
+        self.client.force_login(self.user)
+
+        self.create_transaction(amount="10.50", description="Groceries")
+        income = self.create_income(
+            amount=1000, account=self.second_account, description='Salary, "bonus"'
+        )
+        income.category = None
+        income.save()
+
+    def export(self, file_format, data=None):
+        url = reverse("transactions:list")
+
+        if data:
+            url += "?" + data
+
+        response = self.client.get(url)
+        choices = dict(
+            (label, value)
+            for value, label in response.context["form"].fields["file_format"].choices
+        )
+        response = self.client.post(url, {"file_format": choices[file_format]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        with CaptureQueriesContext(connection) as context:
+            content = b"".join(response.streaming_content).decode()
+
+        # The categories and accounts are joined instead of queried per row
+        self.assertEqual(len(context.captured_queries), 1)
+
+        return response, content
+
+    def test_csv(self):
+        response, content = self.export("csv")
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn(".csv", response["Content-Disposition"])
+        self.assertListEqual(
+            content.splitlines(),
+            [
+                "type,amount,category,account,description",
+                f'{INCOME},1000.00,,Second account name,"Salary, ""bonus"""',
+                f"expenditure,10.50,{self.category.name},{self.account.name},Groceries",
+            ],
+        )
+
+    def test_json_lines(self):
+        response, content = self.export("jsonl", data=f"type={INCOME}")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertListEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [
+                {
+                    "type": INCOME,
+                    "amount": "1000.00",
+                    "category": "",
+                    "account": "Second account name",
+                    "description": 'Salary, "bonus"',
+                }
+            ],
+        )
+
+    @mock.patch.object(exports, "CHUNK_SIZE", 1)
+    def test_content_is_written_in_chunks(self):
+        transactions = self.user.transactions.all()
+        chunks = list(exports.iter_export_content(exports.CSV(), transactions, 1))
+
+        self.assertEqual(len(chunks), 3)
+
+    def test_other_formats_are_not_streamed(self):
+        url = reverse("transactions:list")
+        response = self.client.get(url)
+        choices = dict(
+            (label, value)
+            for value, label in response.context["form"].fields["file_format"].choices
+        )
+
+        response = self.client.post(url, {"file_format": choices["json"]})
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(json.loads(response.content)), 2)
+
+    def test_streaming_formats_must_write_rows(self):
+        class Incomplete(exports.StreamingFormat):
+            title = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
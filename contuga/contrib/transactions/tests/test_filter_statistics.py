@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from contuga.contrib.analytics.cache import get_cache
+from contuga.contrib.settings.models import Settings
+from contuga.mixins import TestMixin
+
+from .. import cache
+from ..cache import get_statistics_key
+from ..constants import EXPENDITURE
+
+
+# The reports are invalidated once the database transactions commit
+class FilterStatisticsTestCase(TransactionTestCase, TestMixin):
+    def setUp(self):
+        get_cache().clear()
+
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+
+        for amount in range(1, 6):
+            self.create_transaction(amount=amount)
+
+        settings = Settings.objects.get(user=self.user)
+        settings.transactions_per_page = 2
+        settings.save()
+
+        self.client.force_login(self.user)
+
+    def get_aggregations(self, data):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("transactions:list"), data)
+
+        queries = [query["sql"] for query in context.captured_queries]
+
+        self.assertFalse(any("COUNT(*)" in query for query in queries))
+
+        return response, [query for query in queries if "SUM(" in query]
+
+    def test_statistics_are_cached(self):
+        response, aggregations = self.get_aggregations({"page": 1})
+
+        self.assertEqual(len(aggregations), 1)
+        self.assertEqual(response.context["paginator"].num_pages, 3)
+        self.assertEqual(response.context["filter_statistics"]["transaction_count"], 5)
+
+        response, aggregations = self.get_aggregations(
+            {"page": 2, "ordering": "amount"}
+        )
+
+        self.assertEqual(len(aggregations), 0)
+        self.assertEqual(response.context["filter_statistics"]["transaction_count"], 5)
+
+        response, aggregations = self.get_aggregations({"max_amount": 2})
+
+        self.assertEqual(len(aggregations), 1)
+        self.assertEqual(response.context["filter_statistics"]["transaction_count"], 2)
+
+    def test_statistics_are_invalidated(self):
+        self.get_aggregations({})
+        self.create_transaction(type=EXPENDITURE, amount=10)
+
+        response, aggregations = self.get_aggregations({})
+
+        self.assertEqual(len(aggregations), 1)
+        self.assertEqual(response.context["filter_statistics"]["transaction_count"], 6)
+
+    def test_statistics_are_invalidated_by_other_processes(self):
+        # Each process has its own local memory cache
+        web_cache = LocMemCache("web", {})
+
+        with mock.patch.object(cache, "get_cache", return_value=web_cache):
+            self.get_aggregations({})
+
+        with mock.patch.object(cache, "get_cache", return_value=LocMemCache("", {})):
+            self.create_transaction(type=EXPENDITURE, amount=10)
+
+        with mock.patch.object(cache, "get_cache", return_value=web_cache):
+            response, aggregations = self.get_aggregations({"page": 3})
+
+        self.assertEqual(len(aggregations), 1)
+        self.assertEqual(response.context["filter_statistics"]["transaction_count"], 6)
+        self.assertEqual(response.context["paginator"].num_pages, 3)
+        self.assertEqual(len(response.context["object_list"]), 2)
+
+    def test_key_is_normalized(self):
+        response = self.client.get(reverse("transactions:list"))
+        key = get_statistics_key(self.user, 1, response.wsgi_request.GET)
+
+        response = self.client.get(
+            reverse("transactions:list"),
+            {"page": 2, "ordering": "-amount", "description": ""},
+        )
+
+        self.assertEqual(
+            get_statistics_key(self.user, 1, response.wsgi_request.GET), key
+        )
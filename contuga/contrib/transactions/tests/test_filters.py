@@ -1,6 +1,8 @@
 import json
-from datetime import timedelta
+from datetime import datetime, timedelta
+from unittest import mock
 
+import pytz
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
@@ -97,6 +99,23 @@ class TransactionFilterTests(TestCase, TestMixin):
 
         self.assertListEqual(list(filter.qs), [third_transaction, second_transaction])
 
+    def test_tags_filter_does_not_duplicate_transactions(self):
+        user = self.data_john["user"]
+        account = self.data_john["account"]
+
+        first_tag = self.create_tag(name="First tag", author=user)
+        second_tag = self.create_tag(name="Second tag", author=user)
+
+        transaction = self.create_income(
+            author=user, account=account, tags=[first_tag, second_tag]
+        )
+
+        tags = [{"value": first_tag.name}, {"value": second_tag.name}]
+        data = {"tags": json.dumps(tags)}
+        filter = TransactionFilterSet(data=data, request=self.request)
+
+        self.assertListEqual(list(filter.qs), [transaction])
+
     def test_created_at_filter(self):
         transaction = self.data_john["transaction"]
         second_transaction = self.create_income(
@@ -106,18 +125,36 @@ class TransactionFilterTests(TestCase, TestMixin):
             description="Second transaction description",
         )
 
-        date_string = transaction.created_at.strftime("%m/%d/%Y")
+        # The creation dates are compared in the local time zone
+        date_string = transaction.created_at.astimezone().strftime("%m/%d/%Y")
         data = {"created_at": f"{date_string} - {date_string}"}
         filter = TransactionFilterSet(data=data, request=self.request)
 
         self.assertListEqual(list(filter.qs), [second_transaction, transaction])
 
-        yesterday = transaction.created_at - timedelta(days=1)
+        yesterday = transaction.created_at.astimezone() - timedelta(days=1)
         date_string = yesterday.strftime("%m/%d/%Y")
         data = {"created_at": f"{date_string} - {date_string}"}
         filter = TransactionFilterSet(data=data, request=self.request)
         self.assertListEqual(list(filter.qs), [])
 
+    def test_created_at_filter_uses_local_dates(self):
+        account = self.data_john["account"]
+        transactions = []
+
+        # Both are created on the 1st of January in UTC
+        for hour in (21, 23):
+            with mock.patch("django.utils.timezone.now") as mocked_now:
+                mocked_now.return_value = datetime(2021, 1, 1, hour, tzinfo=pytz.UTC)
+                transactions.append(
+                    self.create_transaction(author=account.owner, account=account)
+                )
+
+        data = {"created_at": "01/02/2021 - 01/02/2021"}
+        filter = TransactionFilterSet(data=data, request=self.request)
+
+        self.assertListEqual(list(filter.qs), [transactions[1]])
+
     def test_updated_at_filter(self):
         transaction = self.data_john["transaction"]
         second_transaction = self.create_income(
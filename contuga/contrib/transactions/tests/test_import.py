@@ -0,0 +1,374 @@
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from contuga.contrib.accounts.models import BalanceSnapshot
+from contuga.contrib.categories.constants import EXPENDITURE as CATEGORY_EXPENDITURE
+from contuga.contrib.categories.constants import INCOME as CATEGORY_INCOME
+from contuga.contrib.tags.models import Tag
+from contuga.mixins import TestMixin
+
+from .. import imports
+from ..constants import EXPENDITURE, INCOME
+from ..models import Transaction
+
+CSV_STATEMENT = """date,amount,type,category,account,description,tags
+2021-03-01,12.50,expenditure,Food,,Groceries,"Home, Weekly"
+2021-03-01,12.50,expenditure,Food,,Groceries,
+2021-03-02T18:30:00+00:00,1000,income,Salary,Second account name,Salary,Work
+2021-03-03,-3.20,,,,Coffee,
+2021-03-04,abc,,,,Invalid,
+2021-03-05,5,,Unknown,,Unknown category,
+"""
+
+OFX_SGML_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20210301120000[-5:EST]
+<TRNAMT>-1,234.56
+<FITID>1001
+<NAME>Rent
+<MEMO>March
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20210302
+<TRNAMT>100.00
+<FITID>1002
+<NAME>Refund
+</STMTTRN>
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+OFX_XML_STATEMENT = (
+    '<?xml version="1.0"?><OFX><BANKTRANLIST>'
+    "<STMTTRN><DTPOSTED>20210301</DTPOSTED><TRNAMT>-10</TRNAMT>"
+    "<FITID>1</FITID><NAME>Books</NAME></STMTTRN>"
+    "<STMTTRN><DTPOSTED>20210302</DTPOSTED><FITID>2</FITID></STMTTRN>"
+    "</BANKTRANLIST></OFX>"
+)
+
+QIF_STATEMENT = """!Type:Bank
+D03/01/2021
+T-45.00
+PPharmacy
+LHealth
+^
+D3/2'21
+U1,000.00
+PEmployer
+MMarch salary
+L[Savings]
+^
+D13/45/2021
+T5
+^
+"""
+
+
+class StatementParserTestCase(TestCase):
+    def parse(self, file_format, statement):
+        return list(imports.PARSERS[file_format](StringIO(statement)))
+
+    def test_csv(self):
+        lines = self.parse(imports.CSV, CSV_STATEMENT)
+
+        self.assertEqual(len(lines), 6)
+        self.assertEqual(lines[0].line, 2)
+        self.assertEqual(lines[0].type, EXPENDITURE)
+        self.assertEqual(lines[0].amount, Decimal("12.50"))
+        self.assertEqual(lines[0].category, "Food")
+        self.assertEqual(lines[0].tags, ["Home", "Weekly"])
+        self.assertEqual(lines[0].created_at.date(), date(2021, 3, 1))
+        self.assertEqual(lines[2].account, "Second account name")
+        self.assertEqual(lines[2].created_at.isoformat(), "2021-03-02T18:30:00+00:00")
+        self.assertEqual(lines[3].type, EXPENDITURE)
+        self.assertEqual(lines[3].amount, Decimal("3.20"))
+
+        # The invalid lines are yielded as errors, followed by the rest
+        self.assertIsInstance(lines[4], imports.StatementError)
+        self.assertEqual(lines[4].line, 6)
+        self.assertEqual(lines[4].message, "Invalid amount: abc")
+        self.assertEqual(lines[5].category, "Unknown")
+
+    def test_csv_without_required_columns(self):
+        with self.assertRaises(imports.StatementError):
+            self.parse(imports.CSV, "amount,description\n1,Coffee\n")
+
+    def test_ofx_sgml(self):
+        first, second = self.parse(imports.OFX, OFX_SGML_STATEMENT)
+
+        self.assertEqual(first.line, 7)
+        self.assertEqual(first.type, EXPENDITURE)
+        self.assertEqual(first.amount, Decimal("1234.56"))
+        self.assertEqual(first.created_at.date(), date(2021, 3, 1))
+        self.assertEqual(first.description, "Rent March")
+        self.assertEqual(first.reference, "1001")
+        self.assertEqual(second.type, INCOME)
+        self.assertEqual(second.amount, Decimal("100"))
+        self.assertEqual(second.description, "Refund")
+
+    def test_ofx_xml(self):
+        first, second = self.parse(imports.OFX, OFX_XML_STATEMENT)
+
+        self.assertEqual(first.amount, Decimal("10"))
+        self.assertEqual(first.description, "Books")
+        self.assertIsInstance(second, imports.StatementError)
+        self.assertEqual(second.message, "The TRNAMT element is required.")
+
+    def test_qif(self):
+        first, second, third = self.parse(imports.QIF, QIF_STATEMENT)
+
+        self.assertEqual(first.line, 2)
+        self.assertEqual(first.type, EXPENDITURE)
+        self.assertEqual(first.amount, Decimal("45"))
+        self.assertEqual(first.category, "Health")
+        self.assertEqual(first.created_at.date(), date(2021, 3, 1))
+        self.assertEqual(second.type, INCOME)
+        self.assertEqual(second.amount, Decimal("1000"))
+        self.assertEqual(second.created_at.date(), date(2021, 3, 2))
+        self.assertEqual(second.description, "Employer March salary")
+        self.assertEqual(second.category, "")
+        self.assertIsInstance(third, imports.StatementError)
+        self.assertEqual(third.message, "Invalid date: 13/45/2021")
+
+    def test_amounts(self):
+        for value, amount in (
+            ("12,50", Decimal("12.50")),
+            ("1.234,50", Decimal("1234.50")),
+            ("-1 234.50", Decimal("1234.50")),
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(imports.parse_amount(1, value)[1], amount)
+
+        for value in ("", "NaN", "1.2.3"):
+            with self.subTest(value=value):
+                with self.assertRaises(imports.StatementError):
+                    imports.parse_amount(1, value)
+
+
+class StatementImportTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.second_account = self.create_account(name="Second account name")
+        self.food = self.create_category(
+            name="Food", transaction_type=CATEGORY_EXPENDITURE
+        )
+        self.salary = self.create_category(
+            name="Salary", transaction_type=CATEGORY_INCOME
+        )
+        self.home = self.create_tag(name="Home")
+
+        other_user = self.create_user("richard.roe@example.com", "password")
+        self.create_tag(name="Work", author=other_user)
+
+    def import_statement(self, file_format, statement, **kwargs):
+        return imports.import_statement(
+            self.user, StringIO(statement), file_format, account=self.account, **kwargs
+        )
+
+    def test_import(self):
+        result = self.import_statement(imports.CSV, CSV_STATEMENT, chunk_size=2)
+
+        self.assertEqual(result.created, 4)
+        self.assertEqual(result.duplicates, 0)
+        self.assertListEqual(
+            result.skipped,
+            [
+                imports.SkippedLine(6, "Invalid amount: abc"),
+                imports.SkippedLine(7, "Unknown category: Unknown"),
+            ],
+        )
+
+        groceries = Transaction.objects.get(tags=self.home)
+        second_groceries = Transaction.objects.exclude(pk=groceries.pk).get(
+            description="Groceries"
+        )
+        salary = Transaction.objects.get(description="Salary")
+        coffee = Transaction.objects.get(description="Coffee")
+
+        # The identical lines are imported separately
+        self.assertEqual(groceries.account, self.account)
+        self.assertEqual(groceries.category, self.food)
+        self.assertEqual(groceries.created_on, date(2021, 3, 1))
+        self.assertEqual(second_groceries.created_on, date(2021, 3, 1))
+        self.assertNotEqual(groceries.content_hash, second_groceries.content_hash)
+        self.assertEqual(salary.account, self.second_account)
+        self.assertEqual(salary.category, self.salary)
+        self.assertEqual(salary.created_at.isoformat(), "2021-03-02T18:30:00+00:00")
+        self.assertIsNone(coffee.category)
+
+        # The existing tags are reused and the missing ones are created
+        self.assertCountEqual(
+            [tag.name for tag in groceries.tags.all()], ["Home", "Weekly"]
+        )
+        self.assertIn(self.home, groceries.tags.all())
+        self.assertEqual(salary.tags.get().author, self.user)
+        self.assertFalse(second_groceries.tags.exists())
+
+        self.account.refresh_from_db()
+        self.second_account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("-28.20"))
+        self.assertEqual(self.second_account.balance, Decimal("1000"))
+        self.assertTrue(
+            BalanceSnapshot.objects.filter(
+                account=self.account, date=date(2021, 3, 1)
+            ).exists()
+        )
+
+    def test_lines_imported_before_are_skipped(self):
+        self.import_statement(imports.OFX, OFX_SGML_STATEMENT)
+        result = self.import_statement(imports.OFX, OFX_SGML_STATEMENT)
+
+        self.assertEqual(result.created, 0)
+        self.assertEqual(result.duplicates, 2)
+
+        # The lines of an overlapping statement which are new are imported
+        self.import_statement(imports.CSV, CSV_STATEMENT)
+        statement = CSV_STATEMENT + "2021-03-06,7,,,,Cinema,\n"
+        result = self.import_statement(imports.CSV, statement)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.duplicates, 4)
+        self.assertEqual(Transaction.objects.count(), 7)
+
+    def test_lines_with_the_same_reference_are_duplicates(self):
+        start = OFX_SGML_STATEMENT.index("<STMTTRN>")
+        end = OFX_SGML_STATEMENT.index("<STMTTRN>", start + 1)
+        statement = OFX_SGML_STATEMENT[:end] + OFX_SGML_STATEMENT[start:]
+        result = self.import_statement(imports.OFX, statement)
+
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.duplicates, 1)
+
+    def test_account_is_required(self):
+        result = imports.import_statement(self.user, StringIO(QIF_STATEMENT), "qif")
+
+        self.assertEqual(result.created, 0)
+        self.assertEqual(result.skipped[0], (2, "The account is required."))
+
+    def test_query_count_does_not_depend_on_line_count(self):
+        def get_statement(count):
+            lines = (
+                f"2021-03-01,{index + 1},Line {index},Tag {index}\n"
+                for index in range(count)
+            )
+            return "date,amount,description,tags\n" + "".join(lines)
+
+        def count_queries(count):
+            Transaction.objects.all().delete()
+
+            with CaptureQueriesContext(connection) as context:
+                result = self.import_statement(
+                    imports.CSV, get_statement(count), chunk_size=count
+                )
+
+            self.assertEqual(result.created, count)
+            return len(context)
+
+        self.assertEqual(count_queries(5), count_queries(50))
+
+    def test_creation_times_are_restored_by_a_query_per_chunk(self):
+        statement_import = imports.StatementImport(self.user, account=self.account)
+        statement = "date,amount,description\n" + "".join(
+            f"2021-03-{day:02},{day},Line {day}\n" for day in range(1, 21)
+        )
+        statement_lines = imports.parse_csv(StringIO(statement))
+        chunk = [
+            (statement_import.build_transaction(statement_line), statement_line.tags)
+            for statement_line in statement_lines
+        ]
+
+        # The imported lines, the transactions and their creation times
+        with self.assertNumQueries(3):
+            transactions = statement_import.write(chunk)
+
+        self.assertListEqual(
+            [transaction.created_on for transaction in transactions],
+            [date(2021, 3, day) for day in range(1, 21)],
+        )
+        self.assertListEqual(
+            list(
+                Transaction.objects.order_by("created_at").values_list(
+                    "created_on", flat=True
+                )
+            ),
+            [date(2021, 3, day) for day in range(1, 21)],
+        )
+
+
+class ImportTransactionsCommandTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.create_category(name="Health")
+
+    def call_command(self, statement, extension, *args):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"statement.{extension}")
+
+            with open(path, "w") as file:
+                file.write(statement)
+
+            out = StringIO()
+            err = StringIO()
+            call_command(
+                "import_transactions",
+                path,
+                self.user.email,
+                *args,
+                stdout=out,
+                stderr=err,
+            )
+            return out.getvalue(), err.getvalue()
+
+    def test_import(self):
+        out, err = self.call_command(
+            QIF_STATEMENT, "qif", "--account", self.account.name
+        )
+
+        self.assertIn(
+            "Imported 2 transactions, skipped 0 duplicates and 1 invalid lines.", out
+        )
+        self.assertIn("Skipped line 13: Invalid date: 13/45/2021", err)
+        self.assertEqual(self.account.transactions.count(), 2)
+
+        out, err = self.call_command(
+            QIF_STATEMENT, "txt", "--account", self.account.name, "--format", "qif"
+        )
+
+        self.assertIn(
+            "Imported 0 transactions, skipped 2 duplicates and 1 invalid lines.", out
+        )
+
+    def test_errors(self):
+        with self.assertRaisesMessage(CommandError, "Unknown statement format."):
+            self.call_command(QIF_STATEMENT, "txt")
+
+        with self.assertRaisesMessage(CommandError, "Account Unknown does not exist."):
+            self.call_command(QIF_STATEMENT, "qif", "--account", "Unknown")
+
+        with self.assertRaisesMessage(
+            CommandError, "Line 1: The date and amount columns are required."
+        ):
+            self.call_command("description\nCoffee\n", "csv")
+
+        self.assertFalse(Tag.objects.exists())
+        self.assertFalse(Transaction.objects.exists())
@@ -1,4 +1,8 @@
+import json
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from contuga.contrib.settings.models import Settings
@@ -40,6 +44,32 @@ class TransactionViewTests(TestCase, TestMixin):
             transform=lambda x: x,
         )
 
+    def test_list_queries_have_no_distinct(self):
+        tags = [self.create_tag(name="First tag"), self.create_tag(name="Second tag")]
+        tagged_transaction = self.create_transaction(tags=tags)
+
+        url = reverse("transactions:list")
+        tags_filter = json.dumps([{"value": tag.name} for tag in tags])
+
+        cases = (
+            ({}, [tagged_transaction, self.transaction]),
+            ({"tags": tags_filter}, [tagged_transaction]),
+        )
+
+        for data, expected_transactions in cases:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, data)
+
+            self.assertListEqual(
+                list(response.context["transaction_list"]), expected_transactions
+            )
+
+            for query in context.captured_queries:
+                self.assertNotIn("DISTINCT", query["sql"])
+
+            plan = response.context["view"].object_list.explain()
+            self.assertNotIn("DISTINCT", plan)
+
     def test_filter_statistics(self):
         currency = self.create_currency(name="Euro", code="EUR")
         eur_account = self.create_account(name="Second account name", currency=currency)
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from io import StringIO
+from unittest import mock
+
+import pytz
+from django.core.management import call_command
+from django.test import TestCase
+
+from contuga.contrib.accounts.models import BalanceSnapshot
+from contuga.contrib.transactions.models import Transaction
+from contuga.mixins import TestMixin
+
+
+class LocalDatesTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+
+    def create_transaction_at(self, value, **kwargs):
+        with mock.patch("django.utils.timezone.now") as mocked_now:
+            mocked_now.return_value = value
+            return self.create_transaction(**kwargs)
+
+    def test_local_date_is_stored_on_save(self):
+        # Midnight in Sofia
+        transaction = self.create_transaction_at(
+            datetime(2021, 1, 1, 22, tzinfo=pytz.UTC)
+        )
+        self.assertEqual(transaction.created_on, date(2021, 1, 2))
+
+        transaction.created_at = datetime(2021, 3, 1, 21, 59, tzinfo=pytz.UTC)
+        transaction.save(update_fields=["created_at"])
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.created_on, date(2021, 3, 1))
+
+    def test_local_date_is_stored_on_bulk_create(self):
+        [transaction] = Transaction.objects.bulk_create(
+            [Transaction(amount=10, author=self.user, account=self.account)]
+        )
+
+        transaction.refresh_from_db()
+        self.assertEqual(
+            transaction.created_on, transaction.created_at.astimezone().date()
+        )
+
+    def test_recalculation(self):
+        self.create_transaction_at(datetime(2021, 1, 1, 22, tzinfo=pytz.UTC))
+        out = StringIO()
+
+        call_command("recalculate_transaction_dates", stdout=out)
+        self.assertEqual(out.getvalue(), "Updated the dates of 0 transactions.\n")
+
+        Transaction.objects.update(created_on=date(2021, 1, 1))
+        BalanceSnapshot.objects.update(date=date(2021, 1, 1))
+        out = StringIO()
+
+        call_command("recalculate_transaction_dates", "--batch-size=1", stdout=out)
+        self.assertEqual(out.getvalue(), "Updated the dates of 1 transactions.\n")
+
+        # The snapshots of the affected accounts are rebuilt as well
+        self.assertListEqual(
+            list(BalanceSnapshot.objects.values_list("date", flat=True)),
+            [date(2021, 1, 2)],
+        )
+        self.assertEqual(Transaction.objects.get().created_on, date(2021, 1, 2))
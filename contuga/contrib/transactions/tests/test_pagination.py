@@ -0,0 +1,159 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from contuga.contrib.settings.models import Settings
+from contuga.mixins import TestMixin
+from contuga.pagination import KeysetPagination, encode_cursor
+
+from ..models import Transaction
+
+
+class PaginationTestMixin(TestMixin):
+    def create_transactions(self, count):
+        now = timezone.now()
+
+        for index in range(count):
+            # Every other transaction shares its creation time with the previous
+            # one to make sure the ties are broken by the uuid
+            with mock.patch(
+                "django.utils.timezone.now",
+                return_value=now - timedelta(minutes=index // 2),
+            ):
+                self.create_transaction(amount=index + 1)
+
+        return list(Transaction.objects.order_by("-created_at", "-uuid"))
+
+
+class TransactionAPIPaginationTestCase(APITestCase, PaginationTestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.transactions = self.create_transactions(7)
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_pks(self, response):
+        return [item["url"].rstrip("/").split("/")[-1] for item in response["results"]]
+
+    def get_expected_pks(self, transactions):
+        return [str(transaction.pk) for transaction in transactions]
+
+    @mock.patch.object(KeysetPagination, "page_size", 3)
+    def test_pages(self):
+        response = self.client.get(reverse("transaction-list")).json()
+
+        self.assertNotIn("count", response)
+        self.assertIsNone(response["previous"])
+        self.assertListEqual(
+            self.get_pks(response), self.get_expected_pks(self.transactions[:3])
+        )
+
+        second_page = self.client.get(response["next"]).json()
+        self.assertListEqual(
+            self.get_pks(second_page), self.get_expected_pks(self.transactions[3:6])
+        )
+
+        last_page = self.client.get(second_page["next"]).json()
+        self.assertListEqual(
+            self.get_pks(last_page), self.get_expected_pks(self.transactions[6:])
+        )
+        self.assertIsNone(last_page["next"])
+
+        previous_page = self.client.get(last_page["previous"]).json()
+        self.assertListEqual(self.get_pks(previous_page), self.get_pks(second_page))
+        self.assertEqual(previous_page["next"], second_page["next"])
+
+        first_page = self.client.get(previous_page["previous"]).json()
+        self.assertListEqual(self.get_pks(first_page), self.get_pks(response))
+        self.assertIsNone(first_page["previous"])
+
+    @mock.patch.object(KeysetPagination, "page_size", 3)
+    def test_pages_do_not_count_the_transactions(self):
+        response = self.client.get(reverse("transaction-list")).json()
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(response["next"])
+
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertFalse(any("COUNT(" in query for query in queries))
+        self.assertFalse(any("OFFSET" in query for query in queries))
+
+    def test_count(self):
+        response = self.client.get(reverse("transaction-list"), {"count": "true"})
+
+        self.assertEqual(response.json()["count"], len(self.transactions))
+
+    def test_invalid_cursor(self):
+        for cursor in ("invalid", encode_cursor(["invalid", "invalid"])):
+            response = self.client.get(reverse("transaction-list"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 404)
+
+
+class TransactionListLoadMoreTestCase(TestCase, PaginationTestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.transactions = self.create_transactions(5)
+
+        settings = Settings.objects.get(user=self.user)
+        settings.transactions_per_page = 2
+        settings.save()
+
+        self.client.force_login(self.user)
+
+    def test_load_more(self):
+        url = reverse("transactions:list")
+        response = self.client.get(url, {"page": 2})
+
+        self.assertListEqual(
+            list(response.context["transaction_list"]), self.transactions[2:4]
+        )
+
+        load_more_url = response.context["load_more_url"]
+        self.assertNotIn("page=", load_more_url)
+
+        response = self.client.get(url + load_more_url)
+
+        self.assertFalse(response.context["is_paginated"])
+        self.assertListEqual(
+            list(response.context["transaction_list"]), self.transactions[4:]
+        )
+        self.assertIsNone(response.context["load_more_url"])
+        self.assertEqual(
+            response.context["filter_statistics"]["transaction_count"],
+            len(self.transactions),
+        )
+
+    def test_load_more_from_the_start(self):
+        url = reverse("transactions:list")
+        response = self.client.get(url, {"cursor": ""})
+
+        self.assertListEqual(
+            list(response.context["transaction_list"]), self.transactions[:2]
+        )
+        self.assertIsNotNone(response.context["load_more_url"])
+
+    def test_load_more_is_not_available_with_custom_ordering(self):
+        url = reverse("transactions:list")
+        response = self.client.get(url, {"ordering": "amount"})
+
+        self.assertTrue(response.context["is_paginated"])
+        self.assertIsNone(response.context["load_more_url"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("transactions:list"), {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,198 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+
+from contuga.mixins import TestMixin
+from contuga.pagination import KeysetPagination
+
+from ..models import Transaction
+from ..search import (
+    FTS_TABLE,
+    RANK,
+    install_search_index,
+    search_transactions,
+    uninstall_search_index,
+)
+
+
+class SearchTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+
+    def search(self, query):
+        queryset = Transaction.objects.filter(author=self.user)
+        return list(search_transactions(queryset, query).order_by(f"-{RANK}"))
+
+    def test_substrings_of_all_terms_are_matched(self):
+        coffee = self.create_transaction(description="Coffee at the office")
+        coffee_beans = self.create_transaction(description="Coffee beans")
+        self.create_transaction(description="Groceries")
+
+        self.assertCountEqual(self.search("coff"), [coffee, coffee_beans])
+        self.assertListEqual(self.search("COFFEE office"), [coffee])
+        self.assertListEqual(self.search("tea"), [])
+
+    def test_results_are_ranked(self):
+        once = self.create_transaction(
+            description="Dinner with friends at a restaurant in the city centre"
+        )
+        twice = self.create_transaction(description="Dinner, dinner")
+
+        self.assertListEqual(self.search("dinner"), [twice, once])
+
+    def test_index_follows_the_changes(self):
+        transaction = self.create_transaction(description="Taxi")
+
+        transaction.description = "Train tickets"
+        transaction.save()
+
+        self.assertListEqual(self.search("taxi"), [])
+        self.assertListEqual(self.search("tickets"), [transaction])
+
+        transaction.delete()
+
+        self.assertListEqual(self.search("tickets"), [])
+
+    def test_short_terms(self):
+        transaction = self.create_transaction(description="TV subscription")
+        self.create_transaction(description="Subscription")
+
+        self.assertListEqual(self.search("tv"), [transaction])
+        self.assertListEqual(self.search("tv subscription"), [transaction])
+
+    def test_index_is_repaired(self):
+        transaction = self.create_transaction(description="Cinema")
+
+        if connection.vendor == "sqlite":
+            # A migration rebuilding the table drops its triggers
+            with connection.cursor() as cursor:
+                cursor.execute("DROP TRIGGER transactions_transaction_fts_insert")
+
+        install_search_index(connection)
+        second_transaction = self.create_transaction(description="Cinema tickets")
+
+        self.assertCountEqual(self.search("cinema"), [transaction, second_transaction])
+
+    def test_indexed_search_is_used(self):
+        self.create_transaction(description="Coffee")
+
+        queryset = search_transactions(Transaction.objects.all(), "coffee")
+        plan = queryset.explain()
+
+        if connection.vendor == "sqlite":
+            self.assertIn("VIRTUAL TABLE INDEX", plan)
+        else:
+            self.assertIn("Bitmap Index Scan", plan)
+
+    @skipUnless(connection.vendor == "sqlite", "Tests the SQLite search index")
+    def test_index_is_queried_once(self):
+        self.create_transaction(description="Coffee")
+
+        queryset = search_transactions(
+            Transaction.objects.filter(author=self.user), "coffee"
+        )
+        plan = queryset.explain()
+
+        # The index is the outer loop of the join rather than being queried for
+        # each transaction of the author
+        self.assertIn(FTS_TABLE, plan.splitlines()[0])
+
+    @skipUnless(connection.vendor == "sqlite", "Tests the SQLite search index")
+    def test_index_is_looked_up_once(self):
+        queryset = Transaction.objects.filter(author=self.user)
+        search_transactions(queryset, "coffee")
+
+        with self.assertNumQueries(0):
+            search_transactions(queryset, "coffee")
+
+    @skipUnless(connection.vendor == "sqlite", "Tests the SQLite search index")
+    def test_uninstalled_index_is_not_queried(self):
+        self.create_transaction(description="Coffee")
+        search_transactions(Transaction.objects.all(), "coffee")
+
+        uninstall_search_index(connection)
+
+        try:
+            self.assertEqual(len(self.search("coffee")), 1)
+        finally:
+            install_search_index(connection)
+
+
+class TransactionListSearchTestCase(TestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.client.force_login(self.user)
+
+    def test_description_filter(self):
+        twice = self.create_transaction(description="Lunch, lunch")
+        once = self.create_transaction(description="Lunch with colleagues at work")
+        self.create_transaction(description="Books")
+
+        url = reverse("transactions:list")
+        response = self.client.get(url, {"description": "lunch"})
+
+        self.assertListEqual(list(response.context["transaction_list"]), [twice, once])
+        self.assertEqual(response.context["filter_statistics"]["transaction_count"], 2)
+
+        response = self.client.get(url, {"description": "lunch", "ordering": "-amount"})
+
+        self.assertCountEqual(response.context["transaction_list"], [twice, once])
+
+
+class TransactionAPISearchTestCase(APITestCase, TestMixin):
+    def setUp(self):
+        self.user = self.create_user()
+        self.category = self.create_category()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client = APIClient(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def get_descriptions(self, response):
+        return [item["description"] for item in response["results"]]
+
+    @mock.patch.object(KeysetPagination, "page_size", 2)
+    def test_search(self):
+        descriptions = [
+            "Rent, rent, rent",
+            "Rent, rent",
+            "Monthly rent of the apartment",
+            "Rent",
+        ]
+
+        for description in descriptions:
+            self.create_transaction(description=description)
+
+        self.create_transaction(description="Electricity")
+
+        url = reverse("transaction-list")
+        response = self.client.get(url, {"search": "rent"}).json()
+
+        # The ranked results are paginated by the cursors as well
+        results = self.get_descriptions(response)
+        response = self.client.get(response["next"]).json()
+        results += self.get_descriptions(response)
+
+        ranked = search_transactions(Transaction.objects.all(), "rent").order_by(
+            f"-{RANK}", "-created_at", "-uuid"
+        )
+
+        self.assertIsNone(response["next"])
+        self.assertCountEqual(results, descriptions)
+        self.assertListEqual(
+            results, [transaction.description for transaction in ranked]
+        )
+
+        previous_page = self.client.get(response["previous"]).json()
+        self.assertListEqual(self.get_descriptions(previous_page), results[:2])
@@ -1,9 +1,11 @@
+import json
 from decimal import Decimal
 
 from django.test import TestCase
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
+from contuga.contrib.tags.models import Tag
 from contuga.contrib.transactions.constants import EXPENDITURE, INCOME
 from contuga.contrib.transactions.models import Transaction
 from contuga.mixins import TestMixin
@@ -98,6 +100,32 @@ class TransactionViewTests(TestCase, TestMixin):
         }
         self.assertDictEqual(transaction_data, expected_data)
 
+    def test_update_tags(self):
+        removed_tag = self.create_tag(name="Removed tag")
+        kept_tag = self.create_tag(name="Kept tag")
+        transaction = self.create_transaction(
+            category=self.create_category(), tags=[removed_tag, kept_tag]
+        )
+
+        data = {
+            "type": transaction.type,
+            "amount": "300",
+            "category": transaction.category.pk,
+            "account": self.account.pk,
+            "tags": json.dumps([{"value": "Kept tag"}, {"value": "Added tag"}]),
+        }
+
+        url = reverse("transactions:update", kwargs={"pk": transaction.pk})
+        response = self.client.post(url, data=data)
+
+        self.assertEqual(response.status_code, 302)
+
+        added_tag = Tag.objects.get(author=self.user, name="Added tag")
+        self.assertCountEqual(transaction.tags.all(), [kept_tag, added_tag])
+
+        # Assert the removed tag is only detached from the transaction
+        self.assertTrue(Tag.objects.filter(pk=removed_tag.pk).exists())
+
     def test_update_to_income_with_wrong_category(self):
         category = self.create_category(transaction_type=EXPENDITURE)
         transaction = self.create_transaction(category=category)
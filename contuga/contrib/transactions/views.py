@@ -2,21 +2,46 @@ import json
 
 from django.contrib.auth import mixins
 from django.db import transaction
-from django.db.models import Count, F, Q, Sum
-from django.db.models.functions import Coalesce
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils.translation import ugettext_lazy as _
 from django.views import generic
+from import_export.formats import base_formats
 from import_export.mixins import ExportViewFormMixin
-from rest_framework import permissions, viewsets
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 from contuga import views
 from contuga.contrib.accounts import models as account_models
+from contuga.contrib.accounts.utils import STATE_FIELDS, apply_transaction_changes
+from contuga.contrib.analytics.cache import invalidate_reports
 from contuga.contrib.categories import constants as category_constants
+from contuga.contrib.categories import models as category_models
+from contuga.contrib.tags import models as tag_models
 from contuga.mixins import OnlyAuthoredByCurrentUserMixin, SettingsMixin
-
-from . import constants, filters, forms, models, resources, serializers
+from contuga.pagination import (
+    CountedPaginator,
+    KeysetPagination,
+    decode_cursor,
+    encode_cursor,
+    paginate_keyset,
+)
+
+from . import (
+    cache,
+    constants,
+    exports,
+    filters,
+    forms,
+    models,
+    resources,
+    search,
+    serializers,
+)
 from .mixins import BaseTransactionFormViewMixin, GroupedCategoriesMixin
 
 
@@ -64,6 +89,16 @@ class TransactionListView(
     filterset_class = filters.TransactionFilterSet
     resource_class = resources.TransactionResource
     success_url = reverse_lazy("transactions:list")
+    # CSV is streamed instead of being built in memory by tablib
+    formats = (
+        exports.CSV,
+        exports.JSONLines,
+        *(
+            file_format
+            for file_format in base_formats.DEFAULT_FORMATS
+            if file_format is not base_formats.CSV
+        ),
+    )
 
     def get_queryset(self):
         return (
@@ -78,48 +113,105 @@ class TransactionListView(
     def get_paginate_by(self, queryset):
         return self.settings.transactions_per_page
 
+    def is_load_more(self):
+        """
+        The transactions are loaded by a cursor instead of a page number once the
+        first "Load more" link is followed, unless they are ordered by another
+        field. Then neither the total count nor the previous pages are queried.
+        """
+        return (
+            KeysetPagination.cursor_query_param in self.request.GET
+            and not self.request.GET.get("ordering")
+        )
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        # The count of the filter statistics spares the paginator's own query
+        count = self.get_filter_statistics()["transaction_count"]
+        return CountedPaginator(queryset, per_page, count=count, **kwargs)
+
+    def get_keyset_ordering(self, queryset):
+        return search.get_keyset_ordering(queryset, KeysetPagination.ordering)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.is_load_more():
+            return super().paginate_queryset(queryset, page_size)
+
+        ordering = self.get_keyset_ordering(queryset)
+        cursor = self.request.GET.get(KeysetPagination.cursor_query_param)
+        position, reverse = None, False
+
+        if cursor:
+            try:
+                position, reverse = decode_cursor(cursor, queryset, ordering)
+            except ValueError:
+                raise Http404(KeysetPagination.invalid_cursor_message)
+
+        page = paginate_keyset(queryset, ordering, page_size, position, reverse)
+        self.next_position = page.next_position
+
+        return None, None, page.items, False
+
+    def get_load_more_url(self, context):
+        if self.is_load_more():
+            position = self.next_position
+        else:
+            page = context.get("page_obj")
+
+            if page is None or not page.has_next() or self.request.GET.get("ordering"):
+                return None
+
+            last = page.object_list[len(page.object_list) - 1]
+            position = tuple(
+                getattr(last, field)
+                for field in self.get_keyset_ordering(self.object_list)
+            )
+
+        if position is None:
+            return None
+
+        query = self.request.GET.copy()
+        query.pop("page", None)
+        query[KeysetPagination.cursor_query_param] = encode_cursor(position)
+
+        return f"?{query.urlencode()}"
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["load_more_url"] = self.get_load_more_url(context)
 
         initial = self.get_create_form_initial()
         form = forms.TransactionForm(user=self.request.user, initial=initial)
         context["create_form"] = form
 
-        # context["object_list"] cannot be used due to the pagination which makes
-        # the use of order_by impossible. Cannot reorder a query once a slice has been taken.
-        queryset = self.get_queryset()
-        context["filter_statistics"] = self.get_filter_statistics(
-            queryset, context.get("paginator")
-        )
+        context["filter_statistics"] = self.get_filter_statistics()
 
         return context
 
+    def form_valid(self, form):
+        formats = self.get_export_formats()
+        file_format = formats[int(form.cleaned_data["file_format"])]()
+
+        if not isinstance(file_format, exports.StreamingFormat):
+            return super().form_valid(form)
+
+        return exports.stream_export(
+            file_format, self.get_queryset(), self.get_export_filename(file_format)
+        )
+
     def get_create_form_initial(self):
         return {
             "category": self.settings.default_expenditures_category,
             "account": self.settings.default_account,
         }
 
-    def get_filter_statistics(self, queryset, paginator):
-        currency_statistics = (
-            queryset.values("account__currency")
-            .annotate(
-                currency=F("account__currency__name"),
-                income=Coalesce(Sum("amount", filter=Q(type="income")), 0),
-                expenditure=Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
-                balance=Coalesce(Sum("amount", filter=Q(type="income")), 0)
-                - Coalesce(Sum("amount", filter=Q(type="expenditure")), 0),
-                count=Count("pk"),
+    def get_filter_statistics(self):
+        if not hasattr(self, "filter_statistics"):
+            # self.object_list is the filtered queryset before the pagination
+            self.filter_statistics = cache.get_filter_statistics(
+                self.request.user, self.object_list, self.request.GET
             )
-            .values("currency", "income", "expenditure", "balance", "count")
-            .order_by("currency")
-        )
 
-        return {
-            "transaction_count": paginator.count,
-            "currency_count": len(currency_statistics),
-            "currency_statistics": currency_statistics,
-        }
+        return self.filter_statistics
 
 
 class TransactionDetailView(
@@ -285,6 +377,9 @@ class InternalTransferSuccessView(mixins.LoginRequiredMixin, generic.TemplateVie
 
 class TransactionViewSet(OnlyAuthoredByCurrentUserMixin, viewsets.ModelViewSet):
     serializer_class = serializers.TransactionSerializer
+    pagination_class = KeysetPagination
+    filter_backends = (filters.TransactionSearchFilter,)
+    batch_max_size = 500
     http_method_names = ("get", "post", "put", "patch", "delete")
 
     def get_permissions(self):
@@ -295,6 +390,9 @@ class TransactionViewSet(OnlyAuthoredByCurrentUserMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         return models.Transaction.objects.filter(author=self.request.user)
 
+    def get_keyset_ordering(self, queryset):
+        return search.get_keyset_ordering(queryset, KeysetPagination.ordering)
+
     def get_serializer(self, *args, **kwargs):
         serializer = super().get_serializer(*args, **kwargs)
         if self.request.method in ("POST", "PUT", "PATCH"):
@@ -320,3 +418,104 @@ class TransactionViewSet(OnlyAuthoredByCurrentUserMixin, viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
+
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Create a list of transactions at once, e.g. synchronized by offline
+        clients. Either all of them are created or, if any of them is invalid,
+        none of them and the errors of each one are returned in the same order.
+        """
+        items = request.data
+
+        if not isinstance(items, list) or not 0 < len(items) <= self.batch_max_size:
+            message = _("A list of 1 to %(count)s transactions is expected.") % {
+                "count": self.batch_max_size
+            }
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+        context = self.get_serializer_context()
+        context["preloaded"] = self.get_preloaded_objects()
+        batch = [
+            serializers.TransactionBatchItemSerializer(data=item, context=context)
+            for item in items
+        ]
+
+        if not all([serializer.is_valid() for serializer in batch]):
+            errors = [serializer.errors for serializer in batch]
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        transactions = self.create_batch(
+            [serializer.validated_data for serializer in batch]
+        )
+        queryset = self.get_queryset().filter(
+            pk__in=[transaction.pk for transaction in transactions]
+        )
+        created = {
+            transaction.pk: transaction
+            for transaction in queryset.prefetch_related("tags")
+        }
+        serializer = serializers.TransactionSerializer(
+            [created[transaction.pk] for transaction in transactions],
+            many=True,
+            context=context,
+        )
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def get_preloaded_objects(self):
+        """
+        Return the related objects which the transactions of a batch may refer
+        to, so that they are looked up once instead of per transaction.
+        """
+        user = self.request.user
+        querysets = (
+            account_models.Account.objects.filter(owner=user),
+            category_models.Category.objects.filter(author=user),
+            tag_models.Tag.objects.filter(author=user),
+        )
+
+        return {
+            queryset.model: {instance.pk: instance for instance in queryset}
+            for queryset in querysets
+        }
+
+    def create_batch(self, items):
+        transactions = []
+        transaction_tags = []
+        TransactionTag = models.Transaction.tags.through
+
+        # The whole batch, including the tags created for it, is saved in the
+        # same database transaction, in which the changes of the whole batch are
+        # applied to the balances, snapshots and rollups at once
+        with transaction.atomic():
+            # The named tags of the whole batch are resolved at once
+            names = [name for data in items for name in data.get("tag_names", [])]
+            named_tags = {
+                tag.name: tag
+                for tag in tag_models.Tag.objects.resolve(self.request.user, names)
+            }
+
+            for data in items:
+                data = dict(data)
+                tags = [
+                    *data.pop("tags", []),
+                    *(named_tags[name] for name in data.pop("tag_names", [])),
+                ]
+                instance = models.Transaction(author=self.request.user, **data)
+                transactions.append(instance)
+                transaction_tags += [
+                    TransactionTag(transaction=instance, tag=tag)
+                    for tag in dict.fromkeys(tags)
+                ]
+
+            models.Transaction.objects.bulk_create(transactions)
+            TransactionTag.objects.bulk_create(transaction_tags)
+            apply_transaction_changes(
+                current_states=[
+                    instance.get_saved_values(STATE_FIELDS) for instance in transactions
+                ]
+            )
+            invalidate_reports(self.request.user.pk)
+
+        return transactions
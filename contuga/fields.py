@@ -0,0 +1,36 @@
+from django.db import models
+
+from contuga.utils import get_local_date
+
+
+class LocalDateField(models.DateField):
+    """
+    A date field holding the local date of the datetime field `source`, which
+    is updated whenever the instance is saved, including by `bulk_create`.
+    """
+
+    def __init__(self, *args, source, **kwargs):
+        self.source = source
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+
+        if self.editable:
+            kwargs["editable"] = True
+        else:
+            kwargs.pop("editable", None)
+
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        # The source field is saved first if it is declared before this one, so
+        # values set by auto_now and auto_now_add are taken into account.
+        value = getattr(model_instance, self.source)
+
+        if value is not None:
+            setattr(model_instance, self.attname, get_local_date(value))
+
+        return super().pre_save(model_instance, add)
@@ -3,7 +3,7 @@ from django.contrib.auth import get_user_model
 from contuga.contrib.accounts.models import Account
 from contuga.contrib.categories.constants import ALL
 from contuga.contrib.categories.models import Category
-from contuga.contrib.currencies.models import Currency
+from contuga.contrib.currencies.models import Currency, ExchangeRate
 from contuga.contrib.settings.models import Settings
 from contuga.contrib.tags.models import Tag
 from contuga.contrib.transactions.constants import EXPENDITURE, INCOME
@@ -70,6 +70,11 @@ class TestMixin:
             name=name, author=author or self.user, code=code, nominal=nominal
         )
 
+    def create_exchange_rate(self, rate, currency, base_currency, date):
+        return ExchangeRate.objects.create(
+            rate=rate, currency=currency, base_currency=base_currency, date=date
+        )
+
     def create_tag(self, name="Tag", author=None, transactions=None):
         return Tag.objects.create(name=name, author=author or self.user)
 
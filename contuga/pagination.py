@@ -0,0 +1,248 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict, namedtuple
+
+import coreapi
+import coreschema
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+KeysetPage = namedtuple("KeysetPage", ("items", "next_position", "previous_position"))
+
+
+def encode_cursor(position, reverse=False):
+    """
+    Encode the position of an item, i.e. the values of its ordering fields, and
+    the direction of the pagination into an opaque cursor.
+    """
+    values = [
+        value.isoformat() if hasattr(value, "isoformat") else str(value)
+        for value in position
+    ]
+    data = json.dumps({"p": values, "r": reverse}, separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def get_ordering_field(queryset, name):
+    annotation = queryset.query.annotations.get(name)
+
+    if annotation is not None:
+        return annotation.output_field
+
+    return queryset.model._meta.get_field(name)
+
+
+def decode_cursor(cursor, queryset, ordering):
+    """
+    Return the position and the direction encoded in `cursor` or raise
+    ValueError if it is invalid. The ordering fields may be model fields or
+    annotations of `queryset`.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = data["p"]
+        reverse = bool(data.get("r"))
+
+        if len(values) != len(ordering):
+            raise ValueError("The cursor does not match the ordering.")
+
+        position = tuple(
+            get_ordering_field(queryset, field).to_python(value)
+            for field, value in zip(ordering, values)
+        )
+    except (
+        binascii.Error,
+        KeyError,
+        TypeError,
+        UnicodeDecodeError,
+        ValidationError,
+        json.JSONDecodeError,
+    ) as error:
+        raise ValueError("Invalid cursor.") from error
+
+    return position, reverse
+
+
+def get_keyset_filter(ordering, position, reverse=False):
+    """
+    Return a condition matching the items after `position` in the descending
+    order of the `ordering` fields, or before it if `reverse` is True.
+    """
+    lookup = "gt" if reverse else "lt"
+    condition = Q()
+
+    for index, field in enumerate(ordering):
+        condition |= Q(
+            *zip(ordering[:index], position[:index]),
+            **{f"{field}__{lookup}": position[index]},
+        )
+
+    return condition
+
+
+def paginate_keyset(queryset, ordering, page_size, position=None, reverse=False):
+    """
+    Return the page of items following `position` in the descending order of the
+    `ordering` fields, or preceding it if `reverse` is True, along with the
+    positions of its last and first items if there are further pages.
+
+    Unlike the offset pagination, each page costs as much as the first one, as
+    it is looked up by the ordering fields, which should be unique together and
+    indexed.
+    """
+    if position is not None:
+        queryset = queryset.filter(get_keyset_filter(ordering, position, reverse))
+
+    prefix = "" if reverse else "-"
+    queryset = queryset.order_by(*(f"{prefix}{field}" for field in ordering))
+
+    # An additional item is fetched to tell if there are more pages
+    items = list(queryset[: page_size + 1])
+    has_more = len(items) > page_size
+    del items[page_size:]
+
+    if reverse:
+        items.reverse()
+        has_next, has_previous = position is not None, has_more
+    else:
+        has_next, has_previous = has_more, position is not None
+
+    def get_position(item):
+        return tuple(getattr(item, field) for field in ordering)
+
+    return KeysetPage(
+        items=items,
+        next_position=get_position(items[-1]) if items and has_next else None,
+        previous_position=get_position(items[0]) if items and has_previous else None,
+    )
+
+
+class CountedPaginator(Paginator):
+    """
+    A paginator for an object list whose count is already known, e.g. from an
+    aggregation, which spares the COUNT query.
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates the results by cursors pointing at the first or the last item of
+    the current page in the descending order of `ordering`, or of the view's
+    `get_keyset_ordering(queryset)` if it has one. The total count requires an
+    additional query, so it is returned only on `?count=true`.
+    """
+
+    ordering = ("created_at", "uuid")
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = _("Invalid cursor")
+
+    def get_ordering(self, queryset, view):
+        if hasattr(view, "get_keyset_ordering"):
+            return view.get_keyset_ordering(queryset)
+
+        return self.ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        ordering = self.get_ordering(queryset, view)
+        self.count = None
+        cursor = request.query_params.get(self.cursor_query_param)
+        position, reverse = None, False
+
+        if cursor:
+            try:
+                position, reverse = decode_cursor(cursor, queryset, ordering)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+
+        if request.query_params.get(self.count_query_param, "").lower() in (
+            "1",
+            "true",
+        ):
+            self.count = queryset.count()
+
+        self.page = paginate_keyset(
+            queryset, ordering, self.page_size, position, reverse
+        )
+
+        return self.page.items
+
+    def get_link(self, position, reverse=False):
+        if position is None:
+            return None
+
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encode_cursor(position, reverse)
+        )
+
+    def get_paginated_response(self, data):
+        response_data = OrderedDict()
+
+        if self.count is not None:
+            response_data["count"] = self.count
+
+        response_data["next"] = self.get_link(self.page.next_position)
+        response_data["previous"] = self.get_link(
+            self.page.previous_position, reverse=True
+        )
+        response_data["results"] = data
+
+        return Response(response_data)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_schema_fields(self, view):
+        return [
+            coreapi.Field(
+                name=self.cursor_query_param,
+                location="query",
+                required=False,
+                schema=coreschema.String(title="Cursor"),
+            ),
+            coreapi.Field(
+                name=self.count_query_param,
+                location="query",
+                required=False,
+                schema=coreschema.Boolean(title="Count"),
+            ),
+        ]
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "schema": {"type": "boolean"},
+            },
+        ]
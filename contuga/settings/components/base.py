@@ -137,6 +137,21 @@ DEFAULT_CATEGORIES = [
     _("Other"),
 ]
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+# The analytics reports are cached per data version, which is stored in the
+# database, so a per process backend never serves stale reports. A shared backend
+# lets multiple processes share the cached reports.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "analytics": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "analytics",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+}
+
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 100,
@@ -0,0 +1,149 @@
+import re
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from contuga.contrib.analytics import constants as analytics_constants
+from contuga.contrib.analytics.utils import generate_reports
+from contuga.contrib.transactions.constants import EXPENDITURE, INCOME
+from contuga.mixins import TestMixin
+
+# The tables of the hot queries which should always be searched by an index
+HOT_TABLES = (
+    "transactions_transaction",
+    "analytics_dailyrollup",
+    "accounts_balancesnapshot",
+)
+
+
+class QueryPlanTestCase(TestCase, TestMixin):
+    """
+    Runs the hot queries against seeded data and fails if the query plan of any
+    of them scans a hot table sequentially instead of using an index.
+    """
+
+    def setUp(self):
+        self.user = self.create_user()
+        self.currency = self.create_currency()
+        self.account = self.create_account()
+        self.second_account = self.create_account(name="Second account name")
+        self.category = self.create_category()
+        self.second_category = self.create_category(name="Second category name")
+        self.tag = self.create_tag()
+        self.tags = [self.tag]
+
+        # Another user's data should be skipped by the indexes as well
+        other_user = self.create_user("richard.roe@example.com", "password")
+        other_account = self.create_account(owner=other_user)
+        other_category = self.create_category(author=other_user)
+
+        now = timezone.now()
+
+        for index in range(30):
+            with mock.patch(
+                "django.utils.timezone.now", return_value=now - timedelta(days=index)
+            ):
+                self.create_transaction(
+                    type=INCOME if index % 3 else EXPENDITURE,
+                    account=self.account if index % 2 else self.second_account,
+                    category=self.category if index % 2 else self.second_category,
+                )
+                self.create_transaction(
+                    author=other_user,
+                    account=other_account,
+                    category=other_category,
+                    tags=[self.create_tag(name=f"Tag {index}", author=other_user)],
+                )
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+                # The seeded tables are small enough to be scanned anyway, so the
+                # plans only show if there is a usable index at all
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.client.force_login(self.user)
+
+    def explain(self, sql):
+        prefix = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}")
+            # The last column of both the SQLite and the PostgreSQL plans is the
+            # description of the step
+            return "\n".join(row[-1] for row in cursor.fetchall())
+
+    def get_sequential_scans(self, sql, plan):
+        tables = list(HOT_TABLES)
+
+        if connection.vendor == "sqlite":
+            # SQLite names the tables of subqueries by their aliases, e.g. U0
+            tables += re.findall(r'"(?:{})" (\w+)'.format("|".join(HOT_TABLES)), sql)
+            pattern = r"\bSCAN (?:TABLE )?({tables})\b"
+        else:
+            pattern = r"\bSeq Scan on ({tables})\b"
+
+        return re.findall(pattern.format(tables="|".join(tables)), plan)
+
+    def assertUsesIndexes(self, function, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            function(*args, **kwargs)
+
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+            and any(table in query["sql"] for table in HOT_TABLES)
+        ]
+
+        self.assertTrue(queries)
+
+        for sql in queries:
+            plan = self.explain(sql)
+
+            with self.subTest(sql=sql):
+                self.assertFalse(self.get_sequential_scans(sql, plan), plan)
+
+    def test_transaction_list(self):
+        url = reverse("transactions:list")
+
+        self.assertUsesIndexes(self.client.get, url)
+        self.assertUsesIndexes(self.client.get, url, {"type": INCOME})
+        self.assertUsesIndexes(self.client.get, url, {"cursor": ""})
+
+    def test_transaction_api(self):
+        self.assertUsesIndexes(self.client.get, reverse("transaction-list"))
+
+    def test_latest_transactions(self):
+        for instance in (self.account, self.category, self.tag):
+            with self.subTest(instance=instance):
+                self.assertUsesIndexes(lambda: list(instance.latest_transactions()))
+
+    def test_balances(self):
+        yesterday = timezone.now() - timedelta(days=1)
+
+        self.assertUsesIndexes(self.account.calculate_balance, yesterday)
+        self.assertUsesIndexes(self.account.calculate_balance, yesterday.date())
+
+    def test_reports(self):
+        for grouping in (
+            analytics_constants.ACCOUNTS,
+            analytics_constants.CATEGORIES,
+            analytics_constants.TAGS,
+        ):
+            with self.subTest(grouping=grouping):
+                self.assertUsesIndexes(
+                    generate_reports, user=self.user, grouping=grouping
+                )
+
+        self.assertUsesIndexes(
+            generate_reports,
+            user=self.user,
+            grouping=analytics_constants.CATEGORIES,
+            category=self.category,
+        )
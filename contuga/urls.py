@@ -24,9 +24,9 @@ from rest_framework.documentation import include_docs_urls
 from rest_framework.routers import DefaultRouter
 
 from contuga.contrib.accounts.views import AccountViewSet
-from contuga.contrib.analytics.views import AnalyticsViewSet
+from contuga.contrib.analytics.views import AnalyticsViewSet, ReportJobViewSet
 from contuga.contrib.categories.views import CategoryViewSet
-from contuga.contrib.currencies.views import CurrencyViewSet
+from contuga.contrib.currencies.views import CurrencyViewSet, ExchangeRateViewSet
 from contuga.contrib.settings.views import SettingsViewSet
 from contuga.contrib.tags.views import TagViewSet
 from contuga.contrib.transactions.views import TransactionViewSet
@@ -37,12 +37,14 @@ from . import views
 router = DefaultRouter()
 router.register(r"transactions", TransactionViewSet, basename="transaction")
 router.register(r"currencies", CurrencyViewSet, basename="currency")
+router.register(r"exchange-rates", ExchangeRateViewSet, basename="exchangerate")
 router.register(r"accounts", AccountViewSet, basename="account")
 router.register(r"categories", CategoryViewSet, basename="category")
 router.register(r"tags", TagViewSet, basename="tag")
 router.register(r"users", UserViewSet, basename="user")
 router.register(r"settings", SettingsViewSet, basename="settings")
 router.register(r"analytics", AnalyticsViewSet, basename="analytics")
+router.register(r"report-jobs", ReportJobViewSet, basename="reportjob")
 
 urlpatterns = i18n_patterns(
     path("categories/", include(("contuga.contrib.categories.urls", "categories"))),
@@ -1,6 +1,9 @@
 import json
 from uuid import UUID
 
+import pytz
+from django.conf import settings
+
 
 class UUIDEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -8,3 +11,12 @@ class UUIDEncoder(json.JSONEncoder):
             # if the obj is uuid, we simply return the value of uuid
             return str(obj)
         return json.JSONEncoder.default(self, obj)
+
+
+def get_local_timezone():
+    # TODO: Let users specify their timezone and use it below
+    return pytz.timezone(settings.TIME_ZONE)
+
+
+def get_local_date(value):
+    return value.astimezone(get_local_timezone()).date()
@@ -12,7 +12,7 @@ class FilteredListView(generic.ListView):
         self.filterset = self.filterset_class(
             self.request.GET, request=self.request, queryset=queryset
         )
-        return self.filterset.qs.distinct()
+        return self.filterset.qs
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)